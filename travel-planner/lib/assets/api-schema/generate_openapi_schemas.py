@@ -0,0 +1,47 @@
+"""Generate the OpenAPI schema of each Bedrock agent action group from its routes.
+
+The schemas are built from the same Powertools routers the Lambda functions
+serve, so they cannot drift from the code. The stack runs this while
+bundling the schema asset; to inspect the output locally, run from the
+project folder (``travel-planner``) with the function dependencies installed::
+
+    python lib/assets/api-schema/generate_openapi_schemas.py --output /tmp/api-schema
+"""
+import argparse
+import importlib
+import os
+import sys
+
+LAMBDA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'lambda')
+
+# Schema file (the S3 key under api-schema/ the agent construct reads) -> routes directory and module
+ACTION_GROUPS = {
+    'travel_schema.json': ('travel', 'travel_routes'),
+    'portfolio_schema.json': ('portfolio', 'portfolio_routes'),
+}
+
+
+def generate(output_dir: str) -> None:
+    from aws_lambda_powertools.event_handler import BedrockAgentResolver
+
+    sys.path[:0] = [os.path.join(LAMBDA_DIR, directory) for directory, _ in ACTION_GROUPS.values()] + [LAMBDA_DIR]
+    os.makedirs(output_dir, exist_ok=True)
+    for file_name, (_, module_name) in ACTION_GROUPS.items():
+        routes = importlib.import_module(module_name)
+        app = BedrockAgentResolver()
+        app.include_router(routes.router)
+        with open(os.path.join(output_dir, file_name), 'w') as f:
+            f.write(app.get_openapi_json_schema(**routes.OPENAPI_INFO))
+        print(f"Wrote {os.path.join(output_dir, file_name)}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--output', default=os.path.dirname(os.path.abspath(__file__)), help='Directory to write the schemas to')
+    args = parser.parse_args()
+    generate(args.output)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
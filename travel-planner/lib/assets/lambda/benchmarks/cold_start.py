@@ -0,0 +1,156 @@
+"""Cold-start benchmark for the agent Lambda handlers.
+
+Each run starts a fresh interpreter, imports a handler module and invokes it
+once with a synthetic Bedrock agent event, timing both steps. SerpAPI calls
+go to the replay stub in ``serpapi_stub.py``, so no network access or API key
+is needed.
+
+Run from the project folder (``travel-planner``)::
+
+    python lib/assets/lambda/benchmarks/cold_start.py --runs 5
+    python lib/assets/lambda/benchmarks/cold_start.py --handler travel --max-import-ms 800
+
+``--no-bytecode`` ignores any compiled bytecode, which is what a read-only
+Lambda task root without precompiled ``.pyc`` files pays on every cold start.
+The script exits non-zero when a median exceeds ``--max-import-ms`` or
+``--max-first-invoke-ms`` so it can gate CI.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from serpapi_stub import StubServer
+
+LAMBDA_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+STOCK_PORTFOLIO = {"AAPL": 10, "GOOGL": 5, "MSFT": 8}
+
+HOTEL_ROUTE = ('/get_hotels', {'q': 'Paris', 'check_in_date': '2025-03-07', 'check_out_date': '2025-03-09'})
+PORTFOLIO_ROUTE = ('/check_portfolio', {'travel_budget': '1000'})
+
+# Handler directories, module and the routes exercised by the first invocations
+HANDLERS = {
+    'travel': (('travel',), 'agent', [HOTEL_ROUTE]),
+    'portfolio': (('portfolio',), 'portfolio_agent', [PORTFOLIO_ROUTE]),
+    # A trip question touching both action groups pays one cold start here instead of one per function
+    'unified': (('unified', 'travel', 'portfolio'), 'unified_agent', [HOTEL_ROUTE, PORTFOLIO_ROUTE]),
+}
+
+def bedrock_event(api_path: str, parameters: dict) -> dict:
+    """Build a minimal Bedrock agent action-group event."""
+    return {
+        'messageVersion': '1.0',
+        'agent': {'name': 'benchmark', 'id': 'benchmark', 'alias': 'benchmark', 'version': 'DRAFT'},
+        'sessionId': 'benchmark',
+        'sessionAttributes': {},
+        'promptSessionAttributes': {},
+        'inputText': 'benchmark',
+        'actionGroup': 'benchmark',
+        'apiPath': api_path,
+        'httpMethod': 'GET',
+        'parameters': [{'name': name, 'type': 'string', 'value': value} for name, value in parameters.items()],
+    }
+
+
+class LambdaContextStub:
+    function_name = 'benchmark'
+    memory_limit_in_mb = 1024
+    invoked_function_arn = 'arn:aws:lambda:us-east-1:000000000000:function:benchmark'
+    aws_request_id = 'benchmark'
+
+
+def measure_child(handler: str) -> None:
+    """Import and invoke one handler in this (fresh) interpreter and print timings as JSON.
+
+    ``first_invoke_ms`` covers the first call of every route the handler
+    serves, e.g. both action groups for the unified handler.
+    """
+    directories, module_name, routes = HANDLERS[handler]
+    sys.path[:0] = [os.path.join(LAMBDA_DIR, directory) for directory in directories] + [LAMBDA_DIR]
+
+    start = time.perf_counter()
+    module = __import__(module_name)
+    imported = time.perf_counter()
+    for api_path, parameters in routes:
+        module.lambda_handler(bedrock_event(api_path, parameters), LambdaContextStub())
+    invoked = time.perf_counter()
+
+    print(json.dumps({
+        'import_ms': (imported - start) * 1000,
+        'first_invoke_ms': (invoked - imported) * 1000,
+    }))
+
+
+def run_once(handler: str, stub_url: str, no_bytecode: bool) -> dict:
+    env = {
+        **os.environ,
+        'SERPAPI_BASE_URL': stub_url,
+        'API_KEY': 'benchmark',
+        'STOCK_PORTFOLIO': json.dumps(STOCK_PORTFOLIO),
+        'POWERTOOLS_TRACE_DISABLED': '1',
+        'POWERTOOLS_LOG_LEVEL': 'WARNING',
+        'AWS_DEFAULT_REGION': os.environ.get('AWS_DEFAULT_REGION', 'us-east-1'),
+    }
+    with tempfile.TemporaryDirectory() as pycache:
+        if no_bytecode:
+            env.update({'PYTHONPYCACHEPREFIX': pycache, 'PYTHONDONTWRITEBYTECODE': '1'})
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--child', handler],
+            env=env, check=True, capture_output=True, text=True,
+        ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--handler', choices=[*HANDLERS, 'all'], default='all')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--no-bytecode', action='store_true', help='Ignore compiled bytecode, as on a task root without .pyc files')
+    parser.add_argument('--max-import-ms', type=float, help='Fail if the median import time exceeds this')
+    parser.add_argument('--max-first-invoke-ms', type=float, help='Fail if the median first invocation exceeds this')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    parser.add_argument('--child', choices=list(HANDLERS), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        measure_child(args.child)
+        return 0
+
+    handlers = list(HANDLERS) if args.handler == 'all' else [args.handler]
+    report = {}
+    with StubServer() as stub:
+        for handler in handlers:
+            runs = [run_once(handler, stub.url, args.no_bytecode) for _ in range(args.runs)]
+            report[handler] = {
+                metric: {
+                    'median': statistics.median(run[metric] for run in runs),
+                    'min': min(run[metric] for run in runs),
+                    'max': max(run[metric] for run in runs),
+                }
+                for metric in ('import_ms', 'first_invoke_ms')
+            }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"{'handler':<12}{'metric':<18}{'median':>10}{'min':>10}{'max':>10}")
+        for handler, metrics in report.items():
+            for metric, stats in metrics.items():
+                print(f"{handler:<12}{metric:<18}{stats['median']:>10.1f}{stats['min']:>10.1f}{stats['max']:>10.1f}")
+
+    failed = False
+    for handler, metrics in report.items():
+        for metric, limit in (('import_ms', args.max_import_ms), ('first_invoke_ms', args.max_first_invoke_ms)):
+            if limit is not None and metrics[metric]['median'] > limit:
+                print(f"FAIL: {handler} {metric} median {metrics[metric]['median']:.1f} ms exceeds {limit} ms", file=sys.stderr)
+                failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,235 @@
+"""Load-test benchmark for the agent Lambda handlers.
+
+Drives ``lambda_handler`` with synthetic Bedrock agent events from a pool of
+threads and reports, per route, p50/p95/p99 latency, throughput, peak memory
+and the number of upstream SerpAPI calls. SerpAPI is replaced by the replay
+stub in ``serpapi_stub.py``, with per-engine latency and error rates, so the
+numbers are reproducible with no network access or API key.
+
+Run from the project folder (``travel-planner``)::
+
+    python lib/assets/lambda/benchmarks/load_test.py --requests 200 --concurrency 16
+    python lib/assets/lambda/benchmarks/load_test.py --route get_hotels --error-rate 0.05 --max-p95-ms 1500
+
+All invocations share one process and its warm module-level state, as
+consecutive invocations of one execution environment would. Search, quote and
+price history caches are disabled unless ``--cache`` is given, and each request
+varies its dates so every call reaches the stub. With ``--snapshot`` the snapshot
+refresher runs first, so the portfolio routes value holdings from the price
+snapshot instead of live quotes. ``--unified`` sends every route to the
+handler serving both action groups. The first call per route warms the
+handler and is not counted. The script exits non-zero when a route's p95
+exceeds ``--max-p95-ms`` so it can gate CI.
+"""
+import argparse
+import contextlib
+import json
+import os
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from typing import Callable, Dict, List
+
+from cold_start import LAMBDA_DIR, STOCK_PORTFOLIO, LambdaContextStub, bedrock_event
+from serpapi_stub import StubServer, add_stub_arguments, stub_config_from_args
+
+# Upstream latency (median:p99 ms) used when no --latency option is given
+DEFAULT_LATENCY = ['google_flights=300:1200', 'google_hotels=250:900', 'google_finance=80:300']
+
+BASE_DATE = date(2025, 3, 1)
+
+
+def _dates(i: int, nights: int) -> Dict[str, str]:
+    start = BASE_DATE + timedelta(days=i % 180)
+    return {'start': start.isoformat(), 'end': (start + timedelta(days=nights)).isoformat()}
+
+
+def _get_flights(i: int) -> Dict[str, str]:
+    dates = _dates(i, 7)
+    return {'departure_id': 'AUS', 'arrival_id': 'CDG', 'outbound_date': dates['start'], 'return_date': dates['end']}
+
+
+def _search_flights_batch(i: int) -> Dict[str, str]:
+    dates = _dates(i * 3, 2)
+    return {
+        'departure_ids': 'AUS', 'arrival_ids': 'CDG,ORY',
+        'outbound_date_start': dates['start'], 'outbound_date_end': dates['end'],
+    }
+
+
+def _get_hotels(i: int) -> Dict[str, str]:
+    dates = _dates(i, 2)
+    return {'q': 'Paris', 'check_in_date': dates['start'], 'check_out_date': dates['end']}
+
+
+def _plan_trip_cost(i: int) -> Dict[str, str]:
+    dates = _dates(i, 7)
+    return {
+        'departure_id': 'AUS', 'arrival_id': 'CDG', 'outbound_date': dates['start'], 'return_date': dates['end'],
+        'hotel_location': 'Paris',
+    }
+
+
+def _check_portfolio(i: int) -> Dict[str, str]:
+    return {'travel_budget': str(1000 + i)}
+
+
+def _calculate_shares_to_sell(i: int) -> Dict[str, str]:
+    return {'target_amount': str(500 + i), 'strategy': 'whole_shares'}
+
+
+def _simulate_affordability(i: int) -> Dict[str, str]:
+    # Relative to today: the route rejects travel dates in the past
+    return {'travel_budget': str(4000 + i), 'travel_date': (date.today() + timedelta(days=30 + i % 180)).isoformat()}
+
+
+# Route name -> (handler module, API path, parameters of the i-th request)
+ROUTES: Dict[str, tuple] = {
+    'get_flights': ('agent', '/get_flights', _get_flights),
+    'search_flights_batch': ('agent', '/search_flights_batch', _search_flights_batch),
+    'get_hotels': ('agent', '/get_hotels', _get_hotels),
+    'plan_trip_cost': ('agent', '/plan_trip_cost', _plan_trip_cost),
+    'check_portfolio': ('portfolio_agent', '/check_portfolio', _check_portfolio),
+    'calculate_shares_to_sell': ('portfolio_agent', '/calculate_shares_to_sell', _calculate_shares_to_sell),
+    'simulate_affordability': ('portfolio_agent', '/simulate_affordability', _simulate_affordability),
+}
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * q // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def configure_environment(stub_url: str, cache: bool, snapshot: bool) -> None:
+    """Set the handlers' configuration before they are imported."""
+    os.environ.update({
+        'PRICE_SNAPSHOT_PATH': os.path.join(tempfile.mkdtemp(), 'price-snapshot.bin'),
+        'PRICE_SNAPSHOT_MAX_AGE_SECONDS': '600' if snapshot else '0',
+        'SERPAPI_BASE_URL': stub_url,
+        'API_KEY': 'benchmark',
+        'STOCK_PORTFOLIO': json.dumps(STOCK_PORTFOLIO),
+        'POWERTOOLS_TRACE_DISABLED': '1',
+        'POWERTOOLS_LOG_LEVEL': 'ERROR',
+        'PAYLOAD_LOG_SAMPLE_RATE': '0',
+        'AWS_DEFAULT_REGION': os.environ.get('AWS_DEFAULT_REGION', 'us-east-1'),
+    })
+    if not cache:
+        os.environ.update({
+            'SEARCH_CACHE_TTL_GOOGLE_FLIGHTS': '0',
+            'SEARCH_CACHE_TTL_GOOGLE_HOTELS': '0',
+            'QUOTE_CACHE_TTL_SECONDS': '0',
+            'QUOTE_CACHE_STALE_SECONDS': '0',
+            'RISK_HISTORY_TTL_SECONDS': '0',
+        })
+    sys.path[:0] = [os.path.join(LAMBDA_DIR, directory) for directory in ('unified', 'travel', 'portfolio')] + [LAMBDA_DIR]
+
+
+def invoke(handler: Callable, api_path: str, parameters: Dict[str, str]) -> tuple:
+    """Return ``(latency_ms, ok)`` for one invocation."""
+    start = time.perf_counter()
+    response = handler(bedrock_event(api_path, parameters), LambdaContextStub())
+    elapsed = (time.perf_counter() - start) * 1000
+
+    result = response['response']
+    body = json.loads(result['responseBody']['application/json']['body'])
+    if isinstance(body, dict) and 'body' in body and 'statusCode' in body:
+        ok = body['statusCode'] < 400
+        body = json.loads(body['body'])
+    else:
+        ok = result['httpStatusCode'] < 400
+    return elapsed, ok and not (isinstance(body, dict) and body.get('error'))
+
+
+def run_route(name: str, stub: StubServer, requests: int, concurrency: int, trace_memory: bool, unified: bool) -> Dict:
+    module_name, api_path, make_parameters = ROUTES[name]
+    handler = __import__('unified_agent' if unified else module_name).lambda_handler
+
+    invoke(handler, api_path, make_parameters(requests))
+    stub.reset_calls()
+    if trace_memory:
+        tracemalloc.reset_peak()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(lambda i: invoke(handler, api_path, make_parameters(i)), range(requests)))
+    wall = time.perf_counter() - start
+
+    latencies = sorted(latency for latency, _ in results)
+    calls = stub.reset_calls()
+    return {
+        'requests': requests,
+        'errors': sum(1 for _, ok in results if not ok),
+        'p50_ms': percentile(latencies, 50),
+        'p95_ms': percentile(latencies, 95),
+        'p99_ms': percentile(latencies, 99),
+        'max_ms': latencies[-1],
+        'throughput_rps': requests / wall,
+        'peak_memory_mb': (
+            tracemalloc.get_traced_memory()[1] / 2 ** 20 if trace_memory
+            # ru_maxrss is in KiB on Linux
+            else resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        ),
+        'upstream_calls': calls,
+        'upstream_calls_per_request': sum(calls.values()) / requests,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--route', action='append', choices=list(ROUTES), help='Route to load (repeatable; default all)')
+    parser.add_argument('--requests', type=int, default=100, help='Measured requests per route')
+    parser.add_argument('--concurrency', type=int, default=8, help='Invocations in flight at once')
+    parser.add_argument('--cache', action='store_true', help='Keep the search and quote caches enabled')
+    parser.add_argument('--snapshot', action='store_true', help='Publish a price snapshot before loading the portfolio routes')
+    parser.add_argument('--unified', action='store_true', help='Serve every route from the unified handler instead of one handler per action group')
+    parser.add_argument(
+        '--trace-memory', action='store_true',
+        help='Report the Python heap peak per route with tracemalloc (slower) instead of the process peak RSS',
+    )
+    parser.add_argument('--max-p95-ms', type=float, help="Fail if any route's p95 latency exceeds this")
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    add_stub_arguments(parser)
+    args = parser.parse_args()
+    if not args.latency:
+        args.latency = DEFAULT_LATENCY
+
+    report = {}
+    with StubServer(stub_config_from_args(args)) as stub:
+        configure_environment(stub.url, args.cache, args.snapshot)
+        if args.trace_memory:
+            tracemalloc.start()
+        # Handlers print one EMF metrics line per invocation; keep them out of the report
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            if args.snapshot:
+                __import__('snapshot_refresher').lambda_handler({}, LambdaContextStub())
+            for name in args.route or ROUTES:
+                report[name] = run_route(name, stub, args.requests, args.concurrency, args.trace_memory, args.unified)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"{'route':<26}{'reqs':>6}{'errors':>8}{'p50':>9}{'p95':>9}{'p99':>9}{'rps':>9}{'mem MB':>9}{'calls/req':>11}")
+        for name, stats in report.items():
+            print(
+                f"{name:<26}{stats['requests']:>6}{stats['errors']:>8}{stats['p50_ms']:>9.1f}{stats['p95_ms']:>9.1f}"
+                f"{stats['p99_ms']:>9.1f}{stats['throughput_rps']:>9.1f}{stats['peak_memory_mb']:>9.1f}"
+                f"{stats['upstream_calls_per_request']:>11.2f}"
+            )
+
+    failed = False
+    for name, stats in report.items():
+        if args.max_p95_ms is not None and stats['p95_ms'] > args.max_p95_ms:
+            print(f"FAIL: {name} p95 {stats['p95_ms']:.1f} ms exceeds {args.max_p95_ms} ms", file=sys.stderr)
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,133 @@
+"""Parse benchmark for SerpAPI responses: full JSON decoding vs streaming, field-selective parsing.
+
+For each engine with a fixture under ``fixtures/<engine>/default.json`` the
+response body is fed in ``CHUNK_SIZE`` pieces, as it arrives off the socket,
+to both paths:
+
+- ``full``: the body is joined and decoded in one go, as ``response.json()`` does
+- ``streaming``: ``SelectiveParser`` builds only the fields in ``RESPONSE_FIELDS``
+
+and reports parse time, the part of it left once the last chunk has arrived
+(the rest overlaps the download when streaming), the Python heap peak while
+parsing (tracemalloc) and the heap still held by the parsed result.
+``--scale`` repeats the result lists (flights, properties) to model larger
+responses.
+
+Run from the project folder (``travel-planner``)::
+
+    python lib/assets/lambda/benchmarks/parse_benchmark.py --runs 50
+    python lib/assets/lambda/benchmarks/parse_benchmark.py --scale 4 --json
+"""
+import argparse
+import gc
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+LAMBDA_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+sys.path.insert(0, LAMBDA_DIR)
+
+from shared.response_parser import RESPONSE_FIELDS, SelectiveParser  # noqa: E402
+from shared.serpapi_client import CHUNK_SIZE  # noqa: E402
+
+
+def load_body(engine: str, scale: int) -> bytes:
+    with open(os.path.join(FIXTURES_DIR, engine, 'default.json'), 'rb') as f:
+        body = f.read()
+    if scale == 1:
+        return body
+    document = json.loads(body)
+    for key in RESPONSE_FIELDS[engine]:
+        if isinstance(document.get(key), list):
+            document[key] = document[key] * scale
+    return json.dumps(document).encode()
+
+
+def chunks(body: bytes) -> List[bytes]:
+    return [body[start:start + CHUNK_SIZE] for start in range(0, len(body), CHUNK_SIZE)]
+
+
+def parse_full(engine: str, body: bytes, on_last_chunk: Callable[[], None] = None) -> Dict:
+    received = chunks(body)
+    if on_last_chunk:
+        on_last_chunk()
+    return json.loads(b''.join(received).decode('utf-8'))
+
+
+def parse_streaming(engine: str, body: bytes, on_last_chunk: Callable[[], None] = None) -> Dict:
+    parser = SelectiveParser(RESPONSE_FIELDS[engine])
+    *head, last = chunks(body)
+    for chunk in head:
+        parser.feed(chunk)
+    if on_last_chunk:
+        on_last_chunk()
+    parser.feed(last)
+    return parser.close()
+
+
+PARSERS: Dict[str, Callable[..., Dict]] = {'full': parse_full, 'streaming': parse_streaming}
+
+
+def measure(parse: Callable[..., Dict], engine: str, body: bytes, runs: int) -> Dict:
+    timings: List[float] = []
+    tails: List[float] = []
+    for _ in range(runs):
+        marks = []
+        start = time.perf_counter()
+        parse(engine, body, lambda: marks.append(time.perf_counter()))
+        end = time.perf_counter()
+        timings.append((end - start) * 1000)
+        tails.append((end - marks[0]) * 1000)
+
+    gc.collect()
+    tracemalloc.start()
+    result = parse(engine, body)
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    timings.sort()
+    return {
+        'parse_p50_ms': statistics.median(timings),
+        'parse_p95_ms': timings[min(len(timings) - 1, int(0.95 * len(timings)))],
+        'after_last_chunk_p50_ms': statistics.median(tails),
+        'peak_kb': peak / 1024,
+        'retained_kb': retained / 1024,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--engine', action='append', choices=sorted(RESPONSE_FIELDS), help='Engine to parse (repeatable; default all)')
+    parser.add_argument('--runs', type=int, default=50, help='Timed parses per engine and path')
+    parser.add_argument('--scale', type=int, default=1, help='Repeat the result lists this many times')
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+    args = parser.parse_args()
+
+    report = {}
+    for engine in args.engine or sorted(RESPONSE_FIELDS):
+        body = load_body(engine, args.scale)
+        report[engine] = {'body_kb': len(body) / 1024}
+        for name, parse in PARSERS.items():
+            report[engine][name] = measure(parse, engine, body, args.runs)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    print(f"{'engine':<16}{'body KB':>9}{'path':>11}{'p50 ms':>9}{'p95 ms':>9}{'tail ms':>9}{'peak KB':>10}{'kept KB':>10}")
+    for engine, stats in report.items():
+        for name in PARSERS:
+            row = stats[name]
+            print(
+                f"{engine:<16}{stats['body_kb']:>9.1f}{name:>11}{row['parse_p50_ms']:>9.2f}{row['parse_p95_ms']:>9.2f}{row['after_last_chunk_p50_ms']:>9.2f}"
+                f"{row['peak_kb']:>10.1f}{row['retained_kb']:>10.1f}"
+            )
+
+
+if __name__ == '__main__':
+    main()
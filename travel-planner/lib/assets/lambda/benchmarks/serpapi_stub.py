@@ -0,0 +1,279 @@
+"""Offline record/replay stand-in for the SerpApi search endpoint.
+
+Serves recorded ``google_flights``, ``google_hotels`` and ``google_finance``
+responses from ``fixtures/<engine>/``, with per-engine latency drawn from a
+log-normal distribution and an optional error rate, so handlers can be
+exercised and benchmarked with no network and no API key. Point a handler at
+it with ``SERPAPI_BASE_URL``.
+
+A request is answered with ``fixtures/<engine>/<key>.json`` when a response was
+recorded for the same parameters, and with ``fixtures/<engine>/default.json``
+otherwise. ``--record`` forwards unrecorded requests to the real SerpApi (using
+``SERPAPI_API_KEY``) and saves the responses as new fixtures.
+
+Run from the project folder (``travel-planner``)::
+
+    python lib/assets/lambda/benchmarks/serpapi_stub.py --port 8080 --latency google_flights=800:2500 --error-rate 0.05
+    SERPAPI_BASE_URL=http://127.0.0.1:8080 python ...
+"""
+import argparse
+import hashlib
+import json
+import math
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlparse
+from urllib.request import urlopen
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+# Parameters that do not change the response and are left out of fixture keys
+IGNORED_PARAMS = {'api_key', 'output'}
+
+
+def fixture_key(params: Dict[str, str]) -> str:
+    """Stable name for a recorded response, independent of parameter order and API key."""
+    canonical = sorted((key, value) for key, value in params.items() if key not in IGNORED_PARAMS)
+    return hashlib.sha256(json.dumps(canonical).encode()).hexdigest()[:16]
+
+
+class Latency:
+    """Log-normal latency with the given median and 99th percentile, in milliseconds."""
+
+    def __init__(self, median_ms: float = 0, p99_ms: Optional[float] = None):
+        self.median_ms = median_ms
+        p99_ms = median_ms if p99_ms is None else max(p99_ms, median_ms)
+        # 2.326 is the standard normal 99th percentile
+        self.sigma = math.log(p99_ms / median_ms) / 2.326 if median_ms > 0 else 0
+
+    @classmethod
+    def parse(cls, value: str) -> 'Latency':
+        """Parse ``median`` or ``median:p99``."""
+        median, _, p99 = value.partition(':')
+        return cls(float(median), float(p99) if p99 else None)
+
+    def sample(self) -> float:
+        if self.median_ms <= 0:
+            return 0
+        return random.lognormvariate(math.log(self.median_ms), self.sigma)
+
+
+class StubConfig:
+    """How the stub behaves per engine; engines without an entry use ``default_latency``."""
+
+    def __init__(
+        self,
+        latency: Dict[str, Latency] = None,
+        default_latency: Latency = None,
+        error_rate: float = 0,
+        error_statuses: Tuple[int, ...] = (429, 500),
+        record: bool = False,
+        fixtures_dir: str = FIXTURES_DIR,
+    ):
+        self.latency = latency or {}
+        self.default_latency = default_latency or Latency()
+        self.error_rate = error_rate
+        self.error_statuses = error_statuses
+        self.record = record
+        self.fixtures_dir = fixtures_dir
+
+    def latency_for(self, engine: str) -> Latency:
+        return self.latency.get(engine, self.default_latency)
+
+
+class FixtureStore:
+    """Reads recorded responses, keeping each fixture's encoded body in memory."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._bodies = {}
+        self._lock = threading.Lock()
+
+    def _path(self, engine: str, name: str) -> str:
+        return os.path.join(self.directory, engine, f"{name}.json")
+
+    def _read(self, engine: str, name: str) -> Optional[bytes]:
+        path = self._path(engine, name)
+        with self._lock:
+            if path not in self._bodies:
+                try:
+                    with open(path, 'rb') as f:
+                        # Re-encoded compactly, as SerpApi serves it
+                        self._bodies[path] = json.dumps(json.load(f), separators=(',', ':')).encode()
+                except FileNotFoundError:
+                    self._bodies[path] = None
+            return self._bodies[path]
+
+    def get(self, engine: str, params: Dict[str, str]) -> Optional[bytes]:
+        return self._read(engine, fixture_key(params)) or self._read(engine, 'default')
+
+    def has_recording(self, engine: str, params: Dict[str, str]) -> bool:
+        return os.path.exists(self._path(engine, fixture_key(params)))
+
+    def save(self, engine: str, params: Dict[str, str], body: bytes) -> None:
+        path = self._path(engine, fixture_key(params))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(json.loads(body), f, indent=1)
+        with self._lock:
+            self._bodies.pop(path, None)
+
+
+def _fetch_live(params: Dict[str, str]) -> bytes:
+    query = {**params, 'api_key': os.environ['SERPAPI_API_KEY'], 'output': 'json'}
+    with urlopen(f"https://serpapi.com/search?{urlencode(query)}", timeout=60) as response:
+        return response.read()
+
+
+class StubServer:
+    """Threaded HTTP server answering ``/search`` like SerpApi does.
+
+    ``calls`` counts requests per engine, errors included, and can be reset
+    between measurements with ``reset_calls``.
+    """
+
+    def __init__(self, config: StubConfig = None, host: str = '127.0.0.1', port: int = 0):
+        self.config = config or StubConfig()
+        self.fixtures = FixtureStore(self.config.fixtures_dir)
+        self.calls = Counter()
+        self._calls_lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), _make_handler(self))
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'StubServer':
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def serve_forever(self) -> None:
+        """Serve in the calling thread until interrupted."""
+        try:
+            self._server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._server.server_close()
+
+    def __enter__(self) -> 'StubServer':
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def reset_calls(self) -> Dict[str, int]:
+        """Return the call counts so far and start counting from zero."""
+        with self._calls_lock:
+            calls = dict(self.calls)
+            self.calls.clear()
+        return calls
+
+    def respond(self, params: Dict[str, str]) -> Tuple[int, bytes]:
+        """Return ``(status, body)`` for one search request."""
+        engine = params.get('engine', '')
+        with self._calls_lock:
+            self.calls[engine] += 1
+
+        time.sleep(self.config.latency_for(engine).sample() / 1000)
+        if self.config.error_rate and random.random() < self.config.error_rate:
+            status = random.choice(self.config.error_statuses)
+            return status, json.dumps({'error': f"Stub error (HTTP {status})"}).encode()
+
+        if self.config.record and not self.fixtures.has_recording(engine, params):
+            body = _fetch_live(params)
+            self.fixtures.save(engine, params, body)
+            return 200, body
+
+        body = self.fixtures.get(engine, params)
+        if body is None:
+            return 400, json.dumps({'error': f"Unsupported engine {engine}"}).encode()
+        return 200, body
+
+
+def _make_handler(stub: StubServer):
+    class _Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        # Headers and body go out in separate writes; without this, Nagle's
+        # algorithm and delayed ACKs add ~40 ms to small responses
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path != '/search':
+                status, body = 404, b'{"error": "Not found"}'
+            else:
+                status, body = stub.respond(dict(parse_qsl(url.query)))
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return _Handler
+
+
+def add_stub_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the options shared by every script that runs the stub."""
+    parser.add_argument(
+        '--latency', action='append', default=[], metavar='ENGINE=MEDIAN[:P99]',
+        help='Upstream latency in ms for one engine, e.g. google_flights=800:2500 (repeatable)',
+    )
+    parser.add_argument('--default-latency', default='0', metavar='MEDIAN[:P99]', help='Latency in ms for other engines')
+    parser.add_argument('--error-rate', type=float, default=0, help='Fraction of requests answered with an error status')
+    parser.add_argument(
+        '--error-statuses', default='429,500',
+        help='Comma-separated statuses errors are drawn from (default 429,500)',
+    )
+
+
+def stub_config_from_args(args: argparse.Namespace, record: bool = False) -> StubConfig:
+    latency = {}
+    for value in args.latency:
+        engine, _, spec = value.partition('=')
+        latency[engine] = Latency.parse(spec)
+    return StubConfig(
+        latency=latency,
+        default_latency=Latency.parse(args.default_latency),
+        error_rate=args.error_rate,
+        error_statuses=tuple(int(status) for status in args.error_statuses.split(',')),
+        record=record,
+    )
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--record', action='store_true', help='Forward unrecorded requests to SerpApi and save them')
+    add_stub_arguments(parser)
+    args = parser.parse_args(argv)
+
+    if args.record and not os.environ.get('SERPAPI_API_KEY'):
+        parser.error('--record needs SERPAPI_API_KEY')
+
+    stub = StubServer(stub_config_from_args(args, record=args.record), args.host, args.port)
+    print(f"SerpApi stub listening on {stub.url}", file=sys.stderr)
+    stub.serve_forever()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
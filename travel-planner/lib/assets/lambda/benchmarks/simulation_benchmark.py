@@ -0,0 +1,87 @@
+"""Benchmark for the affordability simulation behind ``/simulate_affordability``.
+
+For each portfolio size a year of synthetic daily closes is generated, driven
+by a few common market factors plus noise of each symbol's own, and the
+benchmark reports the time to fit the risk model (done once per symbol set and
+cached) and to simulate the portfolio at the travel date, along with the
+number of factors kept. Histories are generated in memory, so neither SerpAPI
+nor the stub is involved.
+
+Run from the project folder (``travel-planner``)::
+
+    python lib/assets/lambda/benchmarks/simulation_benchmark.py
+    python lib/assets/lambda/benchmarks/simulation_benchmark.py --symbols 50 --symbols 2000 --paths 100000 --json
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from typing import Dict, List
+
+import numpy as np
+
+LAMBDA_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, LAMBDA_DIR)
+os.environ.setdefault('POWERTOOLS_METRICS_NAMESPACE', 'Benchmark')
+
+from shared.affordability import SIMULATION_PATHS, simulate_affordability  # noqa: E402
+from shared.risk_model import RiskModel  # noqa: E402
+
+TRADING_DAYS = 252
+FIRST_DAY = 738000
+
+
+def synthetic_histories(symbols: int, rng: np.random.Generator, factors: int = 3) -> Dict[str, tuple]:
+    """A year of daily closes per symbol, in the ``(days, closes, fetched_at)`` form the history cache holds."""
+    common = rng.standard_normal((TRADING_DAYS, factors)) * 0.01
+    returns = common @ rng.uniform(0.5, 1.5, (factors, symbols)) + rng.standard_normal((TRADING_DAYS, symbols)) * 0.01
+    closes = 100 * np.exp(np.vstack([np.zeros(symbols), np.cumsum(returns, axis=0)]))
+    days = np.arange(FIRST_DAY, FIRST_DAY + TRADING_DAYS + 1)
+    return {f"SYM{i}": (days, closes[:, i], 0.0) for i in range(symbols)}
+
+
+def measure(symbols: int, paths: int, runs: int, rng: np.random.Generator) -> Dict:
+    histories = synthetic_histories(symbols, rng)
+    start = time.perf_counter()
+    model = RiskModel.fit(histories)
+    fit_ms = (time.perf_counter() - start) * 1000
+
+    values = np.full(symbols, 10000.0 / symbols)
+    timings: List[float] = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        simulate_affordability(values, model, 0.0, 8000.0, 90, paths, rng=rng)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return {
+        'factors': model.loadings.shape[1],
+        'fit_ms': fit_ms,
+        'simulate_p50_ms': statistics.median(timings),
+        'simulate_max_ms': timings[-1],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--symbols', type=int, action='append', help='Portfolio size (repeatable; default 3, 30, 500 and 2000)')
+    parser.add_argument('--paths', type=int, default=SIMULATION_PATHS, help='Simulated paths per run')
+    parser.add_argument('--runs', type=int, default=10, help='Timed simulations per portfolio size')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the synthetic histories and the simulations')
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    report = {size: measure(size, args.paths, args.runs, rng) for size in args.symbols or [3, 30, 500, 2000]}
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    print(f"{'symbols':>8}{'factors':>9}{'fit ms':>9}{'sim p50 ms':>12}{'sim max ms':>12}")
+    for size, row in report.items():
+        print(f"{size:>8}{row['factors']:>9}{row['fit_ms']:>9.1f}{row['simulate_p50_ms']:>12.1f}{row['simulate_max_ms']:>12.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,318 @@
+import json
+from datetime import date
+from typing import Dict
+from typing_extensions import Annotated
+
+from aws_lambda_powertools import Logger, Tracer
+from aws_lambda_powertools.event_handler.api_gateway import Router
+from aws_lambda_powertools.event_handler.openapi.params import Query
+
+from shared.currency import DEFAULT_CURRENCY, CurrencyError, normalize_currency
+from shared.portfolio_model import PortfolioError, load_portfolio, share_count
+from shared.pricing import prices_in_currency
+
+tracer = Tracer()
+logger = Logger(child=True)
+# Routes of the portfolio action group, served by portfolio_agent.py or together with the travel routes by unified_agent.py
+router = Router()
+
+# Info of the action group's OpenAPI schema
+OPENAPI_INFO = {
+    'title': "Portfolio Checker API",
+    'version': "1.0.0",
+    'description': "API for checking stock portfolio value and comparing with travel costs",
+    'tags': ["finance", "portfolio", "stocks"],
+}
+
+@router.get("/check_portfolio", description="Check stock portfolio value and compare with travel budget using Google Finance")
+@tracer.capture_method
+def check_portfolio(
+    travel_budget: Annotated[float, Query(description="Estimated travel budget to compare against portfolio value, in the requested currency")] = None,
+    currency: Annotated[str, Query(description="Three-letter code of the currency to value the portfolio in. e.g. USD, EUR or JPY")] = DEFAULT_CURRENCY
+) -> Dict:
+    """Check portfolio value and compare with travel budget."""
+    try:
+        currency = normalize_currency(currency)
+        portfolio = load_portfolio()
+        
+        if not portfolio:
+            return {
+                'statusCode': 400,
+                'body': json.dumps({
+                    'error': 'No portfolio configured'
+                })
+            }
+        
+        total_value = 0
+        stock_values = {}
+        
+        prices, _, failed_symbols = prices_in_currency(portfolio.symbols, currency)
+        
+        for symbol, quantity in portfolio.items():
+            if symbol not in prices:
+                continue
+                
+            price = prices[symbol]
+            value = price * quantity
+            total_value += value
+            stock_values[symbol] = {
+                'quantity': share_count(quantity),
+                'price': price,
+                'value': value
+            }
+        
+        result = {
+            'total_value': total_value,
+            'currency': currency,
+            'stocks': stock_values
+        }
+        
+        if failed_symbols:
+            # Partial result: the listed symbols are excluded from total_value
+            result['failed_symbols'] = failed_symbols
+        
+        if travel_budget is not None:
+            result.update({
+                'can_afford_travel': total_value >= travel_budget,
+                'travel_budget': travel_budget,
+                'remaining_after_travel': total_value - float(travel_budget)
+            })
+        
+        return {
+            'statusCode': 200,
+            'body': json.dumps(result)
+        }
+        
+    except PortfolioError as e:
+        logger.error(f"Invalid portfolio configuration: {str(e)}")
+        return {
+            'statusCode': 400,
+            'body': json.dumps({
+                'error': f"Invalid portfolio configuration: {str(e)}"
+            })
+        }
+        
+    except CurrencyError as e:
+        logger.error(f"Currency conversion failed: {str(e)}")
+        return {
+            'statusCode': 400,
+            'body': json.dumps({
+                'error': str(e)
+            })
+        }
+        
+    except Exception as e:
+        logger.error(f"Error in portfolio checking: {str(e)}")
+        return {
+            'statusCode': 500,
+            'body': json.dumps({
+                'error': f"Internal server error: {str(e)}"
+            })
+        }
+
+@router.get("/calculate_shares_to_sell", description="Calculate how many shares of each stock to sell to meet a target amount")
+@tracer.capture_method
+def calculate_shares_to_sell(
+    target_amount: Annotated[float, Query(description="The target amount needed from selling shares, in the requested currency")],
+    strategy: Annotated[str, Query(description="Strategy for selling shares: 'proportional' (sell equal percentage from each), 'single_stock' (sell from highest value stock first), 'whole_shares' (proportional in whole shares), 'min_positions' (whole shares from as few stocks as possible) or 'tax_aware' (whole shares from the lots with the smallest taxable gain first)")] = "proportional",
+    max_per_position: Annotated[float, Query(description="Maximum fraction of each position that may be sold, between 0 and 1. e.g. 0.5 to sell at most half of any stock")] = 1.0,
+    currency: Annotated[str, Query(description="Three-letter code of the currency target_amount and the result are in. e.g. USD, EUR or JPY")] = DEFAULT_CURRENCY
+) -> Dict:
+    """Calculate which shares to sell to meet a target amount."""
+    try:
+        currency = normalize_currency(currency)
+        portfolio = load_portfolio()
+        
+        if not portfolio:
+            return {
+                'statusCode': 400,
+                'body': json.dumps({
+                    'error': 'No portfolio configured',
+                    'shares_to_sell': {}
+                })
+            }
+        
+        # Get current prices and values
+        stock_values = {}
+        total_value = 0
+        
+        prices, rates, failed_symbols = prices_in_currency(portfolio.symbols, currency)
+        
+        for symbol, quantity in portfolio.items():
+            if symbol not in prices:
+                continue
+                
+            price = prices[symbol]
+            value = price * quantity
+            total_value += value
+            stock_values[symbol] = {
+                'quantity': share_count(quantity),
+                'price': round(price, 2),
+                'value': round(value, 2)
+            }
+        
+        if target_amount > total_value:
+            return {
+                'statusCode': 400,
+                'body': json.dumps({
+                    'error': f'Insufficient portfolio value ({round(total_value, 2)} {currency}) to meet target amount ({round(target_amount, 2)} {currency})',
+                    'shares_to_sell': {},
+                    'failed_symbols': failed_symbols
+                })
+            }
+        
+        # Imported here so NumPy only loads for the route that needs it
+        from shared.sell_planner import SalePlanError, plan_sale
+        
+        try:
+            shares_to_sell = plan_sale(portfolio, prices, target_amount, strategy, max_per_position, rates, currency)
+        except SalePlanError as e:
+            return {
+                'statusCode': 400,
+                'body': json.dumps({
+                    'error': str(e),
+                    'shares_to_sell': {},
+                    'failed_symbols': failed_symbols
+                })
+            }
+        
+        return {
+            'statusCode': 200,
+            'body': json.dumps({
+                'target_amount': round(target_amount, 2),
+                'currency': currency,
+                'strategy': strategy,
+                'shares_to_sell': shares_to_sell,
+                'total_portfolio_value': round(total_value, 2),
+                'remaining_value': round(total_value - target_amount, 2),
+                'failed_symbols': failed_symbols
+            })
+        }
+        
+    except PortfolioError as e:
+        logger.error(f"Invalid portfolio configuration: {str(e)}")
+        return {
+            'statusCode': 400,
+            'body': json.dumps({
+                'error': f"Invalid portfolio configuration: {str(e)}",
+                'shares_to_sell': {}
+            })
+        }
+        
+    except CurrencyError as e:
+        logger.error(f"Currency conversion failed: {str(e)}")
+        return {
+            'statusCode': 400,
+            'body': json.dumps({
+                'error': str(e),
+                'shares_to_sell': {}
+            })
+        }
+        
+    except Exception as e:
+        logger.error(f"Error calculating shares to sell: {str(e)}")
+        return {
+            'statusCode': 500,
+            'body': json.dumps({
+                'error': f"Internal server error: {str(e)}",
+                'shares_to_sell': {}
+            })
+        }
+
+@router.get("/simulate_affordability", description="Simulate how likely the stock portfolio is to still cover the travel budget on the travel date, from each stock's historical volatility and correlation")
+@tracer.capture_method
+def simulate_affordability(
+    travel_budget: Annotated[float, Query(description="Estimated travel budget the portfolio has to cover, in the requested currency")],
+    travel_date: Annotated[str, Query(description="Date the travel budget is needed. The format is YYYY-MM-DD. e.g. 2024-02-10")],
+    cost_volatility: Annotated[float, Query(description="Annualized volatility of the trip cost, e.g. 0.2 if prices may drift 20% over a year. 0 keeps the budget fixed")] = 0.0,
+    simulations: Annotated[int, Query(description="Number of simulated price paths. Only set when the user asks for more or fewer")] = None,
+    currency: Annotated[str, Query(description="Three-letter code of the currency travel_budget and the result are in. e.g. USD, EUR or JPY")] = DEFAULT_CURRENCY
+) -> Dict:
+    """Estimate the odds of affording the trip with a Monte Carlo simulation of the portfolio."""
+    # Imported here so NumPy only loads for the routes that need it
+    from shared.affordability import MAX_SIMULATION_PATHS, SIMULATION_PATHS, simulate_affordability as simulate
+    from shared.risk_model import HISTORY_WINDOW, risk_model
+
+    try:
+        currency = normalize_currency(currency)
+        horizon_days = (date.fromisoformat(travel_date) - date.today()).days
+        if horizon_days < 0:
+            raise ValueError("The travel date must not be in the past.")
+        if cost_volatility < 0:
+            raise ValueError("cost_volatility must not be negative.")
+        simulations = SIMULATION_PATHS if simulations is None else simulations
+        if simulations < 1:
+            raise ValueError("simulations must be at least 1.")
+        simulations = min(simulations, MAX_SIMULATION_PATHS)
+
+        portfolio = load_portfolio()
+        
+        if not portfolio:
+            return {
+                'statusCode': 400,
+                'body': json.dumps({
+                    'error': 'No portfolio configured'
+                })
+            }
+        
+        prices, _, failed_symbols = prices_in_currency(portfolio.symbols, currency)
+        values = {symbol: prices[symbol] * quantity for symbol, quantity in portfolio.items() if symbol in prices}
+        
+        # Positions without a usable history keep today's value in every path
+        model, unmodeled_symbols = risk_model(list(values))
+        modeled = model.symbols if model is not None else []
+        fixed_value = sum(value for symbol, value in values.items() if symbol not in modeled)
+        
+        result = simulate(
+            [values[symbol] for symbol in modeled], model, fixed_value,
+            travel_budget, horizon_days, simulations, cost_volatility
+        )
+        
+        result.update({
+            'probability_affordable': round(result['probability_affordable'], 4),
+            'expected_remaining': round(result['expected_remaining'], 2),
+            'current_value': round(sum(values.values()), 2),
+            'travel_budget': travel_budget,
+            'travel_date': travel_date,
+            'horizon_days': horizon_days,
+            'currency': currency,
+            'simulations': simulations,
+            'history_window': HISTORY_WINDOW,
+            'modeled_symbols': modeled,
+            # Held at today's value: no price history to estimate their volatility from
+            'unmodeled_symbols': unmodeled_symbols,
+            # Excluded from every path: no current price
+            'failed_symbols': failed_symbols
+        })
+        
+        return {
+            'statusCode': 200,
+            'body': json.dumps(result)
+        }
+        
+    except PortfolioError as e:
+        logger.error(f"Invalid portfolio configuration: {str(e)}")
+        return {
+            'statusCode': 400,
+            'body': json.dumps({
+                'error': f"Invalid portfolio configuration: {str(e)}"
+            })
+        }
+        
+    except (CurrencyError, ValueError) as e:
+        logger.error(f"Invalid simulation request: {str(e)}")
+        return {
+            'statusCode': 400,
+            'body': json.dumps({
+                'error': str(e)
+            })
+        }
+        
+    except Exception as e:
+        logger.error(f"Error simulating affordability: {str(e)}")
+        return {
+            'statusCode': 500,
+            'body': json.dumps({
+                'error': f"Internal server error: {str(e)}"
+            })
+        }
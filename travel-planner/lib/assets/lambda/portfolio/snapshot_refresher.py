@@ -0,0 +1,40 @@
+import os
+import time
+from typing import Dict
+
+from aws_lambda_powertools import Logger
+from aws_lambda_powertools.utilities.typing import LambdaContext
+
+from shared.observability import log_metrics, metrics
+from shared.portfolio_model import load_portfolio
+from shared.price_snapshot import publish_snapshot
+from shared.pricing import refresh_quotes
+
+# Wall-clock budget for pricing the whole portfolio on each run
+REFRESH_DEADLINE_SECONDS = float(os.environ.get('PRICE_SNAPSHOT_REFRESH_DEADLINE_SECONDS', '120'))
+
+logger = Logger()
+
+
+@logger.inject_lambda_context
+@log_metrics
+def lambda_handler(event: dict, context: LambdaContext) -> Dict:
+    """Price every portfolio symbol and publish a new price snapshot; run on a schedule."""
+    metrics.add_dimension(name="route", value="snapshot_refresh")
+    portfolio = load_portfolio()
+
+    started_at = time.time()
+    # Background priority: interactive requests sharing the SerpAPI budget go first
+    prices, failed_symbols = refresh_quotes(portfolio.symbols, deadline=REFRESH_DEADLINE_SECONDS)
+    if failed_symbols:
+        logger.warning(f"Snapshot is missing {len(failed_symbols)} symbols", extra={'failed_symbols': failed_symbols})
+
+    if portfolio and not prices:
+        # Keep serving the previous snapshot until it goes stale rather than publishing an empty one
+        logger.error("No prices fetched; snapshot not published")
+        return {'published': False, 'symbols': 0, 'failed_symbols': failed_symbols}
+
+    # Stamped with the start of the run, so the snapshot's age covers its oldest price
+    size = publish_snapshot(prices, created_at=started_at)
+    logger.info(f"Published price snapshot of {len(prices)} symbols ({size} bytes)")
+    return {'published': True, 'symbols': len(prices), 'bytes': size, 'failed_symbols': failed_symbols}
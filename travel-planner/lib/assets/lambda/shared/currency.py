@@ -0,0 +1,284 @@
+import os
+import re
+import threading
+import time
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+from aws_lambda_powertools import Logger
+
+from shared.observability import record_cache
+
+logger = Logger(child=True)
+
+# Currency flight and hotel searches are run in, and the default for every amount returned
+DEFAULT_CURRENCY = os.environ.get('DEFAULT_CURRENCY', 'USD').upper()
+
+# Daily reference rates against the euro, as published by the European Central Bank
+FX_RATES_URL = os.environ.get('FX_RATES_URL', 'https://www.ecb.europa.eu/stats/eurofxref/eurofxref-daily.xml')
+# How long a fetched rate table is used, and how long to wait before retrying a failed fetch
+FX_CACHE_TTL_SECONDS = float(os.environ.get('FX_CACHE_TTL_SECONDS', '21600'))
+FX_RETRY_SECONDS = float(os.environ.get('FX_RETRY_SECONDS', '60'))
+FX_TIMEOUT_SECONDS = float(os.environ.get('FX_TIMEOUT_SECONDS', '5'))
+
+# Quotes in minor units, as some exchanges list them: code -> (currency, minor units per unit)
+SUBUNITS = {
+    'GBX': ('GBP', 100),
+    'ZAC': ('ZAR', 100),
+    'ILA': ('ILS', 100),
+}
+
+# Listing currency of each Google Finance exchange (the part after ':' in e.g. 7203:TYO)
+EXCHANGE_CURRENCIES = {
+    'NASDAQ': 'USD', 'NYSE': 'USD', 'NYSEARCA': 'USD', 'NYSEAMERICAN': 'USD', 'BATS': 'USD', 'OTCMKTS': 'USD',
+    'TSE': 'CAD', 'CVE': 'CAD', 'NEO': 'CAD',
+    'BMV': 'MXN', 'BVMF': 'BRL',
+    'LON': 'GBX',
+    'ETR': 'EUR', 'FRA': 'EUR', 'EPA': 'EUR', 'AMS': 'EUR', 'EBR': 'EUR', 'ELI': 'EUR', 'BIT': 'EUR',
+    'BME': 'EUR', 'VIE': 'EUR', 'HEL': 'EUR', 'ISE': 'EUR',
+    'SWX': 'CHF', 'STO': 'SEK', 'CPH': 'DKK', 'OSL': 'NOK', 'WSE': 'PLN', 'IST': 'TRY', 'TLV': 'ILA',
+    'JSE': 'ZAC',
+    'TYO': 'JPY', 'HKG': 'HKD', 'SHA': 'CNY', 'SHE': 'CNY', 'KRX': 'KRW', 'KOSDAQ': 'KRW',
+    'NSE': 'INR', 'BOM': 'INR', 'SGX': 'SGD', 'IDX': 'IDR', 'KLSE': 'MYR', 'BKK': 'THB',
+    'ASX': 'AUD', 'NZE': 'NZD',
+}
+
+# Currency symbols, longest first so e.g. CA$ is not read as $
+_SYMBOLS = (
+    ('CA$', 'CAD'), ('AU$', 'AUD'), ('NZ$', 'NZD'), ('HK$', 'HKD'), ('MX$', 'MXN'), ('US$', 'USD'), ('NT$', 'TWD'),
+    ('C$', 'CAD'), ('A$', 'AUD'), ('S$', 'SGD'), ('R$', 'BRL'),
+    ('zł', 'PLN'), ('Kč', 'CZK'), ('Ft', 'HUF'), ('RM', 'MYR'), ('Rp', 'IDR'),
+    ('€', 'EUR'), ('£', 'GBP'), ('₹', 'INR'), ('₩', 'KRW'), ('₺', 'TRY'), ('฿', 'THB'), ('₱', 'PHP'),
+    ('₪', 'ILS'), ('₫', 'VND'),
+    # Shared by several currencies, see _SHARED_SYMBOLS
+    ('$', 'USD'), ('¥', 'JPY'),
+)
+# Currencies written with a bare shared symbol; the caller's default wins when it is one of them
+_SHARED_SYMBOLS = {
+    '$': {'USD', 'CAD', 'AUD', 'NZD', 'HKD', 'SGD', 'MXN', 'TWD'},
+    '¥': {'JPY', 'CNY'},
+}
+_CODE = re.compile(r'(?<![A-Za-z])([A-Z]{3})(?![A-Za-z])')
+# Currencies priced in whole units in practice, so a lone '.' before three digits can only group thousands
+_WHOLE_UNIT_CURRENCIES = {'JPY', 'KRW', 'VND', 'IDR', 'CLP', 'COP', 'HUF', 'ISK', 'PYG', 'UGX'}
+
+
+class CurrencyError(ValueError):
+    """Raised for an unknown currency or when no exchange rate is available."""
+
+
+def normalize_currency(code: str) -> str:
+    """Validate a three-letter currency code, e.g. ``eur`` -> ``EUR``."""
+    normalized = (code or '').strip().upper()
+    if not re.fullmatch(r'[A-Z]{3}', normalized):
+        raise CurrencyError(f"Invalid currency '{code}'. Use a three-letter code such as USD or EUR.")
+    return normalized
+
+
+def _is_thousands(text: str, separator: str, whole_units: bool) -> bool:
+    """Whether the only ``separator`` in ``text`` groups thousands rather than separating decimals."""
+    leading, _, trailing = text.partition(separator)
+    # 0.125 and 1234.567 cannot be grouped thousands
+    if len(trailing) != 3 or not re.fullmatch(r'[1-9]\d{0,2}', leading):
+        return False
+    # Otherwise ambiguous: 1,234 is grouped as SerpAPI writes English amounts, 1.005 is decimal unless
+    # the currency has no decimals (Rp 15.000)
+    return separator == ',' or whole_units
+
+
+def _number(text: str, whole_units: bool = False) -> Optional[float]:
+    """Parse digits with either ',' or '.' as the decimal separator."""
+    text = re.sub(r"[\s'’]", '', text)
+    negative = text.startswith('-')
+    text = text.lstrip('+-')
+    if not text or not re.fullmatch(r'[\d.,]+', text):
+        return None
+    if '.' in text and ',' in text:
+        # Whichever comes last separates the decimals
+        decimal = '.' if text.rfind('.') > text.rfind(',') else ','
+        text = text.replace(',' if decimal == '.' else '.', '').replace(decimal, '.')
+    else:
+        for separator in '.,':
+            if separator not in text:
+                continue
+            if text.count(separator) > 1 or _is_thousands(text, separator, whole_units):
+                text = text.replace(separator, '')
+            else:
+                text = text.replace(separator, '.')
+    try:
+        value = float(text)
+    except ValueError:
+        return None
+    return -value if negative else value
+
+
+def parse_amount(value, default_currency: str = None) -> Tuple[Optional[float], Optional[str]]:
+    """Parse a price such as ``"$1,234.50"``, ``"1.234,50 €"``, ``"CHF 1'234"`` or ``"12 345 zł"``.
+
+    Returns ``(amount, currency)``. The currency comes from an ISO code or
+    symbol in the text; plain numbers take ``default_currency``, as do
+    shared symbols such as ``$`` when the default is written with them.
+    A lone ',' between a 1-3 digit group (not 0) and three digits groups
+    thousands, so ``"1,234"`` is 1234; a lone '.' there is a decimal point,
+    so ``"1.005"`` is 1.005, except in currencies without decimals such as
+    IDR. ``"0.125"`` and ``"0,125"`` are always decimals.
+    """
+    if value is None or isinstance(value, bool):
+        return None, None
+    if isinstance(value, (int, float)):
+        return float(value), default_currency
+
+    text = str(value).strip()
+    currency = None
+    match = _CODE.search(text)
+    if match:
+        currency = match.group(1)
+        text = text[:match.start()] + text[match.end():]
+    else:
+        for symbol, code in _SYMBOLS:
+            if symbol in text:
+                currency = default_currency if default_currency in _SHARED_SYMBOLS.get(symbol, ()) else code
+                text = text.replace(symbol, '')
+                break
+    currency = currency or default_currency
+    return _number(text, currency in _WHOLE_UNIT_CURRENCIES), currency
+
+
+class FxTable:
+    """Exchange rates as units of each currency per one unit of a common base."""
+
+    def __init__(self, rates: Dict[str, float], as_of: str = None):
+        self.rates = rates
+        self.as_of = as_of
+
+    def supports(self, code: str) -> bool:
+        return SUBUNITS.get(code, (code,))[0] in self.rates
+
+    def _per_base(self, code: str) -> float:
+        base, minor_units = SUBUNITS.get(code, (code, 1))
+        if base not in self.rates:
+            raise CurrencyError(f"No exchange rate for {code}.")
+        return self.rates[base] * minor_units
+
+    def factor(self, source: str, target: str) -> float:
+        """Multiplier converting an amount in ``source`` into ``target``."""
+        if source == target:
+            return 1.0
+        return self._per_base(target) / self._per_base(source)
+
+    def convert(self, amounts: Sequence[float], currencies: Union[str, Sequence[str]], target: str):
+        """Convert every amount, each in the matching currency, into ``target`` as one NumPy array."""
+        import numpy as np
+
+        amounts = np.asarray(amounts, dtype=float)
+        if isinstance(currencies, str):
+            return amounts * self.factor(currencies, target)
+        codes, inverse = np.unique(np.asarray(currencies, dtype=str), return_inverse=True)
+        factors = np.array([self.factor(code, target) for code in codes])
+        return amounts * factors[inverse]
+
+
+def _fetch_ecb_rates() -> FxTable:
+    import requests
+    from xml.etree import ElementTree
+
+    response = requests.get(FX_RATES_URL, timeout=FX_TIMEOUT_SECONDS)
+    response.raise_for_status()
+    rates = {'EUR': 1.0}
+    as_of = None
+    for element in ElementTree.fromstring(response.content).iter():
+        if 'time' in element.attrib:
+            as_of = element.attrib['time']
+        if 'currency' in element.attrib:
+            rates[element.attrib['currency']] = float(element.attrib['rate'])
+    if len(rates) == 1:
+        raise CurrencyError('No exchange rates in the response')
+    return FxTable(rates, as_of)
+
+
+class FxRates:
+    """The current rate table, fetched once and reused for ``ttl`` seconds.
+
+    Concurrent callers share a single fetch. When a refresh fails, the
+    previous table keeps being served and the fetch is retried after
+    ``FX_RETRY_SECONDS``.
+    """
+
+    def __init__(self, fetch, ttl: float):
+        self._fetch = fetch
+        self.ttl = ttl
+        self._table = None
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+
+    def table(self) -> FxTable:
+        if time.time() < self._expires_at:
+            record_cache('fx_rates', 'hit')
+            return self._table
+        with self._lock:
+            if time.time() < self._expires_at:
+                record_cache('fx_rates', 'hit')
+                return self._table
+            try:
+                self._table = self._fetch()
+                self._expires_at = time.time() + self.ttl
+                record_cache('fx_rates', 'miss')
+            except Exception as e:
+                logger.error(f"Error fetching exchange rates: {str(e)}")
+                if self._table is None:
+                    raise CurrencyError('Exchange rates are unavailable right now.') from e
+                record_cache('fx_rates', 'stale')
+                self._expires_at = time.time() + FX_RETRY_SECONDS
+            return self._table
+
+
+# Module-level so the table is shared by every request in the container
+fx_rates = FxRates(_fetch_ecb_rates, FX_CACHE_TTL_SECONDS)
+
+
+def convert(amounts: Sequence[float], currencies: Union[str, Sequence[str]], target: str):
+    """Convert amounts into ``target`` in one vectorized step.
+
+    The rate table is only consulted when some amount is not already in
+    ``target``, so same-currency requests never fetch rates.
+    """
+    if ({currencies} if isinstance(currencies, str) else set(currencies)) <= {target}:
+        import numpy as np
+
+        return np.asarray(amounts, dtype=float)
+    return fx_rates.table().convert(amounts, currencies, target)
+
+
+def symbol_currency(symbol: str) -> Optional[str]:
+    """Listing currency of a Google Finance symbol; US listings when no exchange is given, None when unknown."""
+    if ':' not in symbol:
+        return 'USD'
+    return EXCHANGE_CURRENCIES.get(symbol.rpartition(':')[2].upper())
+
+
+def convert_quotes(prices: Dict[str, float], target: str) -> Tuple[Dict[str, float], Dict[str, float], Dict[str, str]]:
+    """Convert quotes from each symbol's listing currency into ``target``.
+
+    Returns ``(prices, rates, errors)``: converted prices, the multiplier
+    applied to each symbol (also valid for amounts such as cost basis in the
+    listing currency), and the symbols that could not be converted.
+    """
+    import numpy as np
+
+    listing = {symbol: symbol_currency(symbol) for symbol in prices}
+    errors = {symbol: f"Unknown listing currency for {symbol}" for symbol, code in listing.items() if code is None}
+    factors = {target: 1.0}
+    needed = {code for code in listing.values() if code is not None} - {target}
+    if needed:
+        table = fx_rates.table()
+        if not table.supports(target):
+            raise CurrencyError(f"No exchange rate for {target}.")
+        for code in needed:
+            try:
+                factors[code] = table.factor(code, target)
+            except CurrencyError as e:
+                errors.update({symbol: str(e) for symbol, listed in listing.items() if listed == code})
+
+    symbols = [symbol for symbol in prices if symbol not in errors]
+    rates = np.array([factors[listing[symbol]] for symbol in symbols])
+    converted = np.array([prices[symbol] for symbol in symbols]) * rates
+    return dict(zip(symbols, converted.tolist())), dict(zip(symbols, rates.tolist())), errors
@@ -0,0 +1,136 @@
+import contextvars
+import functools
+import json
+import os
+import random
+import threading
+from concurrent.futures import Executor, Future
+from typing import Callable, List, Optional, Tuple
+
+from aws_lambda_powertools import Logger, Metrics
+from aws_lambda_powertools.metrics import MetricUnit
+
+# Fraction of invocations whose full payloads are logged, and the size each logged payload is cut to
+PAYLOAD_LOG_SAMPLE_RATE = float(os.environ.get('PAYLOAD_LOG_SAMPLE_RATE', '0.01'))
+PAYLOAD_LOG_MAX_BYTES = int(os.environ.get('PAYLOAD_LOG_MAX_BYTES', '2048'))
+
+# Metrics are buffered in memory and flushed as one EMF log line per invocation by @log_metrics
+metrics = Metrics(namespace=os.environ.get('POWERTOOLS_METRICS_NAMESPACE', 'TravelPlanner'))
+
+
+class _Invocation:
+    """Metrics recorded during one invocation, by the handler thread and the workers it started.
+
+    ``Metrics`` is not thread-safe, so workers only append here and the
+    handler thread adds everything to ``metrics`` before the flush. Once
+    closed, later records (stragglers past a deadline, background refreshes,
+    losing hedges) are dropped instead of leaking into the next invocation.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Optional[List[Tuple[str, str, float]]] = []
+
+    def add(self, name: str, unit: str, value: float) -> None:
+        with self._lock:
+            if self._entries is not None:
+                self._entries.append((name, unit, value))
+
+    def close(self) -> List[Tuple[str, str, float]]:
+        with self._lock:
+            entries, self._entries = self._entries, None
+        return entries or []
+
+
+_invocation: contextvars.ContextVar = contextvars.ContextVar('metrics_invocation', default=None)
+
+
+def _add_metric(name: str, unit: str, value: float) -> None:
+    # Outside an invocation (or on a thread not started through submit) there is nothing to attribute it to
+    invocation = _invocation.get()
+    if invocation is not None:
+        invocation.add(name, unit, value)
+
+
+def submit(executor: Executor, fn: Callable, *args, **kwargs) -> Future:
+    """``executor.submit`` that lets ``fn`` record metrics for the calling invocation.
+
+    Worker threads do not inherit the caller's context, so metrics recorded
+    by a function submitted directly are dropped.
+    """
+    return executor.submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+
+def log_metrics(handler: Callable) -> Callable:
+    """Flush the invocation's metrics as one EMF log line, like ``metrics.log_metrics``.
+
+    Metrics recorded through the ``record_*`` helpers are only added to
+    ``metrics`` here, on the handler thread, after the handler returns.
+    """
+    @functools.wraps(handler)
+    def wrapper(event, context, *args, **kwargs):
+        invocation = _Invocation()
+        token = _invocation.set(invocation)
+        try:
+            return handler(event, context, *args, **kwargs)
+        finally:
+            _invocation.reset(token)
+            for name, unit, value in invocation.close():
+                metrics.add_metric(name=name, unit=unit, value=value)
+
+    return metrics.log_metrics(wrapper)
+
+
+def record_upstream(engine: str, latency_ms: float, payload_bytes: int = 0, parse_ms: float = 0, error_class: str = None) -> None:
+    """Record one upstream SerpAPI call, named per engine (e.g. ``google_flights_latency``)."""
+    _add_metric(f"{engine}_latency", MetricUnit.Milliseconds, latency_ms)
+    _add_metric(f"{engine}_payload_bytes", MetricUnit.Bytes, payload_bytes)
+    _add_metric(f"{engine}_parse_time", MetricUnit.Milliseconds, parse_ms)
+    if error_class:
+        _add_metric(f"{engine}_error_{error_class}", MetricUnit.Count, 1)
+
+
+def record_upstream_retry(engine: str, error_class: str) -> None:
+    """Count an upstream attempt that failed with ``error_class`` and was retried."""
+    _add_metric(f"{engine}_retry_{error_class}", MetricUnit.Count, 1)
+
+
+def record_quota(engine: str, outcome: str) -> None:
+    """Count a scheduler decision; ``outcome`` is ``consumed``, ``throttled`` or ``deduplicated``."""
+    _add_metric(f"{engine}_quota_{outcome}", MetricUnit.Count, 1)
+
+
+def record_quota_wait(engine: str, wait_ms: float) -> None:
+    """Record how long a request waited for quota before going upstream."""
+    _add_metric(f"{engine}_quota_wait", MetricUnit.Milliseconds, wait_ms)
+
+
+def record_resilience(engine: str, event: str) -> None:
+    """Count a resilience event, e.g. ``hedge_fired``, ``hedge_won``, ``breaker_opened`` or ``breaker_rejected``."""
+    _add_metric(f"{engine}_{event}", MetricUnit.Count, 1)
+
+
+def record_cache(cache: str, outcome: str) -> None:
+    """Count a cache lookup; ``outcome`` is ``hit``, ``miss`` or ``stale``."""
+    _add_metric(f"{cache}_{outcome}", MetricUnit.Count, 1)
+
+
+def record_fanout(name: str, width: int) -> None:
+    """Record how many upstream calls a fan-out issued concurrently."""
+    _add_metric(f"{name}_fanout_width", MetricUnit.Count, width)
+
+
+def log_payload(logger: Logger, message: str, payload) -> None:
+    """Log a large payload for a sample of calls only, truncated to ``PAYLOAD_LOG_MAX_BYTES``.
+
+    The payload is not serialized at all when the call is not sampled, so
+    unsampled calls pay nothing for it.
+    """
+    if random.random() >= PAYLOAD_LOG_SAMPLE_RATE:
+        return
+    serialized = json.dumps(payload, default=str, separators=(',', ':'))
+    logger.info(message, stacklevel=3, extra={
+        'payload': serialized[:PAYLOAD_LOG_MAX_BYTES],
+        'payload_bytes': len(serialized),
+        'truncated': len(serialized) > PAYLOAD_LOG_MAX_BYTES,
+    })
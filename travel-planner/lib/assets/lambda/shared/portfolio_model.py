@@ -0,0 +1,169 @@
+import json
+import math
+import os
+from array import array
+from functools import lru_cache
+from typing import Dict, Iterator, List, Tuple, Union
+from urllib.parse import urlparse
+
+from aws_lambda_powertools import Logger
+
+logger = Logger(child=True)
+
+
+class PortfolioError(ValueError):
+    """Raised when the configured portfolio is missing or malformed."""
+
+
+def _is_quantity(value) -> bool:
+    return not isinstance(value, bool) and isinstance(value, (int, float)) and math.isfinite(value) and value >= 0
+
+
+def _parse_lot(symbol: str, lot, problems: List[str]) -> Tuple[float, float]:
+    """Return ``(quantity, cost_basis)`` for one lot; cost basis is NaN when unknown."""
+    if not isinstance(lot, dict):
+        lot = {'quantity': lot}
+    quantity = lot.get('quantity')
+    cost_basis = lot.get('cost_basis', math.nan)
+    if not _is_quantity(quantity):
+        problems.append(f"{symbol}: quantity must be a non-negative number, got {quantity!r}")
+    elif not (_is_quantity(cost_basis) or (isinstance(cost_basis, float) and math.isnan(cost_basis))):
+        problems.append(f"{symbol}: cost_basis must be a non-negative number, got {cost_basis!r}")
+    return quantity, cost_basis
+
+
+class Portfolio:
+    """Validated stock holdings stored as parallel arrays.
+
+    ``symbols[i]`` holds ``quantities[i]`` shares. Quantities live in a
+    compact ``array('d')`` so sizing logic can work on them as a vector.
+
+    Each position is made of one or more tax lots. ``lot_positions[j]`` is the
+    index into ``symbols`` of lot ``j``, which holds ``lot_quantities[j]``
+    shares bought at ``lot_cost_basis[j]`` per share (NaN when unknown).
+    """
+
+    __slots__ = ('symbols', 'quantities', 'lot_positions', 'lot_quantities', 'lot_cost_basis', '_index')
+
+    def __init__(self, symbols: List[str], lot_positions: array, lot_quantities: array, lot_cost_basis: array):
+        self.symbols = symbols
+        self.lot_positions = lot_positions
+        self.lot_quantities = lot_quantities
+        self.lot_cost_basis = lot_cost_basis
+        self.quantities = array('d', [0.0] * len(symbols))
+        for position, quantity in zip(lot_positions, lot_quantities):
+            self.quantities[position] += quantity
+        self._index = {symbol: i for i, symbol in enumerate(symbols)}
+
+    @classmethod
+    def from_mapping(cls, data) -> 'Portfolio':
+        """Validate a portfolio mapping, reporting every problem at once.
+
+        Each symbol maps to a share count, to ``{"quantity": q, "cost_basis": c}``
+        or to ``{"lots": [{"quantity": q, "cost_basis": c}, ...]}``.
+        """
+        if not isinstance(data, dict):
+            raise PortfolioError('Portfolio must be a JSON object of {"SYMBOL": quantity}')
+
+        symbols = []
+        lot_positions = array('l')
+        lot_quantities = array('d')
+        lot_cost_basis = array('d')
+        problems = []
+        seen = set()
+        for raw_symbol, holding in data.items():
+            symbol = raw_symbol.strip() if isinstance(raw_symbol, str) else ''
+            if not symbol:
+                problems.append(f"invalid symbol {raw_symbol!r}")
+                continue
+            if symbol in seen:
+                problems.append(f"duplicate symbol {symbol}")
+                continue
+            seen.add(symbol)
+
+            lots = holding.get('lots') if isinstance(holding, dict) and 'lots' in holding else [holding]
+            if not isinstance(lots, list) or not lots:
+                problems.append(f"{symbol}: lots must be a non-empty list")
+                continue
+
+            count = len(problems)
+            parsed = [_parse_lot(symbol, lot, problems) for lot in lots]
+            if len(problems) > count:
+                continue
+
+            position = len(symbols)
+            symbols.append(symbol)
+            for quantity, cost_basis in parsed:
+                lot_positions.append(position)
+                lot_quantities.append(quantity)
+                lot_cost_basis.append(cost_basis)
+
+        if problems:
+            raise PortfolioError('; '.join(problems))
+        return cls(symbols, lot_positions, lot_quantities, lot_cost_basis)
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._index
+
+    def items(self) -> Iterator[Tuple[str, float]]:
+        return zip(self.symbols, self.quantities)
+
+    def quantity(self, symbol: str) -> float:
+        return self.quantities[self._index[symbol]]
+
+    def price_vector(self, prices: Dict[str, float]) -> array:
+        """Prices aligned with ``symbols``; NaN where a symbol has no price."""
+        return array('d', (prices.get(symbol, math.nan) for symbol in self.symbols))
+
+
+def share_count(quantity: float) -> Union[int, float]:
+    """A quantity as responses report it: whole share counts as ``int`` (``10``, not ``10.0``), others as ``float``."""
+    return int(quantity) if quantity.is_integer() else quantity
+
+
+def _read_s3(uri: str) -> str:
+    import boto3
+
+    location = urlparse(uri)
+    s3 = boto3.client('s3', endpoint_url=os.environ.get('S3_ENDPOINT_URL') or None)
+    return s3.get_object(Bucket=location.netloc, Key=location.path.lstrip('/'))['Body'].read().decode('utf-8')
+
+
+def _read_source() -> Tuple[str, str]:
+    """Return ``(source, raw_json)`` from the first configured portfolio source."""
+    s3_uri = os.environ.get('STOCK_PORTFOLIO_S3_URI')
+    if s3_uri:
+        return s3_uri, _read_s3(s3_uri)
+
+    path = os.environ.get('STOCK_PORTFOLIO_FILE')
+    if path:
+        with open(path) as f:
+            return path, f.read()
+
+    return 'STOCK_PORTFOLIO', os.environ.get('STOCK_PORTFOLIO') or '{}'
+
+
+@lru_cache(maxsize=1)
+def load_portfolio() -> Portfolio:
+    """Load and validate the portfolio once per container.
+
+    Sources, in order of precedence: an S3 (or S3-compatible) object named by
+    ``STOCK_PORTFOLIO_S3_URI``, a file named by ``STOCK_PORTFOLIO_FILE``, then
+    the ``STOCK_PORTFOLIO`` environment variable. Failures are not cached, so
+    a fixed configuration is picked up on the next call.
+    """
+    try:
+        source, raw = _read_source()
+    except Exception as e:
+        raise PortfolioError(f"Could not read portfolio: {str(e)}")
+    try:
+        data = json.loads(raw)
+    except ValueError as e:
+        raise PortfolioError(f"{source} is not valid JSON: {str(e)}")
+
+    portfolio = Portfolio.from_mapping(data)
+    logger.info(f"Loaded portfolio of {len(portfolio)} positions from {source}")
+    return portfolio
@@ -0,0 +1,217 @@
+import mmap
+import os
+import struct
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from aws_lambda_powertools import Logger
+
+from shared.observability import record_cache
+
+logger = Logger(child=True)
+
+# Local copy of the snapshot, and the S3 (or S3-compatible) object it is published to and read from
+SNAPSHOT_PATH = os.environ.get('PRICE_SNAPSHOT_PATH', '/tmp/price-snapshot.bin')
+SNAPSHOT_S3_URI = os.environ.get('PRICE_SNAPSHOT_S3_URI')
+# Oldest snapshot the portfolio routes will value from; 0 disables the snapshot
+MAX_AGE_SECONDS = float(os.environ.get('PRICE_SNAPSHOT_MAX_AGE_SECONDS', '600'))
+# Minimum time between downloads of the S3 snapshot while the local copy is missing or stale
+CHECK_SECONDS = float(os.environ.get('PRICE_SNAPSHOT_CHECK_SECONDS', '30'))
+
+MAGIC = b'TPPS'
+FORMAT_VERSION = 1
+# magic, format version, record size, record count, created at (epoch seconds)
+HEADER = struct.Struct('<4sHHId')
+# symbol (UTF-8, NUL-padded), price
+RECORD = struct.Struct('<24sd')
+SYMBOL_BYTES = RECORD.size - 8
+
+
+class SnapshotError(ValueError):
+    """Raised when a snapshot cannot be written or a file is not a readable snapshot."""
+
+
+def encode_snapshot(prices: Dict[str, float], created_at: float) -> bytes:
+    """Serialize prices as a header followed by fixed-width records sorted by symbol.
+
+    Sorting lets readers binary-search the records in place instead of
+    parsing the whole file.
+    """
+    records = []
+    for symbol, price in prices.items():
+        key = symbol.encode('utf-8')
+        if len(key) > SYMBOL_BYTES:
+            raise SnapshotError(f"Symbol {symbol} is longer than {SYMBOL_BYTES} bytes")
+        records.append((key, float(price)))
+    records.sort()
+
+    data = bytearray(HEADER.size + RECORD.size * len(records))
+    HEADER.pack_into(data, 0, MAGIC, FORMAT_VERSION, RECORD.size, len(records), created_at)
+    for i, (key, price) in enumerate(records):
+        RECORD.pack_into(data, HEADER.size + i * RECORD.size, key, price)
+    return bytes(data)
+
+
+class PriceSnapshot:
+    """A snapshot file mapped into memory; lookups read records straight from the mapping."""
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size < HEADER.size:
+                raise SnapshotError(f"{path} is too short to be a price snapshot")
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, record_size, count, created_at = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise SnapshotError(f"{path} is not a price snapshot")
+        if version != FORMAT_VERSION or record_size != RECORD.size:
+            raise SnapshotError(f"{path} has snapshot format version {version}, expected {FORMAT_VERSION}")
+        if len(self._map) != HEADER.size + count * record_size:
+            raise SnapshotError(f"{path} is truncated")
+        self.count = count
+        self.created_at = created_at
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.created_at
+
+    def is_stale(self) -> bool:
+        return self.age > MAX_AGE_SECONDS
+
+    def _symbol(self, i: int) -> bytes:
+        return self._map[HEADER.size + i * RECORD.size:HEADER.size + i * RECORD.size + SYMBOL_BYTES].rstrip(b'\0')
+
+    def get(self, symbol: str) -> Optional[float]:
+        key = symbol.encode('utf-8')
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self._symbol(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.count and self._symbol(low) == key:
+            return RECORD.unpack_from(self._map, HEADER.size + low * RECORD.size)[1]
+        return None
+
+    def lookup(self, symbols: Iterable[str]) -> Tuple[Dict[str, float], List[str]]:
+        """Return ``(prices, missing)`` for the given symbols."""
+        prices = {}
+        missing = []
+        for symbol in symbols:
+            price = self.get(symbol)
+            if price is None:
+                missing.append(symbol)
+            else:
+                prices[symbol] = price
+        return prices, missing
+
+
+def _s3_client():
+    import boto3
+
+    return boto3.client('s3', endpoint_url=os.environ.get('S3_ENDPOINT_URL') or None)
+
+
+def _s3_location(uri: str) -> Tuple[str, str]:
+    location = urlparse(uri)
+    return location.netloc, location.path.lstrip('/')
+
+
+def _write_local(path: str, data: bytes) -> None:
+    # Write then rename, so readers never map a half-written file and existing mappings stay valid
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def publish_snapshot(prices: Dict[str, float], created_at: float = None) -> int:
+    """Write a snapshot of ``prices`` to ``SNAPSHOT_PATH`` and, when configured, to ``SNAPSHOT_S3_URI``.
+
+    Returns the snapshot size in bytes.
+    """
+    data = encode_snapshot(prices, time.time() if created_at is None else created_at)
+    _write_local(SNAPSHOT_PATH, data)
+    if SNAPSHOT_S3_URI:
+        bucket, key = _s3_location(SNAPSHOT_S3_URI)
+        _s3_client().put_object(
+            Bucket=bucket,
+            Key=key,
+            Body=data,
+            ContentType='application/octet-stream',
+            Metadata={'format-version': str(FORMAT_VERSION)},
+        )
+    return len(data)
+
+
+class _SnapshotReader:
+    """Keeps the local snapshot mapped across warm invocations and re-downloads it when stale."""
+
+    def __init__(self):
+        self._snapshot = None
+        self._file_id = None
+        self._next_download = 0.0
+        self._lock = threading.Lock()
+
+    def _open_local(self) -> Optional[PriceSnapshot]:
+        try:
+            stat = os.stat(SNAPSHOT_PATH)
+        except FileNotFoundError:
+            self._snapshot = self._file_id = None
+            return None
+
+        file_id = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if file_id != self._file_id:
+            # A replaced file is a new inode; the previous mapping is released once no reader holds it
+            self._file_id = file_id
+            try:
+                self._snapshot = PriceSnapshot(SNAPSHOT_PATH)
+            except (OSError, SnapshotError) as e:
+                logger.warning(f"Ignoring unreadable price snapshot: {str(e)}")
+                self._snapshot = None
+        return self._snapshot
+
+    def _download(self) -> None:
+        self._next_download = time.time() + CHECK_SECONDS
+        bucket, key = _s3_location(SNAPSHOT_S3_URI)
+        try:
+            data = _s3_client().get_object(Bucket=bucket, Key=key)['Body'].read()
+        except Exception as e:
+            logger.warning(f"Error downloading price snapshot: {str(e)}")
+            return
+        _write_local(SNAPSHOT_PATH, data)
+
+    def current(self) -> Optional[PriceSnapshot]:
+        with self._lock:
+            snapshot = self._open_local()
+            if (snapshot is None or snapshot.is_stale()) and SNAPSHOT_S3_URI and time.time() >= self._next_download:
+                self._download()
+                snapshot = self._open_local()
+
+        if snapshot is None:
+            record_cache('price_snapshot', 'miss')
+            return None
+        if snapshot.is_stale():
+            record_cache('price_snapshot', 'stale')
+            return None
+        record_cache('price_snapshot', 'hit')
+        return snapshot
+
+
+_reader = _SnapshotReader()
+
+
+def current_snapshot() -> Optional[PriceSnapshot]:
+    """Return the latest snapshot no older than ``MAX_AGE_SECONDS``, or None.
+
+    The local copy stays memory-mapped between calls and is only reopened
+    when the file is replaced. When it is missing or stale and
+    ``SNAPSHOT_S3_URI`` is set, the published snapshot is downloaded, at most
+    once every ``CHECK_SECONDS``.
+    """
+    if MAX_AGE_SECONDS <= 0:
+        return None
+    return _reader.current()
@@ -0,0 +1,216 @@
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from functools import partial
+from typing import Dict, Iterable, List, Tuple
+
+from aws_lambda_powertools import Logger
+
+from shared.currency import convert_quotes, parse_amount
+from shared.observability import record_cache, record_fanout, submit
+from shared.price_snapshot import current_snapshot
+from shared.quote_cache import quote_cache
+from shared.scheduler import BACKGROUND, INTERACTIVE, scheduler
+
+API_KEY = os.environ.get('API_KEY')
+
+# Maximum number of quotes fetched in parallel and the wall-clock budget for a whole batch
+QUOTE_CONCURRENCY = int(os.environ.get('QUOTE_CONCURRENCY', '8'))
+QUOTE_DEADLINE_SECONDS = float(os.environ.get('QUOTE_DEADLINE_SECONDS', '10'))
+
+logger = Logger(child=True)
+
+# Module-level so background refreshes of stale quotes survive across warm invocations
+_revalidation_executor = ThreadPoolExecutor(max_workers=QUOTE_CONCURRENCY, thread_name_prefix='quote-refresh')
+_revalidating = set()
+_revalidating_lock = threading.Lock()
+
+
+class QuoteError(Exception):
+    """Raised when Google Finance does not return a usable price for a symbol."""
+
+
+def _extract_price(results: Dict) -> float:
+    # Google Finance reports the numeric price under summary.extracted_price;
+    # older responses exposed a top-level price field instead.
+    summary = results.get('summary') or {}
+    price = summary.get('extracted_price', results.get('price'))
+    amount = parse_amount(price)[0]
+    if amount is None:
+        raise QuoteError('No price in response')
+    return amount
+
+
+def fetch_quote(symbol: str, priority: str = INTERACTIVE) -> float:
+    """Fetch the latest price for a single symbol from Google Finance."""
+    params = {
+        "engine": "google_finance",
+        "q": symbol,
+        "api_key": API_KEY
+    }
+
+    results = scheduler.search(params, priority)
+
+    if results.get('error'):
+        raise QuoteError(results['error'])
+    return _extract_price(results)
+
+
+def _fetch_and_cache(symbol: str, priority: str = INTERACTIVE) -> float:
+    price = fetch_quote(symbol, priority)
+    # Cached even when the batch deadline has passed, so stragglers benefit the next call
+    quote_cache.set(symbol, price)
+    return price
+
+
+def _fetch_concurrently(
+    symbols: List[str],
+    max_workers: int,
+    deadline: float,
+    priority: str = INTERACTIVE,
+) -> Tuple[Dict[str, float], Dict[str, str]]:
+    prices = {}
+    errors = {}
+
+    width = min(max_workers, len(symbols))
+    record_fanout('quote', width)
+    executor = ThreadPoolExecutor(max_workers=width)
+    try:
+        futures = {submit(executor, _fetch_and_cache, symbol, priority): symbol for symbol in symbols}
+        done, not_done = wait(futures, timeout=deadline)
+
+        for future in done:
+            symbol = futures[future]
+            try:
+                prices[symbol] = future.result()
+            except Exception as e:
+                logger.error(f"Error fetching price for {symbol}: {str(e)}")
+                errors[symbol] = str(e)
+
+        for future in not_done:
+            symbol = futures[future]
+            future.cancel()
+            logger.warning(f"Timed out fetching price for {symbol}")
+            errors[symbol] = f"Timed out after {deadline}s"
+    finally:
+        # Do not block the response on stragglers past the deadline
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return prices, errors
+
+
+def _revalidate_done(symbol: str, future: Future) -> None:
+    with _revalidating_lock:
+        _revalidating.discard(symbol)
+    if future.exception() is not None:
+        logger.warning(f"Background refresh failed for {symbol}: {str(future.exception())}")
+
+
+def _revalidate(symbols: List[str]) -> None:
+    """Refresh stale quotes in the background without delaying the caller."""
+    with _revalidating_lock:
+        pending = [symbol for symbol in symbols if symbol not in _revalidating]
+        _revalidating.update(pending)
+
+    for symbol in pending:
+        future = submit(_revalidation_executor, _fetch_and_cache, symbol, BACKGROUND)
+        future.add_done_callback(partial(_revalidate_done, symbol))
+
+
+def fetch_quotes(
+    symbols: Iterable[str],
+    max_workers: int = None,
+    deadline: float = None,
+) -> Tuple[Dict[str, float], Dict[str, str]]:
+    """Fetch prices for all symbols, serving from the quote cache when possible.
+
+    Fresh cached quotes are returned without any upstream call. Stale quotes
+    are returned immediately and refreshed in the background. Only misses are
+    fetched, concurrently, within the batch deadline.
+
+    Returns a ``(prices, errors)`` pair. Symbols that fail, or that have not
+    answered when ``deadline`` seconds have elapsed, are reported in
+    ``errors`` instead of holding up the rest of the batch.
+    """
+    prices = {}
+    errors = {}
+    stale = []
+    missing = []
+
+    for symbol in dict.fromkeys(symbols):
+        price, is_stale = quote_cache.get(symbol)
+        if price is None:
+            record_cache('quote_cache', 'miss')
+            missing.append(symbol)
+            continue
+        prices[symbol] = price
+        if is_stale:
+            record_cache('quote_cache', 'stale')
+            stale.append(symbol)
+        else:
+            record_cache('quote_cache', 'hit')
+
+    if missing:
+        fetched, errors = _fetch_concurrently(
+            missing,
+            max_workers or QUOTE_CONCURRENCY,
+            QUOTE_DEADLINE_SECONDS if deadline is None else deadline,
+        )
+        prices.update(fetched)
+
+    if stale:
+        _revalidate(stale)
+
+    quote_cache.save()
+    return prices, errors
+
+
+def refresh_quotes(
+    symbols: Iterable[str],
+    max_workers: int = None,
+    deadline: float = None,
+    priority: str = BACKGROUND,
+) -> Tuple[Dict[str, float], Dict[str, str]]:
+    """Fetch every symbol upstream, ignoring cached quotes; same ``(prices, errors)`` contract as ``fetch_quotes``."""
+    prices, errors = _fetch_concurrently(
+        list(dict.fromkeys(symbols)),
+        max_workers or QUOTE_CONCURRENCY,
+        QUOTE_DEADLINE_SECONDS if deadline is None else deadline,
+        priority,
+    )
+    quote_cache.save()
+    return prices, errors
+
+
+def current_prices(symbols: Iterable[str]) -> Tuple[Dict[str, float], Dict[str, str]]:
+    """Price symbols from the scheduled price snapshot, falling back to ``fetch_quotes``.
+
+    While the snapshot is fresh, valuation needs no upstream call; only
+    symbols missing from it are quoted live. When there is no fresh snapshot
+    every symbol is quoted live.
+    """
+    symbols = list(dict.fromkeys(symbols))
+    snapshot = current_snapshot()
+    if snapshot is None:
+        return fetch_quotes(symbols)
+
+    prices, missing = snapshot.lookup(symbols)
+    if not missing:
+        return prices, {}
+    fetched, errors = fetch_quotes(missing)
+    prices.update(fetched)
+    return prices, errors
+
+
+def prices_in_currency(symbols: Iterable[str], currency: str) -> Tuple[Dict[str, float], Dict[str, float], Dict[str, str]]:
+    """``current_prices`` converted from each symbol's listing currency into ``currency``.
+
+    Returns ``(prices, rates, errors)``; ``rates`` maps each priced symbol to
+    the multiplier from its listing currency, for converting amounts such as
+    cost basis. Symbols that could not be priced or converted are in
+    ``errors``. The exchange rates are looked up once for the whole batch.
+    """
+    prices, errors = current_prices(symbols)
+    prices, rates, unconverted = convert_quotes(prices, currency)
+    errors.update(unconverted)
+    return prices, rates, errors
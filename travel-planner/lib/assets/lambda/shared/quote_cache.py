@@ -0,0 +1,109 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from aws_lambda_powertools import Logger
+
+logger = Logger(child=True)
+
+
+class QuoteCache:
+    """In-memory LRU cache of quotes with TTL and stale-while-revalidate.
+
+    Entries younger than ``ttl`` are fresh. Entries older than ``ttl`` but
+    younger than ``ttl + stale_ttl`` are still served, flagged as stale so the
+    caller can refresh them in the background. Anything older is a miss.
+
+    The cache lives at module level so it survives warm invocations. When
+    ``path`` is set (e.g. under ``/tmp``) it is also loaded from and saved to
+    disk, which keeps it across execution environments that reuse ``/tmp``.
+    """
+
+    def __init__(self, ttl: float, stale_ttl: float, max_entries: int, path: Optional[str] = None):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self.path = path
+        self._entries = OrderedDict()  # symbol -> (price, fetched_at)
+        self._lock = threading.Lock()
+        self._dirty = False
+        if path:
+            self._load()
+
+    def get(self, symbol: str) -> Tuple[Optional[float], bool]:
+        """Return ``(price, is_stale)``; ``price`` is None on a miss."""
+        with self._lock:
+            entry = self._entries.get(symbol)
+            if entry is None:
+                return None, False
+
+            price, fetched_at = entry
+            age = time.time() - fetched_at
+            if age > self.ttl + self.stale_ttl:
+                del self._entries[symbol]
+                self._dirty = True
+                return None, False
+
+            self._entries.move_to_end(symbol)
+            return price, age > self.ttl
+
+    def set(self, symbol: str, price: float, fetched_at: float = None) -> None:
+        with self._lock:
+            self._entries[symbol] = (price, fetched_at or time.time())
+            self._entries.move_to_end(symbol)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._dirty = True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._dirty = True
+
+    def save(self) -> None:
+        """Write the cache to ``path`` if it changed since the last save."""
+        if not self.path or not self._dirty:
+            return
+        with self._lock:
+            snapshot: Dict[str, list] = {symbol: list(entry) for symbol, entry in self._entries.items()}
+            self._dirty = False
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(snapshot, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not persist quote cache to {self.path}: {str(e)}")
+
+    def _load(self) -> None:
+        try:
+            with open(self.path) as f:
+                snapshot = json.load(f)
+            entries = sorted(
+                ((symbol, float(price), float(fetched_at)) for symbol, (price, fetched_at) in snapshot.items()),
+                key=lambda entry: entry[2],
+            )
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            logger.warning(f"Ignoring unreadable quote cache {self.path}: {str(e)}")
+            return
+
+        now = time.time()
+        # Oldest first so the most recently fetched symbols end up at the LRU tail
+        for symbol, price, fetched_at in entries:
+            if now - fetched_at <= self.ttl + self.stale_ttl:
+                self._entries[symbol] = (price, fetched_at)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+quote_cache = QuoteCache(
+    ttl=float(os.environ.get('QUOTE_CACHE_TTL_SECONDS', '60')),
+    stale_ttl=float(os.environ.get('QUOTE_CACHE_STALE_SECONDS', '300')),
+    max_entries=int(os.environ.get('QUOTE_CACHE_MAX_ENTRIES', '1024')),
+    path=os.environ.get('QUOTE_CACHE_PATH') or None,
+)
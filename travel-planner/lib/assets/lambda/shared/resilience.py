@@ -0,0 +1,264 @@
+import math
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from functools import partial
+from typing import Callable, Dict, Optional, Tuple
+
+from aws_lambda_powertools import Logger
+
+from shared.observability import record_resilience, submit
+from shared.serpapi_client import SerpApiClient, serpapi_client
+
+logger = Logger(child=True)
+
+UNAVAILABLE = 'upstream_unavailable'
+
+# Recent call latencies kept per engine, and how many are needed before they drive timeouts and hedging
+LATENCY_WINDOW = int(os.environ.get('SERPAPI_LATENCY_WINDOW', '200'))
+LATENCY_MIN_SAMPLES = int(os.environ.get('SERPAPI_LATENCY_MIN_SAMPLES', '20'))
+# Per-attempt timeout: this percentile of recent latencies times the multiplier, never below the minimum
+# and never above SERPAPI_TIMEOUT_SECONDS
+TIMEOUT_PERCENTILE = float(os.environ.get('SERPAPI_TIMEOUT_PERCENTILE', '99'))
+TIMEOUT_MULTIPLIER = float(os.environ.get('SERPAPI_TIMEOUT_MULTIPLIER', '2'))
+MIN_TIMEOUT_SECONDS = float(os.environ.get('SERPAPI_MIN_TIMEOUT_SECONDS', '2'))
+# A duplicate request is sent once a call outlasts this percentile of recent latencies
+HEDGE_PERCENTILE = float(os.environ.get('SERPAPI_HEDGE_PERCENTILE', '95'))
+# Hedges earned per call, so duplicates stay a small share of SerpAPI usage; 0 disables hedging
+HEDGE_BUDGET = float(os.environ.get('SERPAPI_HEDGE_BUDGET', '0.1'))
+HEDGE_BURST = float(os.environ.get('SERPAPI_HEDGE_BURST', '10'))
+# Consecutive failed calls that open an engine's breaker, and how long it stays open before a probe
+BREAKER_FAILURES = int(os.environ.get('SERPAPI_BREAKER_FAILURES', '5'))
+BREAKER_COOLDOWN_SECONDS = float(os.environ.get('SERPAPI_BREAKER_COOLDOWN_SECONDS', '30'))
+
+CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+
+def is_outage(error_class: Optional[str]) -> bool:
+    """Whether a failure says the engine is unhealthy: transport errors, timeouts, 429 and 5xx.
+
+    SerpAPI's own errors (e.g. no results) and other 4xx come from the
+    request itself, so they count as healthy answers.
+    """
+    if error_class is None or error_class == 'SerpApiError':
+        return False
+    return not (error_class.startswith('HTTP4') and error_class != 'HTTP429')
+
+
+class EngineHealth:
+    """Latency window, hedge budget and circuit breaker of one engine.
+
+    The breaker opens after ``BREAKER_FAILURES`` consecutive outages and
+    rejects calls for ``BREAKER_COOLDOWN_SECONDS``. It then lets a single
+    probe through: success closes it, another outage reopens it.
+    """
+
+    def __init__(self):
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.hedge_tokens = HEDGE_BURST
+        self._lock = threading.Lock()
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Nearest-rank percentile of recent latencies in seconds; None until enough calls were seen."""
+        with self._lock:
+            if len(self.latencies) < LATENCY_MIN_SAMPLES:
+                return None
+            ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, math.ceil(q / 100 * len(ordered)) - 1)]
+
+    def timeout(self, ceiling: float) -> float:
+        observed = self.percentile(TIMEOUT_PERCENTILE)
+        if observed is None:
+            return ceiling
+        return min(ceiling, max(MIN_TIMEOUT_SECONDS, observed * TIMEOUT_MULTIPLIER))
+
+    def hedge_delay(self) -> Optional[float]:
+        if HEDGE_BUDGET <= 0:
+            return None
+        return self.percentile(HEDGE_PERCENTILE)
+
+    def take_hedge(self) -> bool:
+        with self._lock:
+            if self.hedge_tokens < 1:
+                return False
+            self.hedge_tokens -= 1
+            return True
+
+    def retry_after(self) -> Optional[float]:
+        """Seconds until the breaker lets calls through again, or None when it is closed."""
+        with self._lock:
+            if self.state == CLOSED:
+                return None
+            return max(0.0, self.opened_at + BREAKER_COOLDOWN_SECONDS - time.time())
+
+    def admit(self) -> Optional[float]:
+        """Let a call through, or return the seconds left while the breaker rejects calls."""
+        with self._lock:
+            if self.state == CLOSED:
+                return None
+            remaining = self.opened_at + BREAKER_COOLDOWN_SECONDS - time.time()
+            if remaining > 0:
+                return remaining
+            # Cooldown over: this call is the probe; others wait another cooldown for its outcome
+            self.state = HALF_OPEN
+            self.opened_at = time.time()
+            return None
+
+    def record(self, latency: float, outage: bool) -> bool:
+        """Record a finished call; returns True when it opened the breaker."""
+        with self._lock:
+            self.latencies.append(latency)
+            self.hedge_tokens = min(HEDGE_BURST, self.hedge_tokens + HEDGE_BUDGET)
+            if not outage:
+                self.failures = 0
+                self.state = CLOSED
+                return False
+            self.failures += 1
+            if self.state == HALF_OPEN or (self.state == CLOSED and self.failures >= BREAKER_FAILURES):
+                self.state = OPEN
+                self.opened_at = time.time()
+                return True
+            return False
+
+
+class ResilientSearch:
+    """SerpAPI searches with adaptive timeouts, hedging and a per-engine circuit breaker.
+
+    Each engine's per-attempt timeout follows its recent latencies instead of
+    a fixed worst case. A call still running after the engine's p95 latency
+    gets a duplicate, and the first healthy response wins; the other finishes
+    in the background and still feeds the latency window. The hedge timer
+    starts once the call is running, not while it waits for a worker, and no
+    hedge is sent while every worker is busy, so congestion is not doubled.
+    While an engine's breaker is open, searches fail fast with a structured
+    error carrying ``error_type`` and ``retry_after_seconds`` instead of
+    waiting on timeouts.
+
+    ``spend``, when set, takes one token of an engine's SerpAPI budget
+    without waiting and returns False when none is left. The scheduler sets
+    it to ``UpstreamScheduler.spend``, so every billed request (hedges and client
+    retries as well as the first attempt, which the scheduler pays for) is
+    counted against the same rate and burst limits.
+
+    State lives on the module-level instance, so it carries over between
+    warm invocations of the container.
+    """
+
+    def __init__(self, client: SerpApiClient, max_workers: int = 16):
+        self.client = client
+        self.spend: Optional[Callable[[str], bool]] = None
+        self._engines: Dict[str, EngineHealth] = {}
+        self._lock = threading.Lock()
+        self._max_workers = max_workers
+        self._busy = 0  # calls submitted to the executor and not yet finished
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='serpapi-hedge')
+
+    @classmethod
+    def from_env(cls, client: SerpApiClient) -> 'ResilientSearch':
+        return cls(client, max_workers=2 * int(os.environ.get('SERPAPI_POOL_SIZE', '16')))
+
+    def health(self, engine: str) -> EngineHealth:
+        with self._lock:
+            if engine not in self._engines:
+                self._engines[engine] = EngineHealth()
+            return self._engines[engine]
+
+    def admit(self, engine: str) -> Optional[Dict]:
+        """Return the fail-fast error response while ``engine``'s breaker is open, else None."""
+        remaining = self.health(engine).admit()
+        if remaining is None:
+            return None
+        record_resilience(engine, 'breaker_rejected')
+        return self.unavailable(engine, remaining)
+
+    def retry_after(self, engine: str) -> Optional[int]:
+        """Whole seconds until ``engine`` is tried again, or None when it is healthy."""
+        remaining = self.health(engine).retry_after()
+        return None if remaining is None else math.ceil(remaining)
+
+    @staticmethod
+    def unavailable(engine: str, remaining: float) -> Dict:
+        retry_after = math.ceil(remaining)
+        return {
+            'error': f"The {engine.replace('_', ' ')} search is temporarily unavailable. Try again in {retry_after} seconds.",
+            'error_type': UNAVAILABLE,
+            'engine': engine,
+            'retry_after_seconds': retry_after,
+        }
+
+    def _call(self, params: Dict, health: EngineHealth, started: threading.Event = None) -> Tuple[Dict, bool]:
+        engine = params.get('engine', 'unknown')
+        if started is not None:
+            started.set()
+        start = time.perf_counter()
+        allow_retry = partial(self.spend, engine) if self.spend else None
+        results, error_class = self.client.request(params, timeout=health.timeout(self.client.timeout), allow_retry=allow_retry)
+        outage = is_outage(error_class)
+        if health.record(time.perf_counter() - start, outage):
+            record_resilience(engine, 'breaker_opened')
+            logger.error(f"Circuit breaker opened for {engine} after {error_class}")
+        return results, outage
+
+    def _submit(self, *args) -> Future:
+        with self._lock:
+            self._busy += 1
+        future = submit(self._executor, self._call, *args)
+        future.add_done_callback(self._finished)
+        return future
+
+    def _finished(self, future: Future) -> None:
+        with self._lock:
+            self._busy -= 1
+
+    def _saturated(self) -> bool:
+        with self._lock:
+            return self._busy >= self._max_workers
+
+    def _may_hedge(self, engine: str, health: EngineHealth) -> bool:
+        # A hedge queued behind other calls would only add to the congestion it is meant to route around
+        if self._saturated() or not health.take_hedge() or (self.spend is not None and not self.spend(engine)):
+            record_resilience(engine, 'hedge_skipped')
+            return False
+        return True
+
+    def search(self, params: Dict) -> Dict:
+        """Run a search; same contract as ``SerpApiClient.search``."""
+        engine = params.get('engine', 'unknown')
+        health = self.health(engine)
+        delay = health.hedge_delay()
+        if delay is None or self._saturated():
+            # Run on the caller's thread rather than queue behind busy workers
+            return self._call(params, health)[0]
+
+        started = threading.Event()
+        primary = self._submit(params, health, started)
+        # The delay is measured from when the call starts, like the latencies it comes from
+        started.wait()
+        done, _ = wait([primary], timeout=delay)
+        if done or not self._may_hedge(engine, health):
+            return primary.result()[0]
+
+        record_resilience(engine, 'hedge_fired')
+        hedge = self._submit(params, health)
+        pending = {primary, hedge}
+        first = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                results, outage = future.result()
+                if not outage:
+                    if future is hedge:
+                        record_resilience(engine, 'hedge_won')
+                    return results
+                first = first or results
+        # Both failed; report the first failure
+        return first
+
+
+# Module-level so latency windows and breakers survive warm invocations
+upstream = ResilientSearch.from_env(serpapi_client)
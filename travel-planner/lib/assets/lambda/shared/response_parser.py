@@ -0,0 +1,130 @@
+import time
+from typing import Dict
+
+import ijson
+
+# Parts of each engine's response the handlers read. Nested dicts keep only the listed
+# keys and True keeps the whole value; a selection applies to every item of a list.
+# Keep in step with travel/results.py, shared/pricing.py and shared/risk_model.py.
+_AIRPORT_FIELDS = {'id': True, 'time': True}
+_LEG_FIELDS = {
+    'departure_airport': _AIRPORT_FIELDS,
+    'arrival_airport': _AIRPORT_FIELDS,
+    'airline': True,
+    'flight_number': True,
+    'duration': True,
+}
+_FLIGHT_FIELDS = {
+    'flights': _LEG_FIELDS,
+    'price': True,
+    'total_duration': True,
+    'layovers': {'id': True},
+    'type': True,
+    'carbon_emissions': {'this_flight': True},
+    'booking_token': True,
+}
+_PROPERTY_FIELDS = {
+    key: True
+    for key in (
+        'name', 'rate_per_night', 'price', 'total_rate', 'overall_rating', 'reviews', 'extracted_hotel_class',
+        'hotel_class', 'amenities', 'check_in_time', 'check_out_time', 'link',
+    )
+}
+RESPONSE_FIELDS = {
+    'google_flights': {'error': True, 'best_flights': _FLIGHT_FIELDS, 'other_flights': _FLIGHT_FIELDS},
+    'google_hotels': {'error': True, 'serpapi_pagination': True, 'properties': _PROPERTY_FIELDS},
+    'google_finance': {'error': True, 'summary': True, 'price': True, 'graph': {'price': True, 'date': True}},
+}
+
+_OPEN = ('start_map', 'start_array')
+_CLOSE = ('end_map', 'end_array')
+
+
+class SelectiveParser:
+    """Incremental JSON parser that builds only the selected parts of a document.
+
+    The body is tokenized by ijson's C backend as it is fed in and every value
+    outside the selection (images, price insights, knowledge graphs) is skipped without
+    being built, so neither the body nor the full document is ever held in
+    memory. ``bytes`` and ``seconds`` count the input fed and the time spent
+    parsing it.
+    """
+
+    def __init__(self, selection: Dict):
+        self.selection = selection
+        self.bytes = 0
+        self.seconds = 0.0
+        self._events = ijson.sendable_list()
+        self._tokenizer = ijson.basic_parse_coro(self._events, use_float=True)
+        # One frame per open container being built: [container, selection, current key, selection of that key]
+        self._stack = []
+        # Nesting depth inside a skipped value; -1 when the next value is to be skipped
+        self._skip = 0
+        self._result = None
+
+    def _build(self) -> None:
+        stack = self._stack
+        skip = self._skip
+        for event, value in self._events:
+            if skip:
+                if skip < 0:
+                    skip = 1 if event in _OPEN else 0
+                elif event in _OPEN:
+                    skip += 1
+                elif event in _CLOSE:
+                    skip -= 1
+                continue
+
+            if event == 'map_key':
+                frame = stack[-1]
+                selected = True if frame[1] is True else frame[1].get(value)
+                if selected is None:
+                    skip = -1
+                else:
+                    frame[2] = value
+                    frame[3] = selected
+                continue
+
+            if not stack:
+                selected = self.selection
+            else:
+                # Lists pass their selection on to every item
+                selected = stack[-1][3] if type(stack[-1][0]) is dict else stack[-1][1]
+            if event == 'start_map':
+                stack.append([{}, selected, None, None])
+                continue
+            if event == 'start_array':
+                stack.append([[], selected, None, None])
+                continue
+            if event in _CLOSE:
+                value = stack.pop()[0]
+                if not stack:
+                    self._result = value
+                    continue
+
+            if not stack:
+                self._result = value
+            elif type(stack[-1][0]) is dict:
+                stack[-1][0][stack[-1][2]] = value
+            else:
+                stack[-1][0].append(value)
+        del self._events[:]
+        self._skip = skip
+
+    def feed(self, chunk: bytes) -> None:
+        """Parse the next part of the body; raises ``ijson.JSONError`` on malformed JSON."""
+        start = time.perf_counter()
+        self.bytes += len(chunk)
+        self._tokenizer.send(chunk)
+        self._build()
+        self.seconds += time.perf_counter() - start
+
+    def close(self) -> Dict:
+        """Finish parsing and return the selected parts of the document."""
+        start = time.perf_counter()
+        self._tokenizer.close()
+        self._build()
+        self.seconds += time.perf_counter() - start
+        if not isinstance(self._result, dict):
+            raise ijson.JSONError('Expected a JSON object')
+        return self._result
@@ -0,0 +1,259 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from aws_lambda_powertools import Logger
+
+from shared.observability import record_cache, record_fanout, submit
+from shared.scheduler import INTERACTIVE, scheduler
+
+logger = Logger(child=True)
+
+API_KEY = os.environ.get('API_KEY')
+
+# Google Finance chart window whose daily closes are used to estimate volatility and correlation
+HISTORY_WINDOW = os.environ.get('RISK_HISTORY_WINDOW', '1Y')
+# How long a symbol's price history is reused; daily closes only change once a day
+HISTORY_TTL_SECONDS = float(os.environ.get('RISK_HISTORY_TTL_SECONDS', '43200'))
+HISTORY_MAX_ENTRIES = int(os.environ.get('RISK_HISTORY_MAX_ENTRIES', '2048'))
+# Concurrent history fetches, and the time budget for fetching all of them
+HISTORY_CONCURRENCY = int(os.environ.get('RISK_HISTORY_CONCURRENCY', '8'))
+HISTORY_DEADLINE_SECONDS = float(os.environ.get('RISK_HISTORY_DEADLINE_SECONDS', '10'))
+# Fewest daily returns a symbol needs before it is modeled
+MIN_OBSERVATIONS = int(os.environ.get('RISK_MIN_OBSERVATIONS', '20'))
+# Share of the correlation kept in common factors; the rest of each symbol's variance is independent noise
+FACTOR_VARIANCE = float(os.environ.get('RISK_FACTOR_VARIANCE', '0.95'))
+
+TRADING_DAYS_PER_YEAR = 252
+# Components always kept, so small portfolios keep their exact correlation
+MIN_FACTORS = 10
+# Fitted models kept for the most recent symbol sets
+MAX_MODELS = 8
+
+
+class RiskModelError(ValueError):
+    """Raised when a symbol has no usable price history."""
+
+
+def parse_history(graph: List[Dict]) -> Tuple[np.ndarray, np.ndarray]:
+    """Turn Google Finance chart points into ``(days, closes)``: the last price of each day, oldest first.
+
+    Days are proleptic ordinals, so histories from different exchanges can be aligned.
+    """
+    closes = {}
+    for point in graph or []:
+        price = point.get('price')
+        try:
+            day = datetime.strptime(point.get('date', '')[:11], '%b %d %Y').toordinal()
+        except ValueError:
+            continue
+        if isinstance(price, (int, float)) and price > 0:
+            closes[day] = float(price)
+    days = np.array(sorted(closes), dtype=np.int64)
+    return days, np.array([closes[day] for day in days.tolist()], dtype=float)
+
+
+class HistoryCache:
+    """In-memory LRU cache of daily price histories with a TTL, kept across warm invocations."""
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # symbol -> (days, closes, fetched_at)
+        self._lock = threading.Lock()
+
+    def get(self, symbol: str) -> Optional[Tuple[np.ndarray, np.ndarray, float]]:
+        with self._lock:
+            entry = self._entries.get(symbol)
+            if entry is None:
+                return None
+            if time.time() - entry[2] > self.ttl:
+                del self._entries[symbol]
+                return None
+            self._entries.move_to_end(symbol)
+            return entry
+
+    def set(self, symbol: str, days: np.ndarray, closes: np.ndarray) -> Tuple[np.ndarray, np.ndarray, float]:
+        entry = (days, closes, time.time())
+        with self._lock:
+            self._entries[symbol] = entry
+            self._entries.move_to_end(symbol)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+
+history_cache = HistoryCache(HISTORY_TTL_SECONDS, HISTORY_MAX_ENTRIES)
+
+
+def fetch_history(symbol: str, priority: str = INTERACTIVE) -> Tuple[np.ndarray, np.ndarray, float]:
+    """Fetch a symbol's daily closes over ``HISTORY_WINDOW`` and cache them."""
+    params = {
+        "engine": "google_finance",
+        "q": symbol,
+        "window": HISTORY_WINDOW,
+        "api_key": API_KEY
+    }
+
+    results = scheduler.search(params, priority)
+
+    if results.get('error'):
+        raise RiskModelError(results['error'])
+    days, closes = parse_history(results.get('graph'))
+    if len(closes) <= MIN_OBSERVATIONS:
+        raise RiskModelError(f"Only {max(len(closes) - 1, 0)} daily returns in the price history, at least {MIN_OBSERVATIONS} are needed")
+    return history_cache.set(symbol, days, closes)
+
+
+def fetch_histories(symbols: Iterable[str], deadline: float = None) -> Tuple[Dict[str, tuple], Dict[str, str]]:
+    """Daily histories of every symbol, from the cache or fetched concurrently within ``deadline``.
+
+    Returns ``(histories, errors)`` like ``fetch_quotes``; each history is ``(days, closes, fetched_at)``.
+    """
+    histories = {}
+    errors = {}
+    missing = []
+    for symbol in dict.fromkeys(symbols):
+        entry = history_cache.get(symbol)
+        if entry is None:
+            record_cache('risk_history', 'miss')
+            missing.append(symbol)
+        else:
+            record_cache('risk_history', 'hit')
+            histories[symbol] = entry
+    if not missing:
+        return histories, errors
+
+    deadline = HISTORY_DEADLINE_SECONDS if deadline is None else deadline
+    width = min(HISTORY_CONCURRENCY, len(missing))
+    record_fanout('history', width)
+    executor = ThreadPoolExecutor(max_workers=width)
+    try:
+        futures = {submit(executor, fetch_history, symbol): symbol for symbol in missing}
+        done, not_done = wait(futures, timeout=deadline)
+
+        for future in done:
+            symbol = futures[future]
+            try:
+                histories[symbol] = future.result()
+            except Exception as e:
+                logger.error(f"Error fetching price history for {symbol}: {str(e)}")
+                errors[symbol] = str(e)
+
+        for future in not_done:
+            symbol = futures[future]
+            future.cancel()
+            logger.warning(f"Timed out fetching price history for {symbol}")
+            errors[symbol] = f"Timed out after {deadline}s"
+    finally:
+        # Do not block the response on stragglers past the deadline
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return histories, errors
+
+
+class RiskModel:
+    """Annualized volatility and correlation of daily log returns for a set of symbols.
+
+    Histories are aligned on the union of their trading days, carrying the
+    last close over days a symbol did not trade, from the first day every
+    symbol has a price. The correlation is split into the largest principal
+    components of the standardized returns, which explain ``FACTOR_VARIANCE``
+    of it, and independent noise for the rest of each symbol's variance. The
+    components come from a thin SVD of the returns, so fitting never builds
+    the symbols x symbols matrix, and drawing correlated shocks costs
+    O(factors x symbols) per path instead of O(symbols^2).
+    """
+
+    def __init__(self, symbols: List[str], volatility: np.ndarray, loadings: np.ndarray, residual: np.ndarray, observations: int):
+        self.symbols = symbols
+        self.volatility = volatility
+        self.loadings = loadings
+        self.residual = residual
+        self.observations = observations
+
+    @classmethod
+    def fit(cls, histories: Dict[str, tuple]) -> 'RiskModel':
+        symbols = list(histories)
+        start = max(int(histories[symbol][0][0]) for symbol in symbols)
+        calendar = np.unique(np.concatenate([histories[symbol][0] for symbol in symbols]))
+        calendar = calendar[calendar >= start]
+
+        closes = np.empty((len(calendar), len(symbols)))
+        volatility = np.empty(len(symbols))
+        for i, symbol in enumerate(symbols):
+            days, prices = histories[symbol][0], histories[symbol][1]
+            # Last close on or before each calendar day
+            closes[:, i] = prices[np.searchsorted(days, calendar, side='right') - 1]
+            volatility[i] = np.diff(np.log(prices)).std(ddof=1) * np.sqrt(TRADING_DAYS_PER_YEAR)
+        returns = np.diff(np.log(closes), axis=0)
+
+        if len(symbols) == 1 or len(returns) < 2:
+            loadings = np.zeros((len(symbols), 1))
+        else:
+            returns -= returns.mean(axis=0)
+            deviation = returns.std(axis=0, ddof=1)
+            # Symbols whose price never moved over the aligned window are left uncorrelated
+            returns[:, deviation > 0] /= deviation[deviation > 0] * np.sqrt(len(returns) - 1)
+            returns[:, deviation == 0] = 0
+            # returns.T @ returns is now the correlation matrix; its eigenvectors are the right singular vectors
+            _, singular, components = np.linalg.svd(returns, full_matrices=False)
+            variance = singular ** 2
+            factors = max(MIN_FACTORS, int(np.searchsorted(np.cumsum(variance), FACTOR_VARIANCE * variance.sum())) + 1)
+            loadings = components[:factors].T * singular[:factors]
+        residual = np.sqrt(np.clip(1 - (loadings ** 2).sum(axis=1), 0, None))
+        return cls(symbols, volatility, loadings.astype(np.float32), residual.astype(np.float32), len(returns))
+
+    def shocks(self, rng: np.random.Generator, paths: int) -> np.ndarray:
+        """Standard normal shocks with the model's correlation, one row per path and one column per symbol.
+
+        The second half of the rows mirrors the first (antithetic pairs), which
+        halves the random numbers drawn, the bulk of the cost for large
+        portfolios, and lowers the variance of the estimates.
+        """
+        half = (paths + 1) // 2
+        shocks = np.empty((paths, len(self.symbols)), dtype=np.float32)
+        drawn = shocks[:half]
+        rng.standard_normal(dtype=np.float32, out=drawn)
+        drawn *= self.residual
+        drawn += rng.standard_normal((half, self.loadings.shape[1]), dtype=np.float32) @ self.loadings.T
+        np.negative(shocks[:paths - half], out=shocks[half:])
+        return shocks
+
+
+_models = OrderedDict()  # (symbol, fetched_at) pairs -> RiskModel
+_models_lock = threading.Lock()
+
+
+def risk_model(symbols: Iterable[str], deadline: float = None) -> Tuple[Optional[RiskModel], Dict[str, str]]:
+    """Fit, or reuse, the risk model of every symbol with a usable history.
+
+    Returns ``(model, errors)``; symbols without a history are reported in
+    ``errors`` and left out of the model, which is None when no symbol has one.
+    A model is refitted only when one of its histories was refetched.
+    """
+    symbols = list(dict.fromkeys(symbols))
+    histories, errors = fetch_histories(symbols, deadline)
+    if not histories:
+        return None, errors
+    # In request order, whatever order the fetches finished in, so the model cache key is stable
+    histories = {symbol: histories[symbol] for symbol in symbols if symbol in histories}
+
+    key = tuple((symbol, histories[symbol][2]) for symbol in histories)
+    with _models_lock:
+        model = _models.get(key)
+        if model is not None:
+            _models.move_to_end(key)
+            return model, errors
+
+    model = RiskModel.fit(histories)
+    with _models_lock:
+        _models[key] = model
+        while len(_models) > MAX_MODELS:
+            _models.popitem(last=False)
+    return model, errors
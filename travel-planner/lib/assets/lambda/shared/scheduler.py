@@ -0,0 +1,276 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import Counter
+from decimal import Decimal
+from typing import Callable, Dict, Optional
+
+from aws_lambda_powertools import Logger
+
+from shared.observability import record_quota, record_quota_wait
+from shared.resilience import upstream
+
+logger = Logger(child=True)
+
+INTERACTIVE = 'interactive'
+BACKGROUND = 'background'
+
+# Longest a request waits for quota before giving up, by priority
+MAX_WAIT_SECONDS = {
+    INTERACTIVE: float(os.environ.get('SCHEDULER_MAX_WAIT_SECONDS', '5')),
+    BACKGROUND: float(os.environ.get('SCHEDULER_BACKGROUND_MAX_WAIT_SECONDS', '30')),
+}
+# Fraction of each engine's burst that background requests may not use, kept for interactive ones
+BACKGROUND_RESERVE = float(os.environ.get('SCHEDULER_BACKGROUND_RESERVE', '0.5'))
+
+# Longest single sleep while waiting, so waiters notice priority changes and new tokens
+POLL_SECONDS = 0.25
+
+
+def request_key(params: Dict) -> str:
+    """Identify a search by its params, ignoring ``api_key`` and parameter order."""
+    canonical = sorted((key, str(value)) for key, value in params.items() if key != 'api_key')
+    return hashlib.sha256(json.dumps(canonical).encode()).hexdigest()
+
+
+class LocalBucketStore:
+    """Token buckets in process memory; each container enforces its own budget."""
+
+    def __init__(self):
+        self._buckets = {}  # engine -> (tokens, updated_at)
+        self._lock = threading.Lock()
+
+    def try_acquire(self, engine: str, rate: float, burst: float, reserve: float = 0) -> float:
+        """Take one token, leaving at least ``reserve``. Returns 0 on success, else seconds until one is free."""
+        with self._lock:
+            now = time.time()
+            tokens, updated_at = self._buckets.get(engine, (burst, now))
+            tokens = min(burst, tokens + (now - updated_at) * rate)
+            if tokens - 1 >= reserve:
+                self._buckets[engine] = (tokens - 1, now)
+                return 0
+            self._buckets[engine] = (tokens, now)
+            return (reserve + 1 - tokens) / rate
+
+
+class DynamoDBBucketStore:
+    """Token buckets shared by every container through a DynamoDB table keyed on ``bucket``.
+
+    Each take is a conditional update on the bucket's ``updated_at``, so
+    concurrent containers cannot spend the same token. The item's ``consumed``
+    attribute counts every token ever taken. ``boto3`` comes with the Lambda
+    runtime and is only imported when this store is selected.
+    """
+
+    MAX_ATTEMPTS = 5
+
+    def __init__(self, table_name: str, endpoint_url: Optional[str] = None):
+        import boto3
+
+        self.table = boto3.resource('dynamodb', endpoint_url=endpoint_url).Table(table_name)
+
+    def try_acquire(self, engine: str, rate: float, burst: float, reserve: float = 0) -> float:
+        for _ in range(self.MAX_ATTEMPTS):
+            item = self.table.get_item(Key={'bucket': engine}, ConsistentRead=True).get('Item')
+            now = time.time()
+            if item is None:
+                tokens, previous = burst, None
+            else:
+                previous = item['updated_at']
+                tokens = min(burst, float(item['tokens']) + (now - float(previous)) * rate)
+            if tokens - 1 < reserve:
+                return (reserve + 1 - tokens) / rate
+
+            # Expression names throughout: several of these attribute names are DynamoDB reserved words
+            update = {
+                'Key': {'bucket': engine},
+                'UpdateExpression': 'SET #tokens = :tokens, #updated_at = :now ADD #consumed :one',
+                'ExpressionAttributeNames': {'#tokens': 'tokens', '#updated_at': 'updated_at', '#consumed': 'consumed'},
+                'ExpressionAttributeValues': {
+                    ':tokens': Decimal(str(round(tokens - 1, 6))),
+                    ':now': Decimal(str(round(now, 6))),
+                    ':one': 1,
+                },
+            }
+            if previous is None:
+                update['ConditionExpression'] = 'attribute_not_exists(#bucket)'
+                update['ExpressionAttributeNames']['#bucket'] = 'bucket'
+            else:
+                update['ConditionExpression'] = '#updated_at = :previous'
+                update['ExpressionAttributeValues'][':previous'] = previous
+            try:
+                self.table.update_item(**update)
+                return 0
+            except self.table.meta.client.exceptions.ConditionalCheckFailedException:
+                # Another container took a token in between; re-read and try again
+                continue
+        return POLL_SECONDS
+
+
+class _Call:
+    __slots__ = ('priority', 'done', 'result', 'error')
+
+    def __init__(self, priority: str):
+        self.priority = priority
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class UpstreamScheduler:
+    """Coordinates every SerpAPI call made by a container.
+
+    Identical searches already in flight are collapsed into one upstream call
+    whose response every caller shares (single-flight). Each engine spends
+    from a token bucket refilled at ``rates[engine]`` per second up to
+    ``bursts[engine]``; an engine with a rate of 0 is not limited.
+    Interactive requests go first: background requests may not use the last
+    ``BACKGROUND_RESERVE`` of a bucket and yield while interactive requests
+    for the same engine are waiting. A request that cannot get a token within
+    its priority's wait limit gets an ``{"error": ...}`` response, like any
+    other failed search. ``admit``, when given, is asked before any quota is
+    spent and may return an error response to fail the search straight away,
+    e.g. while the engine's circuit breaker is open.
+    """
+
+    def __init__(
+        self,
+        search: Callable[[Dict], Dict],
+        store,
+        rates: Dict[str, float] = None,
+        bursts: Dict[str, float] = None,
+        default_rate: float = 0,
+        default_burst: float = 1,
+        admit: Callable[[str], Optional[Dict]] = None,
+    ):
+        self._search = search
+        self._admit = admit
+        self.store = store
+        self.rates = rates or {}
+        self.bursts = bursts or {}
+        self.default_rate = default_rate
+        self.default_burst = default_burst
+        self._inflight = {}
+        self._interactive_waiting = Counter()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, search: Callable[[Dict], Dict], admit: Callable[[str], Optional[Dict]] = None) -> 'UpstreamScheduler':
+        """Build the scheduler configured by the ``SERPAPI_RATE_*``/``SERPAPI_BURST_*`` and ``SCHEDULER_*`` variables."""
+        backend = os.environ.get('SCHEDULER_BACKEND', 'local').lower()
+        if backend == 'dynamodb':
+            store = DynamoDBBucketStore(
+                os.environ['SCHEDULER_TABLE'],
+                endpoint_url=os.environ.get('DYNAMODB_ENDPOINT_URL') or None,
+            )
+        elif backend == 'local':
+            store = LocalBucketStore()
+        else:
+            raise ValueError(f"Unknown SCHEDULER_BACKEND: {backend}")
+
+        engines = ('google_flights', 'google_hotels', 'google_finance')
+        default_rate = float(os.environ.get('SERPAPI_RATE_PER_SECOND', '10'))
+        default_burst = float(os.environ.get('SERPAPI_BURST', '20'))
+        return cls(
+            search,
+            store,
+            rates={engine: float(os.environ.get(f"SERPAPI_RATE_PER_SECOND_{engine.upper()}", default_rate)) for engine in engines},
+            bursts={engine: float(os.environ.get(f"SERPAPI_BURST_{engine.upper()}", default_burst)) for engine in engines},
+            default_rate=default_rate,
+            default_burst=default_burst,
+            admit=admit,
+        )
+
+    def _acquire(self, engine: str, call: _Call) -> Optional[Dict]:
+        """Wait for a token; return an error response if none comes in time."""
+        rate = self.rates.get(engine, self.default_rate)
+        if rate <= 0:
+            return None
+        burst = self.bursts.get(engine, self.default_burst)
+
+        start = time.time()
+        slept = False
+        waiting_interactive = False
+        try:
+            while True:
+                interactive = call.priority == INTERACTIVE
+                if interactive and not waiting_interactive:
+                    with self._lock:
+                        self._interactive_waiting[engine] += 1
+                    waiting_interactive = True
+
+                if not interactive and self._interactive_waiting[engine]:
+                    wait = POLL_SECONDS
+                else:
+                    wait = self.store.try_acquire(engine, rate, burst, 0 if interactive else burst * BACKGROUND_RESERVE)
+                waited = time.time() - start
+                if wait == 0:
+                    record_quota(engine, 'consumed')
+                    if slept:
+                        record_quota_wait(engine, waited * 1000)
+                    return None
+
+                if waited + wait > MAX_WAIT_SECONDS[call.priority]:
+                    record_quota(engine, 'throttled')
+                    logger.warning(f"No {engine} quota within {MAX_WAIT_SECONDS[call.priority]}s for a {call.priority} request")
+                    return {'error': "Search quota is exhausted for now. Try again in a few seconds."}
+                time.sleep(min(wait, POLL_SECONDS))
+                slept = True
+        finally:
+            if waiting_interactive:
+                with self._lock:
+                    self._interactive_waiting[engine] -= 1
+
+    def spend(self, engine: str) -> bool:
+        """Take one token for an extra request of a search already under way, without waiting.
+
+        Hedges and retries are billed like any other request, so they come
+        out of the same budget; returns False when none is left right now.
+        """
+        rate = self.rates.get(engine, self.default_rate)
+        if rate <= 0:
+            return True
+        if self.store.try_acquire(engine, rate, self.bursts.get(engine, self.default_burst)) > 0:
+            return False
+        record_quota(engine, 'consumed')
+        return True
+
+    def search(self, params: Dict, priority: str = INTERACTIVE) -> Dict:
+        """Run a search through the scheduler; same contract as ``SerpApiClient.search``."""
+        engine = params.get('engine', 'unknown')
+        key = request_key(params)
+        with self._lock:
+            call = self._inflight.get(key)
+            leader = call is None
+            if leader:
+                call = self._inflight[key] = _Call(priority)
+            elif priority == INTERACTIVE:
+                # An interactive caller must not wait behind a background leader's priority
+                call.priority = INTERACTIVE
+
+        if not leader:
+            record_quota(engine, 'deduplicated')
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            rejected = self._admit(engine) if self._admit else None
+            call.result = rejected or self._acquire(engine, call) or self._search(params)
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            call.done.set()
+        return call.result
+
+
+# Shared by every search in the container so deduplication and budgets see all callers
+scheduler = UpstreamScheduler.from_env(upstream.search, admit=upstream.admit)
+# Hedges and retries spend from the same buckets as the searches themselves
+upstream.spend = scheduler.spend
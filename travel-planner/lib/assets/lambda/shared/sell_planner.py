@@ -0,0 +1,207 @@
+from typing import Dict
+
+import numpy as np
+
+from shared.portfolio_model import Portfolio
+
+# Strategy name -> description, as accepted by the calculate_shares_to_sell strategy parameter
+STRATEGIES = {
+    'proportional': 'sell the same fraction of every position (fractional shares)',
+    'single_stock': 'sell from the highest value positions first (fractional shares)',
+    'whole_shares': 'sell proportionally in whole shares, just enough to meet the target',
+    'min_positions': 'sell whole shares from as few positions as possible',
+    'tax_aware': 'sell whole shares from the lots with the lowest gain per dollar first, using cost basis',
+}
+
+# Tolerance for float comparisons against the target amount
+EPSILON = 1e-9
+
+
+class SalePlanError(ValueError):
+    """Raised when no sale within the given constraints meets the target."""
+
+
+def _proportional(target: float, prices: np.ndarray, available: np.ndarray) -> np.ndarray:
+    return available * (target / (available * prices).sum())
+
+
+def _single_stock(target: float, prices: np.ndarray, available: np.ndarray) -> np.ndarray:
+    value = available * prices
+    order = np.argsort(-value, kind='stable')
+    cumulative = np.cumsum(value[order])
+    k = min(int(np.searchsorted(cumulative, target - EPSILON)), len(order) - 1)
+
+    shares = np.zeros_like(available)
+    shares[order[:k]] = available[order[:k]]
+    remaining = target - (cumulative[k - 1] if k else 0.0)
+    shares[order[k]] = remaining / prices[order[k]]
+    return shares
+
+
+def _whole_shares(target: float, prices: np.ndarray, available: np.ndarray) -> np.ndarray:
+    # Round a proportional sale down, then close the gap with as little overshoot as possible
+    shares = np.floor(available * (target / (available * prices).sum()) + EPSILON)
+    shortfall = target - shares @ prices
+    while shortfall > EPSILON:
+        spare = available - shares
+        candidates = spare >= 1
+        if not candidates.any():
+            break
+        closing = candidates & (prices >= shortfall)
+        if closing.any():
+            # One share of the cheapest position that covers the gap on its own
+            shares[np.argmin(np.where(closing, prices, np.inf))] += 1
+            break
+        i = int(np.argmax(np.where(candidates, prices, -np.inf)))
+        count = min(spare[i], max(1.0, np.floor(shortfall / prices[i])))
+        shares[i] += count
+        shortfall -= count * prices[i]
+    return shares
+
+
+def _min_positions(target: float, prices: np.ndarray, available: np.ndarray) -> np.ndarray:
+    value = available * prices
+    order = np.argsort(-value, kind='stable')
+    cumulative = np.cumsum(value[order])
+    # The k largest positions are the fewest that can be sold in full before the last one
+    k = min(int(np.searchsorted(cumulative, target - EPSILON)), len(order) - 1)
+
+    shares = np.zeros_like(available)
+    shares[order[:k]] = available[order[:k]]
+    remaining = target - (cumulative[k - 1] if k else 0.0)
+
+    # Any remaining position worth at least the gap can be the last one; pick the smallest overshoot
+    rest = order[k:]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        needed = np.ceil(remaining / prices[rest] - EPSILON)
+    overshoot = np.where(value[rest] >= remaining - EPSILON, needed * prices[rest] - remaining, np.inf)
+    best = int(np.argmin(overshoot))
+    shares[rest[best]] = min(available[rest[best]], needed[best])
+    return shares
+
+
+def _tax_aware(
+    target: float,
+    prices: np.ndarray,
+    available: np.ndarray,
+    lot_positions: np.ndarray,
+    lot_quantities: np.ndarray,
+    lot_cost_basis: np.ndarray,
+) -> np.ndarray:
+    """Return shares to sell per lot.
+
+    Selling a lot realizes ``1 - cost_basis / price`` of gain per dollar
+    raised, so lots are taken in increasing order of that ratio, which makes
+    the realized gain minimal for the amount raised. Lots with unknown cost
+    basis are assumed to have none and go last. ``lot_quantities`` must be
+    whole shares and ``available`` no more than each position's lots hold.
+    """
+    lot_prices = prices[lot_positions]
+    basis = np.nan_to_num(lot_cost_basis, nan=0.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        order = np.argsort(-(basis / lot_prices), kind='stable')
+
+    # Share of each position's cap still left when each lot comes up, in that order
+    positions = lot_positions[order]
+    quantities = lot_quantities[order]
+    grouped = np.argsort(positions, kind='stable')
+    grouped_quantities = quantities[grouped]
+    cumulative = np.cumsum(grouped_quantities)
+    group_starts = np.r_[0, np.flatnonzero(np.diff(positions[grouped])) + 1]
+    group_offsets = np.repeat(cumulative[group_starts] - grouped_quantities[group_starts], np.diff(np.r_[group_starts, len(grouped)]))
+    sold_before = cumulative - grouped_quantities - group_offsets
+    allowed_grouped = np.clip(available[positions[grouped]] - sold_before, 0, grouped_quantities)
+    allowed = np.empty_like(allowed_grouped)
+    allowed[grouped] = allowed_grouped
+
+    value = allowed * lot_prices[order]
+    running = np.cumsum(value)
+    k = min(int(np.searchsorted(running, target - EPSILON)), len(order) - 1)
+
+    sold = np.zeros_like(allowed)
+    sold[:k] = allowed[:k]
+    remaining = target - (running[k - 1] if k else 0.0)
+    sold[k] = min(allowed[k], np.ceil(remaining / lot_prices[order[k]] - EPSILON))
+
+    lot_shares = np.zeros_like(lot_quantities)
+    lot_shares[order] = sold
+    return lot_shares
+
+
+def plan_sale(
+    portfolio: Portfolio,
+    prices: Dict[str, float],
+    target_amount: float,
+    strategy: str = 'proportional',
+    max_per_position: float = 1.0,
+    rates: Dict[str, float] = None,
+    currency: str = 'USD',
+) -> Dict[str, Dict]:
+    """Plan which shares to sell to raise ``target_amount``.
+
+    Symbols without a price are left out. ``max_per_position`` caps the
+    fraction of each position that may be sold. ``prices`` and
+    ``target_amount`` are in ``currency``; when prices were converted from
+    listing currencies, ``rates`` holds each symbol's multiplier so cost
+    basis is converted alike. Returns ``{symbol: {...}}`` for every symbol
+    with shares to sell.
+    """
+    if strategy not in STRATEGIES:
+        raise SalePlanError(f"Unknown strategy '{strategy}'. Use one of: {', '.join(STRATEGIES)}")
+    if not 0 < max_per_position <= 1:
+        raise SalePlanError('max_per_position must be greater than 0 and at most 1')
+
+    if target_amount <= 0:
+        return {}
+
+    price_vector = np.asarray(portfolio.price_vector(prices))
+    priced = ~np.isnan(price_vector)
+    price_vector = np.where(priced, price_vector, 1.0)
+    available = np.where(priced, np.asarray(portfolio.quantities) * max_per_position, 0.0)
+    if strategy != 'proportional' and strategy != 'single_stock':
+        available = np.floor(available + EPSILON)
+    if strategy == 'tax_aware':
+        lot_positions = np.asarray(portfolio.lot_positions)
+        # Whole shares of each lot: a share split across two lots is not one lot's to sell
+        lot_quantities = np.floor(np.asarray(portfolio.lot_quantities) + EPSILON)
+        available = np.minimum(available, np.bincount(lot_positions, weights=lot_quantities, minlength=len(portfolio)))
+
+    sellable = available @ price_vector
+    if sellable + EPSILON < target_amount:
+        raise SalePlanError(
+            f"Only {round(sellable, 2)} {currency} can be raised with strategy '{strategy}' and max_per_position "
+            f"{max_per_position}, short of the target amount ({round(target_amount, 2)} {currency})"
+        )
+
+    gains = None
+    if strategy == 'tax_aware':
+        lot_cost_basis = np.asarray(portfolio.lot_cost_basis)
+        if rates:
+            lot_cost_basis = lot_cost_basis * np.nan_to_num(np.asarray(portfolio.price_vector(rates)), nan=1.0)[lot_positions]
+        lot_shares = _tax_aware(
+            target_amount, price_vector, available,
+            lot_positions, lot_quantities, lot_cost_basis,
+        )
+        shares = np.bincount(lot_positions, weights=lot_shares, minlength=len(portfolio))
+        # NaN for any position selling a lot of unknown cost basis
+        lot_gains = np.where(lot_shares > 0, lot_shares * (price_vector[lot_positions] - lot_cost_basis), 0.0)
+        gains = np.bincount(lot_positions, weights=lot_gains, minlength=len(portfolio))
+    elif strategy == 'proportional':
+        shares = _proportional(target_amount, price_vector, available)
+    elif strategy == 'single_stock':
+        shares = _single_stock(target_amount, price_vector, available)
+    elif strategy == 'whole_shares':
+        shares = _whole_shares(target_amount, price_vector, available)
+    else:
+        shares = _min_positions(target_amount, price_vector, available)
+
+    plan = {}
+    for i in np.flatnonzero(shares > EPSILON):
+        symbol = portfolio.symbols[i]
+        plan[symbol] = {
+            'shares': round(float(shares[i]), 2),
+            'estimated_value': round(float(shares[i] * price_vector[i]), 2),
+        }
+        if gains is not None:
+            plan[symbol]['estimated_realized_gain'] = None if np.isnan(gains[i]) else round(float(gains[i]), 2)
+    return plan
@@ -0,0 +1,157 @@
+import os
+import random
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+import ijson
+import requests
+from requests.adapters import HTTPAdapter
+from aws_lambda_powertools import Logger
+
+from shared.observability import record_upstream, record_upstream_retry
+from shared.response_parser import RESPONSE_FIELDS, SelectiveParser
+
+logger = Logger(child=True)
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Bytes of response body read and parsed at a time when streaming; smaller chunks lower the parse peak
+CHUNK_SIZE = 16 * 1024
+
+
+class SerpApiClient:
+    """SerpAPI search client with keep-alive connection pooling and retries.
+
+    A single ``requests.Session`` is shared by every search, so warm
+    invocations and concurrent fan-outs reuse open TLS connections instead of
+    paying a handshake per call. 429 and 5xx responses, as well as connection
+    errors, are retried with exponential backoff and full jitter.
+
+    With ``streaming`` on, responses of the engines in ``RESPONSE_FIELDS``
+    are parsed while they download and only the fields the handlers read are
+    kept; other engines are decoded in full.
+
+    ``base_url`` can point at a local stub server for testing.
+    """
+
+    def __init__(
+        self,
+        base_url: str = 'https://serpapi.com',
+        timeout: float = 30,
+        max_retries: int = 3,
+        backoff_base: float = 0.25,
+        backoff_max: float = 4,
+        pool_size: int = 16,
+        streaming: bool = True,
+    ):
+        self.search_url = base_url.rstrip('/') + '/search'
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.streaming = streaming
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    @classmethod
+    def from_env(cls) -> 'SerpApiClient':
+        return cls(
+            base_url=os.environ.get('SERPAPI_BASE_URL', 'https://serpapi.com'),
+            timeout=float(os.environ.get('SERPAPI_TIMEOUT_SECONDS', '30')),
+            max_retries=int(os.environ.get('SERPAPI_MAX_RETRIES', '3')),
+            pool_size=int(os.environ.get('SERPAPI_POOL_SIZE', '16')),
+            streaming=os.environ.get('SERPAPI_STREAMING_PARSE', 'true').lower() == 'true',
+        )
+
+    def _backoff(self, attempt: int, response: requests.Response = None) -> float:
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), self.backoff_max)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def _read(self, response: requests.Response, engine: str) -> Tuple[Dict, int, float]:
+        """Decode a response body; returns ``(results, payload_bytes, parse_seconds)``."""
+        selection = RESPONSE_FIELDS.get(engine) if self.streaming else None
+        try:
+            if selection is None:
+                content = response.content
+                start = time.perf_counter()
+                return response.json(), len(content), time.perf_counter() - start
+            parser = SelectiveParser(selection)
+            for chunk in response.iter_content(CHUNK_SIZE):
+                parser.feed(chunk)
+            return parser.close(), parser.bytes, parser.seconds
+        except (ValueError, ijson.JSONError):
+            response.close()
+            return {'error': f"Search service returned HTTP {response.status_code}"}, 0, 0
+
+    def _may_retry(self, attempt: int, allow_retry: Optional[Callable[[], bool]]) -> bool:
+        # allow_retry is only asked once a retry is otherwise due, as it may spend quota
+        return attempt < self.max_retries and (allow_retry is None or allow_retry())
+
+    def search(self, params: Dict, timeout: float = None) -> Dict:
+        """Run a search and return the decoded JSON response.
+
+        Like ``GoogleSearch.get_dict`` this returns SerpAPI's own error payload
+        (``{"error": ...}``) instead of raising, and transport failures that
+        outlast the retries are reported the same way. ``timeout`` overrides
+        the per-attempt timeout.
+        """
+        return self.request(params, timeout)[0]
+
+    def request(self, params: Dict, timeout: float = None, allow_retry: Callable[[], bool] = None) -> Tuple[Dict, Optional[str]]:
+        """``search`` that also returns how the call failed, e.g. ``HTTP503``, ``ReadTimeout`` or ``SerpApiError``; None on success.
+
+        ``allow_retry``, when given, is asked before each retry; returning
+        False reports the last failure instead, e.g. when no quota is left for
+        another billed request.
+        """
+        engine = params.get('engine', 'unknown')
+        timeout = timeout or self.timeout
+        query = {**params, 'output': 'json'}
+        start = time.perf_counter()
+        attempt = 0
+        while True:
+            response = None
+            try:
+                response = self.session.get(self.search_url, params=query, timeout=timeout, stream=True)
+                if response.status_code not in RETRY_STATUS_CODES or not self._may_retry(attempt, allow_retry):
+                    # Read inside the retry loop: with streaming, the body can still fail mid-download
+                    results, payload_bytes, parse_seconds = self._read(response, engine)
+                    break
+                reason = f"HTTP{response.status_code}"
+                response.close()
+            except requests.RequestException as e:
+                if response is not None:
+                    response.close()
+                reason = type(e).__name__
+                if not self._may_retry(attempt, allow_retry):
+                    logger.error(f"SerpAPI request for {engine} failed: {str(e)}")
+                    record_upstream(engine, (time.perf_counter() - start) * 1000, error_class=reason)
+                    return {'error': f"Search service unavailable: {str(e)}"}, reason
+
+            delay = self._backoff(attempt, response)
+            logger.warning(f"Retrying SerpAPI {engine} after {reason} in {delay:.2f}s")
+            record_upstream_retry(engine, reason)
+            time.sleep(delay)
+            attempt += 1
+
+        error_class = None
+        if response.status_code >= 400:
+            error_class = f"HTTP{response.status_code}"
+        elif results.get('error'):
+            error_class = 'SerpApiError'
+        record_upstream(
+            engine,
+            (time.perf_counter() - start - parse_seconds) * 1000,
+            payload_bytes=payload_bytes,
+            parse_ms=parse_seconds * 1000,
+            error_class=error_class,
+        )
+        return results, error_class
+
+# Shared by every search in the container so connections survive warm invocations
+serpapi_client = SerpApiClient.from_env()
@@ -0,0 +1,24 @@
+import os
+import sys
+
+import pytest
+
+LAMBDA_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Handlers import the shared modules as ``shared.*`` and their own modules by name, as in the images;
+# the SerpAPI stub comes from the benchmarks
+sys.path[:0] = [LAMBDA_DIR] + [os.path.join(LAMBDA_DIR, directory) for directory in ('travel', 'portfolio', 'benchmarks')]
+
+os.environ.setdefault('API_KEY', 'test')
+os.environ.setdefault('POWERTOOLS_TRACE_DISABLED', '1')
+os.environ.setdefault('POWERTOOLS_METRICS_NAMESPACE', 'Test')
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+
+@pytest.fixture
+def failing_stub():
+    """A local SerpAPI stub answering every request with HTTP 503."""
+    from serpapi_stub import StubConfig, StubServer
+
+    with StubServer(StubConfig(error_rate=1, error_statuses=(503,))) as stub:
+        yield stub
@@ -0,0 +1,95 @@
+import json
+from collections import OrderedDict
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+import portfolio_routes
+from shared import affordability, risk_model
+from shared.portfolio_model import Portfolio
+from shared.affordability import QUANTILES, simulate_affordability
+from shared.risk_model import RiskModel
+
+
+def _model(volatility, correlation: float = 0.5) -> RiskModel:
+    symbols = [f"S{i}" for i in range(len(volatility))]
+    loadings = np.full((len(symbols), 1), np.sqrt(correlation), dtype=np.float32)
+    residual = np.full(len(symbols), np.sqrt(1 - correlation), dtype=np.float32)
+    return RiskModel(symbols, np.asarray(volatility, dtype=float), loadings, residual, 250)
+
+
+def _quantiles(result):
+    return [result['remaining_value_quantiles'][f"p{q}"] for q in QUANTILES]
+
+
+def test_zero_volatility_keeps_todays_value():
+    result = simulate_affordability([6000.0, 4000.0], _model([0.0, 0.0]), 500.0, 8000.0, 90, paths=1000, rng=np.random.default_rng(0))
+    assert result['expected_remaining'] == pytest.approx(2500.0)
+    assert _quantiles(result) == [2500.0] * len(QUANTILES)
+    assert result['probability_affordable'] == 1.0
+
+
+def test_without_a_model_or_horizon_the_outcome_is_certain():
+    assert simulate_affordability([1000.0], None, 0.0, 1500.0, 90, paths=10)['probability_affordable'] == 0.0
+    result = simulate_affordability([1000.0], _model([0.5]), 0.0, 900.0, 0, paths=10)
+    assert (result['probability_affordable'], result['expected_remaining']) == (1.0, pytest.approx(100.0))
+    assert simulate_affordability([], None, 200.0, 100.0, 30, paths=10)['expected_remaining'] == pytest.approx(100.0)
+
+
+def test_simulation_is_seeded_and_its_quantiles_are_monotone():
+    args = ([6000.0, 4000.0, 2000.0], _model([0.2, 0.4, 0.8]), 0.0, 10000.0, 180)
+    first = simulate_affordability(*args, paths=20001, rng=np.random.default_rng(7))
+    assert simulate_affordability(*args, paths=20001, rng=np.random.default_rng(7)) == first
+    quantiles = _quantiles(first)
+    assert quantiles == sorted(quantiles) and quantiles[0] < quantiles[-1]
+    assert 0 < first['probability_affordable'] < 1
+
+
+def test_expected_value_stays_at_todays_value():
+    # No drift: the mean terminal value is today's value, whatever the volatility
+    result = simulate_affordability([6000.0, 4000.0], _model([0.3, 0.6]), 1000.0, 5000.0, 365, paths=200000, rng=np.random.default_rng(8))
+    assert result['expected_remaining'] == pytest.approx(6000.0, rel=0.01)
+    # Log-normal outcomes: the median sits below the mean
+    assert result['remaining_value_quantiles']['p50'] < result['expected_remaining']
+
+
+def test_batches_cover_every_path(monkeypatch):
+    monkeypatch.setattr(affordability, 'SIMULATION_BATCH_ELEMENTS', 7)
+    result = simulate_affordability([100.0, 100.0, 100.0], _model([0.2, 0.2, 0.2]), 0.0, 300.0, 365, paths=50, rng=np.random.default_rng(9))
+    # Three symbols per path, two paths per batch, an odd path in the last batch
+    assert 0 < result['probability_affordable'] < 1
+    assert result['expected_remaining'] == pytest.approx(0.0, abs=30)
+
+
+def test_cost_volatility_spreads_the_trip_cost():
+    result = simulate_affordability([1000.0], None, 0.0, 1000.0, 365, paths=100000, cost_volatility=0.3, rng=np.random.default_rng(10))
+    assert result['expected_remaining'] == pytest.approx(0.0, abs=5)
+    quantiles = _quantiles(result)
+    assert quantiles == sorted(quantiles) and quantiles[0] < -100 < 100 < quantiles[-1]
+
+
+class ChartStub:
+    """Stands in for the scheduler: a year of flat daily closes for every symbol but ``BAD*`` ones."""
+
+    def search(self, params, priority):
+        if params['q'].startswith('BAD'):
+            return {'error': 'No chart'}
+        first = date(2024, 1, 1)
+        return {'graph': [{'date': (first + timedelta(days=i)).strftime('%b %d %Y'), 'price': 100.0} for i in range(60)]}
+
+
+def test_positions_without_history_keep_todays_value(monkeypatch):
+    monkeypatch.setattr(risk_model, 'scheduler', ChartStub())
+    monkeypatch.setattr(risk_model, 'history_cache', risk_model.HistoryCache(ttl=3600, max_entries=100))
+    monkeypatch.setattr(risk_model, '_models', OrderedDict())
+    monkeypatch.setattr(portfolio_routes, 'load_portfolio', lambda: Portfolio.from_mapping({'AAPL': 10, 'BADX': 5, 'GONE': 1}))
+    monkeypatch.setattr(portfolio_routes, 'prices_in_currency', lambda symbols, currency: ({'AAPL': 100.0, 'BADX': 40.0}, {}, {'GONE': 'No price'}))
+
+    travel_date = (date.today() + timedelta(days=90)).isoformat()
+    response = portfolio_routes.simulate_affordability(travel_budget=1000.0, travel_date=travel_date, simulations=100)
+    body = json.loads(response['body'])
+    assert response['statusCode'] == 200
+    assert (body['modeled_symbols'], body['unmodeled_symbols'], body['failed_symbols']) == (['AAPL'], {'BADX': 'No chart'}, {'GONE': 'No price'})
+    # AAPL never moved, BADX is held at 200
+    assert (body['current_value'], body['expected_remaining'], body['probability_affordable']) == (1200.0, 200.0, 1.0)
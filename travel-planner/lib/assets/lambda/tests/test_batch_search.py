@@ -0,0 +1,113 @@
+import threading
+from datetime import date, timedelta
+
+import pytest
+
+import travel_routes
+from batch_search import MAX_BATCH_SEARCHES, cheapest_flight, expand_routes, parse_weekdays, run_batch, split_list
+
+
+def test_split_list_accepts_text_and_bracketed_literals():
+    assert split_list(['AUS, DFW', '["DFW", "IAH"]', ' ', "['SAT']"]) == ['AUS', 'DFW', 'IAH', 'SAT']
+    assert split_list([]) == []
+
+
+def test_parse_weekdays():
+    assert parse_weekdays(['Friday', 'sat']) == {4, 5}
+    assert parse_weekdays([]) is None
+    with pytest.raises(ValueError, match='Unknown weekday'):
+        parse_weekdays(['fri', 'someday'])
+
+
+def test_expand_routes_filters_weekdays():
+    # 2025-03-07 is a Friday
+    routes = expand_routes(['AUS'], ['CDG'], '2025-03-03', '2025-03-16', 2, weekdays={4, 5})
+    assert routes == [
+        ('AUS', 'CDG', '2025-03-07', '2025-03-09'),
+        ('AUS', 'CDG', '2025-03-08', '2025-03-10'),
+        ('AUS', 'CDG', '2025-03-14', '2025-03-16'),
+        ('AUS', 'CDG', '2025-03-15', '2025-03-17'),
+    ]
+
+
+def test_expand_routes_uppercases_airport_codes_and_keeps_kgmids():
+    routes = expand_routes(['aus', 'jfk,lga', '/m/04jpl'], ['cdg'], '2025-03-07', '2025-03-07', 3)
+    assert [route[:2] for route in routes] == [('AUS', 'CDG'), ('JFK,LGA', 'CDG'), ('/m/04jpl', 'CDG')]
+
+
+def test_expand_routes_drops_same_airport_and_duplicate_trips():
+    routes = expand_routes(['AUS', 'aus', 'CDG'], ['cdg', 'CDG'], '2025-03-07', '2025-03-07', 3)
+    assert routes == [('AUS', 'CDG', '2025-03-07', '2025-03-10')]
+    # kgmids differing in case are different places
+    assert expand_routes(['/m/04jpl'], ['/M/04JPL', '/m/04jpl'], '2025-03-07', '2025-03-07', 3) == [('/m/04jpl', '/M/04JPL', '2025-03-07', '2025-03-10')]
+
+
+@pytest.mark.parametrize('start, end, length', [('2025-03-08', '2025-03-07', 3), ('2025-03-07', '2025-03-07', -1)])
+def test_expand_routes_rejects_bad_windows(start, end, length):
+    with pytest.raises(ValueError):
+        expand_routes(['AUS'], ['CDG'], start, end, length)
+
+
+def test_cheapest_flight_skips_unpriced_options():
+    results = {
+        'best_flights': [{'price': 900, 'flights': [{'airline': 'A'}]}, {'flights': [{'airline': 'B'}]}],
+        'other_flights': [{'price': 450, 'flights': [{'airline': 'C'}]}],
+    }
+    assert cheapest_flight(results).price == 450
+    assert cheapest_flight({'best_flights': [{'flights': []}]}) is None
+    assert cheapest_flight({}) is None
+
+
+def _flights(price):
+    return {'best_flights': [{'price': price, 'flights': [{'airline': 'A'}], 'total_duration': 600}]}
+
+
+def test_run_batch_sorts_rows_and_lists_failures():
+    routes = [('AUS', 'CDG', '2025-03-07', '2025-03-10'), ('DFW', 'CDG', '2025-03-07', '2025-03-10'),
+              ('IAH', 'CDG', '2025-03-07', '2025-03-10'), ('SAT', 'CDG', '2025-03-07', '2025-03-10')]
+    answers = {'AUS': _flights(900), 'DFW': _flights(450), 'IAH': {'error': 'No flights'}}
+
+    def search(route):
+        if route[0] == 'SAT':
+            raise RuntimeError('boom')
+        return answers[route[0]]
+
+    rows, failures = run_batch(routes, search, max_workers=2)
+    assert [row[:5] for row in rows] == [[*routes[1], 450], [*routes[0], 900]]
+    assert sorted(failures, key=lambda failure: failure['route']) == [
+        {'route': list(routes[2]), 'error': 'No flights'},
+        {'route': list(routes[3]), 'error': 'boom'},
+    ]
+
+
+def test_run_batch_returns_partial_results_at_the_deadline():
+    routes = [('AUS', 'CDG', '2025-03-07', '2025-03-10'), ('DFW', 'CDG', '2025-03-07', '2025-03-10')]
+    release = threading.Event()
+
+    def search(route):
+        if route[0] == 'DFW':
+            release.wait(5)
+        return _flights(500)
+
+    try:
+        rows, failures = run_batch(routes, search, max_workers=2, deadline=0.2)
+    finally:
+        release.set()
+    assert [row[0] for row in rows] == ['AUS']
+    assert failures == [{'route': list(routes[1]), 'error': 'Timed out after 0.2s'}]
+
+
+def test_run_batch_without_routes():
+    assert run_batch([], lambda route: {}) == ([], [])
+
+
+def test_search_flights_batch_caps_the_number_of_searches(monkeypatch):
+    searched = []
+    monkeypatch.setattr(travel_routes, 'run_batch', lambda routes, search: searched.append(routes) or ([], []))
+    end = date(2025, 3, 1) + timedelta(days=MAX_BATCH_SEARCHES)
+    response = travel_routes.search_flights_batch(
+        departure_ids=['AUS'], arrival_ids=['CDG'], outbound_date_start='2025-03-01', outbound_date_end=end.isoformat(),
+        trip_length_days=3,
+    )
+    assert response['error'].startswith(f"{MAX_BATCH_SEARCHES + 1} searches requested but at most {MAX_BATCH_SEARCHES}")
+    assert not searched
@@ -0,0 +1,34 @@
+import pytest
+
+from shared.currency import parse_amount
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('$0.125', (0.125, 'USD')),
+    ('1.005', (1.005, None)),
+    ('0,125', (0.125, None)),
+    ('$1,234', (1234.0, 'USD')),
+    ('$1,234.50', (1234.5, 'USD')),
+    ('1.234,50 €', (1234.5, 'EUR')),
+    ('€1.234.567', (1234567.0, 'EUR')),
+    ('1234.567', (1234.567, None)),
+    ('12.345', (12.345, None)),
+    ("CHF 1'234", (1234.0, 'CHF')),
+    ('12 345 zł', (12345.0, 'PLN')),
+    ('Rp 15.000', (15000.0, 'IDR')),
+    ('¥1,500', (1500.0, 'JPY')),
+    ('-3.5', (-3.5, None)),
+    ('n/a', (None, None)),
+])
+def test_parse_amount(text, expected):
+    assert parse_amount(text) == expected
+
+
+def test_whole_unit_default_currency_groups_a_lone_dot():
+    assert parse_amount('15.000', default_currency='IDR') == (15000.0, 'IDR')
+    assert parse_amount('15.000', default_currency='USD') == (15.0, 'USD')
+
+
+def test_numbers_pass_through():
+    assert parse_amount(190.12, default_currency='USD') == (190.12, 'USD')
+    assert parse_amount(None) == (None, None)
@@ -0,0 +1,27 @@
+import pytest
+
+from locations import LocationError, _edit_distance, resolve_airports
+
+
+@pytest.mark.parametrize('a, b, limit, expected', [
+    ('paris', 'paris', 1, 0),
+    ('parsi', 'paris', 1, 1),
+    ('aprsi', 'paris', 2, 2),
+    ('pari', 'paris', 1, 1),
+    ('parix', 'paris', 1, 1),
+    ('prais', 'paris', 1, 1),
+    ('sirap', 'paris', 2, None),
+    ('london', 'paris', 2, None),
+])
+def test_edit_distance_counts_a_transposition_as_one_edit(a, b, limit, expected):
+    assert _edit_distance(a, b, limit) == expected
+
+
+@pytest.mark.parametrize('typo, name', [('Parsi', 'Paris'), ('Lodnon', 'London'), ('Rmoe', 'Rome'), ('Toyko', 'Tokyo')])
+def test_transposed_city_names_resolve(typo, name):
+    assert resolve_airports(typo) == resolve_airports(name)
+
+
+def test_unknown_names_are_reported():
+    with pytest.raises(LocationError):
+        resolve_airports('Qwxzv')
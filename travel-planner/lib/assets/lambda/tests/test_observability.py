@@ -0,0 +1,73 @@
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from shared.observability import log_metrics, metrics, record_cache, submit
+
+
+def _flushed(capsys) -> dict:
+    lines = [line for line in capsys.readouterr().out.splitlines() if '"_aws"' in line]
+    assert len(lines) == 1
+    return json.loads(lines[0])
+
+
+def test_metrics_from_submitted_workers_are_flushed_with_the_invocation(capsys):
+    executor = ThreadPoolExecutor(max_workers=4)
+
+    @log_metrics
+    def handler(event, context):
+        metrics.add_dimension(name="route", value="/test")
+        record_cache('quote_cache', 'miss')
+        for future in [submit(executor, record_cache, 'quote_cache', 'hit') for _ in range(3)]:
+            future.result()
+        return {}
+
+    handler({}, None)
+    flushed = _flushed(capsys)
+    assert flushed['quote_cache_hit'] == [1.0, 1.0, 1.0]
+    assert flushed['quote_cache_miss'] == [1.0]
+
+
+def test_metrics_recorded_after_the_invocation_are_dropped(capsys):
+    executor = ThreadPoolExecutor(max_workers=1)
+    release = threading.Event()
+    straggler = []
+
+    def late():
+        release.wait()
+        record_cache('late', 'hit')
+
+    @log_metrics
+    def first(event, context):
+        metrics.add_dimension(name="route", value="/first")
+        record_cache('first', 'hit')
+        straggler.append(submit(executor, late))
+        return {}
+
+    @log_metrics
+    def second(event, context):
+        metrics.add_dimension(name="route", value="/second")
+        release.set()
+        straggler[0].result()
+        record_cache('second', 'hit')
+        return {}
+
+    first({}, None)
+    assert 'late_hit' not in _flushed(capsys)
+    second({}, None)
+    flushed = _flushed(capsys)
+    assert flushed['route'] == '/second'
+    assert 'second_hit' in flushed and 'late_hit' not in flushed
+
+
+def test_metrics_outside_an_invocation_are_dropped(capsys):
+    record_cache('orphan', 'hit')
+
+    @log_metrics
+    def handler(event, context):
+        metrics.add_dimension(name="route", value="/test")
+        record_cache('inside', 'hit')
+        return {}
+
+    handler({}, None)
+    assert 'orphan_hit' not in _flushed(capsys)
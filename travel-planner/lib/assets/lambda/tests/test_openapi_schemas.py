@@ -0,0 +1,57 @@
+import importlib.util
+import json
+import os
+
+import pytest
+
+GENERATOR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'api-schema', 'generate_openapi_schemas.py')
+
+# Operations the Bedrock action groups call, by schema file; changing one changes what the agent can do
+EXPECTED_OPERATIONS = {
+    'travel_schema.json': {
+        '/get_flights': ('get_flights_get_flights_get', {'departure_id', 'arrival_id', 'outbound_date', 'return_date'}),
+        '/resolve_location': ('resolve_location_resolve_location_get', {'query'}),
+        '/search_flights_batch': ('search_flights_batch_search_flights_batch_get', {'departure_ids', 'arrival_ids', 'outbound_date_start', 'outbound_date_end'}),
+        '/get_hotels': ('get_hotels_get_hotels_get', {'q', 'check_in_date', 'check_out_date'}),
+        '/plan_trip_cost': ('plan_trip_cost_plan_trip_cost_get', {'departure_id', 'arrival_id', 'outbound_date', 'return_date', 'hotel_location'}),
+    },
+    'portfolio_schema.json': {
+        '/check_portfolio': ('check_portfolio_check_portfolio_get', set()),
+        '/calculate_shares_to_sell': ('calculate_shares_to_sell_calculate_shares_to_sell_get', {'target_amount'}),
+        '/simulate_affordability': ('simulate_affordability_simulate_affordability_get', {'travel_budget', 'travel_date'}),
+    },
+}
+
+
+@pytest.fixture(scope='module')
+def schemas(tmp_path_factory):
+    spec = importlib.util.spec_from_file_location('generate_openapi_schemas', GENERATOR)
+    generator = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(generator)
+    output = tmp_path_factory.mktemp('api-schema')
+    generator.generate(str(output))
+    return {name: json.loads((output / name).read_text()) for name in generator.ACTION_GROUPS}
+
+
+def test_a_schema_per_action_group(schemas):
+    assert set(schemas) == set(EXPECTED_OPERATIONS)
+
+
+@pytest.mark.parametrize('name', sorted(EXPECTED_OPERATIONS))
+def test_schema_matches_the_routes(schemas, name):
+    schema = schemas[name]
+    # Bedrock agents accept OpenAPI 3.0 schemas
+    assert schema['openapi'].startswith('3.0')
+    assert schema['info']['title']
+
+    operations = {
+        path: (operation['operationId'], {parameter['name'] for parameter in operation.get('parameters', []) if parameter.get('required')})
+        for path, methods in schema['paths'].items()
+        for method, operation in methods.items()
+    }
+    assert operations == EXPECTED_OPERATIONS[name]
+    for path, methods in schema['paths'].items():
+        assert list(methods) == ['get'], path
+        # The agent picks operations and fills parameters from their descriptions
+        assert methods['get']['description'], path
+        assert all(parameter.get('description') for parameter in methods['get'].get('parameters', [])), path
@@ -0,0 +1,116 @@
+import json
+import math
+
+import pytest
+
+import portfolio_routes
+from shared import portfolio_model
+from shared.portfolio_model import Portfolio, PortfolioError, load_portfolio, share_count
+
+
+def test_holdings_in_every_form():
+    portfolio = Portfolio.from_mapping({
+        ' AAPL ': 10,
+        'MSFT': {'quantity': 2.5, 'cost_basis': 300},
+        'GOOG': {'lots': [{'quantity': 3, 'cost_basis': 100}, {'quantity': 4}]},
+    })
+    assert portfolio.symbols == ['AAPL', 'MSFT', 'GOOG']
+    assert list(portfolio.items()) == [('AAPL', 10.0), ('MSFT', 2.5), ('GOOG', 7.0)]
+    assert list(portfolio.lot_positions) == [0, 1, 2, 2]
+    assert list(portfolio.lot_quantities) == [10, 2.5, 3, 4]
+    assert math.isnan(portfolio.lot_cost_basis[0]) and portfolio.lot_cost_basis[2] == 100
+    assert 'GOOG' in portfolio and 'IBM' not in portfolio
+    assert portfolio.quantity('MSFT') == 2.5
+    prices = portfolio.price_vector({'AAPL': 190.0, 'GOOG': 150.0})
+    assert prices[0] == 190.0 and math.isnan(prices[1])
+
+
+@pytest.mark.parametrize('data, problem', [
+    ([['AAPL', 10]], 'must be a JSON object'),
+    ({'AAPL': -1}, 'AAPL: quantity must be a non-negative number, got -1'),
+    ({'AAPL': '10'}, "AAPL: quantity must be a non-negative number, got '10'"),
+    ({'AAPL': True}, 'AAPL: quantity must be a non-negative number, got True'),
+    ({'AAPL': float('inf')}, 'AAPL: quantity must be a non-negative number, got inf'),
+    ({'AAPL': None}, 'AAPL: quantity must be a non-negative number, got None'),
+    ({'AAPL': {'quantity': 1, 'cost_basis': -5}}, 'AAPL: cost_basis must be a non-negative number, got -5'),
+    ({'AAPL': {'cost_basis': 5}}, 'AAPL: quantity must be a non-negative number, got None'),
+    ({'AAPL': {'lots': []}}, 'AAPL: lots must be a non-empty list'),
+    ({'AAPL': {'lots': {'quantity': 1}}}, 'AAPL: lots must be a non-empty list'),
+    ({'AAPL': {'lots': [{'quantity': 1}, 'x']}}, "AAPL: quantity must be a non-negative number, got 'x'"),
+    ({' ': 1}, "invalid symbol ' '"),
+    ({'AAPL': 1, ' AAPL': 2}, 'duplicate symbol AAPL'),
+])
+def test_invalid_portfolios_are_rejected(data, problem):
+    with pytest.raises(PortfolioError) as error:
+        Portfolio.from_mapping(data)
+    assert problem in str(error.value)
+
+
+def test_every_problem_is_reported_at_once():
+    with pytest.raises(PortfolioError) as error:
+        Portfolio.from_mapping({'AAPL': -1, 'MSFT': 5, 'GOOG': 'x'})
+    assert str(error.value).count(';') == 1
+
+
+def test_share_count():
+    assert share_count(10.0) == 10 and isinstance(share_count(10.0), int)
+    assert share_count(2.5) == 2.5
+
+
+@pytest.fixture
+def sources(monkeypatch, tmp_path):
+    """Clears every portfolio source and the loaded portfolio; returns a path for a portfolio file."""
+    for name in ('STOCK_PORTFOLIO_S3_URI', 'STOCK_PORTFOLIO_FILE', 'STOCK_PORTFOLIO'):
+        monkeypatch.delenv(name, raising=False)
+    load_portfolio.cache_clear()
+    yield tmp_path / 'portfolio.json'
+    load_portfolio.cache_clear()
+
+
+def test_sources_in_order_of_precedence(sources, monkeypatch):
+    assert len(load_portfolio()) == 0
+
+    monkeypatch.setenv('STOCK_PORTFOLIO', '{"ENV": 1}')
+    load_portfolio.cache_clear()
+    assert load_portfolio().symbols == ['ENV']
+
+    sources.write_text('{"FILE": 1}')
+    monkeypatch.setenv('STOCK_PORTFOLIO_FILE', str(sources))
+    load_portfolio.cache_clear()
+    assert load_portfolio().symbols == ['FILE']
+
+    read = []
+    monkeypatch.setattr(portfolio_model, '_read_s3', lambda uri: read.append(uri) or '{"S3": 1}')
+    monkeypatch.setenv('STOCK_PORTFOLIO_S3_URI', 's3://bucket/portfolio.json')
+    load_portfolio.cache_clear()
+    assert load_portfolio().symbols == ['S3']
+    assert read == ['s3://bucket/portfolio.json']
+
+
+def test_portfolio_is_loaded_once(sources, monkeypatch):
+    monkeypatch.setenv('STOCK_PORTFOLIO', '{"AAPL": 1}')
+    first = load_portfolio()
+    monkeypatch.setenv('STOCK_PORTFOLIO', '{"MSFT": 1}')
+    assert load_portfolio() is first
+
+
+def test_failures_are_reported_and_not_cached(sources, monkeypatch):
+    monkeypatch.setenv('STOCK_PORTFOLIO_FILE', str(sources))
+    with pytest.raises(PortfolioError, match='Could not read portfolio'):
+        load_portfolio()
+
+    sources.write_text('{"AAPL": ')
+    with pytest.raises(PortfolioError, match='is not valid JSON'):
+        load_portfolio()
+
+    sources.write_text('{"AAPL": 3}')
+    assert load_portfolio().symbols == ['AAPL']
+
+
+def test_routes_report_whole_quantities_as_integers(monkeypatch):
+    monkeypatch.setattr(portfolio_routes, 'load_portfolio', lambda: Portfolio.from_mapping({'AAPL': 10, 'MSFT': 2.5}))
+    monkeypatch.setattr(portfolio_routes, 'prices_in_currency', lambda symbols, currency: ({'AAPL': 100.0, 'MSFT': 40.0}, {'AAPL': 1.0, 'MSFT': 1.0}, {}))
+
+    body = json.loads(portfolio_routes.check_portfolio()['body'])
+    assert body['stocks']['AAPL']['quantity'] == 10 and isinstance(body['stocks']['AAPL']['quantity'], int)
+    assert body['stocks']['MSFT']['quantity'] == 2.5
@@ -0,0 +1,151 @@
+import io
+import time
+
+import pytest
+
+from shared import price_snapshot, pricing
+from shared.price_snapshot import (
+    FORMAT_VERSION,
+    HEADER,
+    MAGIC,
+    SYMBOL_BYTES,
+    PriceSnapshot,
+    SnapshotError,
+    encode_snapshot,
+    publish_snapshot,
+)
+
+PRICES = {f"SYM{i:03d}": float(i) + 0.5 for i in range(0, 200, 3)}
+PRICES.update({'AAPL': 190.25, 'BRK.B:NYSE': 410.0, 'ÆØÅ:OSL': 12.5})
+
+
+def _write(tmp_path, data: bytes, name: str = 'snapshot.bin') -> str:
+    path = tmp_path / name
+    path.write_bytes(data)
+    return str(path)
+
+
+def test_snapshot_round_trips_through_the_mapping(tmp_path):
+    snapshot = PriceSnapshot(_write(tmp_path, encode_snapshot(PRICES, 1000.0)))
+    assert (snapshot.count, snapshot.created_at) == (len(PRICES), 1000.0)
+    assert all(snapshot.get(symbol) == price for symbol, price in PRICES.items())
+
+
+@pytest.mark.parametrize('symbol', ['', 'A', 'SYM001', 'SYM0000', 'SYM199', 'ZZZZ', 'aapl', 'AAPL\0'])
+def test_missing_symbols_are_not_found(tmp_path, symbol):
+    snapshot = PriceSnapshot(_write(tmp_path, encode_snapshot(PRICES, 1000.0)))
+    assert snapshot.get(symbol) is None
+
+
+def test_lookup_splits_prices_and_missing(tmp_path):
+    snapshot = PriceSnapshot(_write(tmp_path, encode_snapshot(PRICES, 1000.0)))
+    assert snapshot.lookup(['AAPL', 'MSFT', 'SYM003']) == ({'AAPL': 190.25, 'SYM003': 3.5}, ['MSFT'])
+    empty = PriceSnapshot(_write(tmp_path, encode_snapshot({}, 1000.0), 'empty.bin'))
+    assert empty.lookup(['AAPL']) == ({}, ['AAPL'])
+
+
+def test_symbols_longer_than_a_record_are_rejected():
+    with pytest.raises(SnapshotError, match='longer than'):
+        encode_snapshot({'X' * (SYMBOL_BYTES + 1): 1.0}, 1000.0)
+
+
+def _header(magic=MAGIC, version=FORMAT_VERSION, record_size=price_snapshot.RECORD.size, count=0):
+    return HEADER.pack(magic, version, record_size, count, 1000.0)
+
+
+@pytest.mark.parametrize('data, message', [
+    (b'TPPS', 'too short'),
+    (_header(magic=b'NOPE'), 'not a price snapshot'),
+    (_header(version=FORMAT_VERSION + 1), 'format version'),
+    (_header(record_size=40), 'format version'),
+    (_header(count=2) + bytes(price_snapshot.RECORD.size), 'truncated'),
+    (encode_snapshot({'AAPL': 1.0}, 1000.0) + b'\0', 'truncated'),
+])
+def test_invalid_files_are_rejected(tmp_path, data, message):
+    with pytest.raises(SnapshotError, match=message):
+        PriceSnapshot(_write(tmp_path, data))
+
+
+@pytest.fixture
+def local_snapshot(tmp_path, monkeypatch):
+    """A fresh reader of a snapshot file under ``tmp_path``, with no S3 copy."""
+    path = str(tmp_path / 'price-snapshot.bin')
+    monkeypatch.setattr(price_snapshot, 'SNAPSHOT_PATH', path)
+    monkeypatch.setattr(price_snapshot, 'SNAPSHOT_S3_URI', None)
+    monkeypatch.setattr(price_snapshot, 'MAX_AGE_SECONDS', 600)
+    monkeypatch.setattr(price_snapshot, '_reader', price_snapshot._SnapshotReader())
+    return path
+
+
+def test_current_snapshot_is_fresh_or_none(local_snapshot):
+    assert price_snapshot.current_snapshot() is None
+    publish_snapshot({'AAPL': 190.0})
+    assert price_snapshot.current_snapshot().get('AAPL') == 190.0
+
+    publish_snapshot({'AAPL': 191.0}, created_at=time.time() - 601)
+    assert price_snapshot.current_snapshot() is None
+
+
+def test_replaced_snapshot_is_reopened(local_snapshot):
+    publish_snapshot({'AAPL': 190.0})
+    first = price_snapshot.current_snapshot()
+    assert price_snapshot.current_snapshot() is first
+    publish_snapshot({'AAPL': 191.0, 'MSFT': 400.0})
+    assert price_snapshot.current_snapshot().lookup(['AAPL', 'MSFT']) == ({'AAPL': 191.0, 'MSFT': 400.0}, [])
+    # The old mapping stays readable for anyone still holding it
+    assert first.get('AAPL') == 190.0
+
+
+def test_unreadable_local_snapshot_is_ignored(local_snapshot):
+    with open(local_snapshot, 'wb') as f:
+        f.write(b'garbage that is not a snapshot')
+    assert price_snapshot.current_snapshot() is None
+
+
+def test_disabled_snapshot(local_snapshot, monkeypatch):
+    publish_snapshot({'AAPL': 190.0})
+    monkeypatch.setattr(price_snapshot, 'MAX_AGE_SECONDS', 0)
+    assert price_snapshot.current_snapshot() is None
+
+
+class S3Stub:
+    def __init__(self, data: bytes):
+        self.data = data
+        self.gets = 0
+
+    def get_object(self, Bucket, Key):
+        self.gets += 1
+        assert (Bucket, Key) == ('bucket', 'prices/snapshot.bin')
+        return {'Body': io.BytesIO(self.data)}
+
+
+def test_missing_local_snapshot_is_downloaded_at_most_once_per_check(local_snapshot, monkeypatch):
+    s3 = S3Stub(encode_snapshot({'AAPL': 190.0}, time.time() - 601))
+    monkeypatch.setattr(price_snapshot, 'SNAPSHOT_S3_URI', 's3://bucket/prices/snapshot.bin')
+    monkeypatch.setattr(price_snapshot, '_s3_client', lambda: s3)
+
+    # The published copy is stale too, so the next check waits CHECK_SECONDS
+    assert price_snapshot.current_snapshot() is None
+    assert price_snapshot.current_snapshot() is None
+    assert s3.gets == 1
+
+    s3.data = encode_snapshot({'AAPL': 191.0}, time.time())
+    monkeypatch.setattr(price_snapshot._reader, '_next_download', 0.0)
+    assert price_snapshot.current_snapshot().get('AAPL') == 191.0
+    assert s3.gets == 2
+
+
+def test_prices_fall_back_to_live_quotes(local_snapshot, monkeypatch):
+    fetched = []
+    monkeypatch.setattr(pricing, 'fetch_quotes', lambda symbols: fetched.append(symbols) or ({s: 1.0 for s in symbols}, {}))
+
+    # No snapshot: everything is quoted live
+    assert pricing.current_prices(['AAPL', 'MSFT']) == ({'AAPL': 1.0, 'MSFT': 1.0}, {})
+    # Fresh snapshot: only the symbols missing from it
+    publish_snapshot({'AAPL': 190.0})
+    assert pricing.current_prices(['AAPL', 'MSFT', 'AAPL']) == ({'AAPL': 190.0, 'MSFT': 1.0}, {})
+    assert pricing.current_prices(['AAPL']) == ({'AAPL': 190.0}, {})
+    # Stale snapshot: everything again
+    publish_snapshot({'AAPL': 190.0}, created_at=time.time() - 601)
+    assert pricing.current_prices(['AAPL']) == ({'AAPL': 1.0}, {})
+    assert fetched == [['AAPL', 'MSFT'], ['MSFT'], ['AAPL']]
@@ -0,0 +1,136 @@
+import threading
+import time
+
+import pytest
+
+from shared import pricing
+from shared.quote_cache import QuoteCache
+from shared.scheduler import BACKGROUND, INTERACTIVE
+
+
+class FinanceStub:
+    """Stands in for the scheduler: answers Google Finance searches, holding back the ``slow`` symbols until released."""
+
+    def __init__(self, slow=(), delay: float = 0):
+        self.slow = set(slow)
+        self.delay = delay
+        self.release = threading.Event()
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def search(self, params, priority=INTERACTIVE):
+        symbol = params['q']
+        with self._lock:
+            self.calls.append((symbol, priority))
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.delay)
+            if symbol in self.slow:
+                self.release.wait(5)
+            if symbol.startswith('BAD'):
+                return {'error': f"No quote for {symbol}"}
+            return {'summary': {'extracted_price': float(len(symbol))}}
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = QuoteCache(ttl=60, stale_ttl=300, max_entries=100)
+    monkeypatch.setattr(pricing, 'quote_cache', cache)
+    return cache
+
+
+def _stub(monkeypatch, **kwargs) -> FinanceStub:
+    stub = FinanceStub(**kwargs)
+    monkeypatch.setattr(pricing, 'scheduler', stub)
+    return stub
+
+
+def test_misses_are_fetched_and_cached(cache, monkeypatch):
+    stub = _stub(monkeypatch)
+    prices, errors = pricing.fetch_quotes(['AAPL', 'MSFT', 'AAPL', 'BADX'])
+    assert prices == {'AAPL': 4.0, 'MSFT': 4.0}
+    assert errors == {'BADX': 'No quote for BADX'}
+    assert cache.get('AAPL') == (4.0, False)
+    assert sorted(stub.calls) == [('AAPL', INTERACTIVE), ('BADX', INTERACTIVE), ('MSFT', INTERACTIVE)]
+
+
+def test_fresh_quotes_need_no_upstream_call(cache, monkeypatch):
+    stub = _stub(monkeypatch)
+    cache.set('AAPL', 190.0)
+    assert pricing.fetch_quotes(['AAPL']) == ({'AAPL': 190.0}, {})
+    assert stub.calls == []
+
+
+def test_concurrency_is_bounded(cache, monkeypatch):
+    stub = _stub(monkeypatch, delay=0.05)
+    symbols = [f"S{i}" for i in range(10)]
+    prices, errors = pricing.fetch_quotes(symbols, max_workers=3)
+    assert set(prices) == set(symbols) and not errors
+    assert stub.max_active == 3
+
+
+def test_deadline_returns_partial_results(cache, monkeypatch):
+    stub = _stub(monkeypatch, slow={'SLOW'})
+    try:
+        prices, errors = pricing.fetch_quotes(['AAPL', 'SLOW'], deadline=0.2)
+    finally:
+        stub.release.set()
+    assert prices == {'AAPL': 4.0}
+    assert errors == {'SLOW': 'Timed out after 0.2s'}
+
+
+def test_stragglers_are_cached_for_the_next_call(cache, monkeypatch):
+    stub = _stub(monkeypatch, slow={'SLOW'})
+    pricing.fetch_quotes(['SLOW'], deadline=0.1)
+    stub.release.set()
+    deadline = time.monotonic() + 2
+    while cache.get('SLOW')[0] is None:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    assert pricing.fetch_quotes(['SLOW']) == ({'SLOW': 4.0}, {})
+    assert len(stub.calls) == 1
+
+
+def test_stale_quotes_are_served_and_refreshed_in_the_background(cache, monkeypatch):
+    stub = _stub(monkeypatch, slow={'AAPL'})
+    cache.set('AAPL', 190.0, fetched_at=time.time() - 120)
+
+    start = time.monotonic()
+    assert pricing.fetch_quotes(['AAPL']) == ({'AAPL': 190.0}, {})
+    # A second caller while the refresh runs does not start another
+    assert pricing.fetch_quotes(['AAPL']) == ({'AAPL': 190.0}, {})
+    assert time.monotonic() - start < 1
+    stub.release.set()
+
+    deadline = time.monotonic() + 2
+    while cache.get('AAPL') != (4.0, False):
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    assert stub.calls == [('AAPL', BACKGROUND)]
+    assert not pricing._revalidating
+
+
+def test_failed_background_refresh_keeps_the_stale_quote(cache, monkeypatch):
+    stub = _stub(monkeypatch)
+    cache.set('BADX', 5.0, fetched_at=time.time() - 120)
+    assert pricing.fetch_quotes(['BADX']) == ({'BADX': 5.0}, {})
+
+    deadline = time.monotonic() + 2
+    while pricing._revalidating:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    assert stub.calls == [('BADX', BACKGROUND)]
+    assert cache.get('BADX') == (5.0, True)
+
+
+def test_refresh_quotes_ignores_the_cache(cache, monkeypatch):
+    stub = _stub(monkeypatch)
+    cache.set('AAPL', 190.0)
+    assert pricing.refresh_quotes(['AAPL']) == ({'AAPL': 4.0}, {})
+    assert stub.calls == [('AAPL', BACKGROUND)]
@@ -0,0 +1,109 @@
+import json
+import time
+
+import pytest
+
+from shared.quote_cache import QuoteCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, 'time', lambda: now[0])
+    return now
+
+
+def test_entries_go_stale_after_the_ttl_then_expire(clock):
+    cache = QuoteCache(ttl=60, stale_ttl=300, max_entries=10)
+    cache.set('AAPL', 190.0)
+    assert cache.get('AAPL') == (190.0, False)
+
+    clock[0] += 60
+    assert cache.get('AAPL') == (190.0, False)
+    clock[0] += 1
+    assert cache.get('AAPL') == (190.0, True)
+
+    clock[0] += 299
+    assert cache.get('AAPL') == (190.0, True)
+    clock[0] += 1
+    assert cache.get('AAPL') == (None, False)
+    # Expired entries are dropped
+    clock[0] -= 300
+    assert cache.get('AAPL') == (None, False)
+
+
+def test_set_refreshes_an_entry(clock):
+    cache = QuoteCache(ttl=60, stale_ttl=300, max_entries=10)
+    cache.set('AAPL', 190.0)
+    clock[0] += 100
+    cache.set('AAPL', 191.0)
+    assert cache.get('AAPL') == (191.0, False)
+    cache.set('MSFT', 400.0, fetched_at=clock[0] - 90)
+    assert cache.get('MSFT') == (400.0, True)
+
+
+def test_least_recently_used_entries_are_evicted(clock):
+    cache = QuoteCache(ttl=60, stale_ttl=300, max_entries=2)
+    cache.set('AAPL', 1.0)
+    cache.set('MSFT', 2.0)
+    # Reading AAPL makes MSFT the least recently used
+    cache.get('AAPL')
+    cache.set('GOOG', 3.0)
+    assert cache.get('MSFT') == (None, False)
+    assert cache.get('AAPL') == (1.0, False)
+    assert cache.get('GOOG') == (3.0, False)
+
+    cache.clear()
+    assert cache.get('AAPL') == (None, False)
+
+
+def test_cache_round_trips_through_its_file(clock, tmp_path):
+    path = str(tmp_path / 'quotes.json')
+    cache = QuoteCache(ttl=60, stale_ttl=300, max_entries=10, path=path)
+    cache.set('OLD', 1.0, fetched_at=clock[0] - 120)
+    cache.set('AAPL', 190.0)
+    cache.set('EXPIRED', 3.0, fetched_at=clock[0] - 400)
+    cache.save()
+    assert json.loads((tmp_path / 'quotes.json').read_text())['AAPL'] == [190.0, clock[0]]
+
+    loaded = QuoteCache(ttl=60, stale_ttl=300, max_entries=10, path=path)
+    assert loaded.get('AAPL') == (190.0, False)
+    assert loaded.get('OLD') == (1.0, True)
+    assert loaded.get('EXPIRED') == (None, False)
+
+
+def test_loading_keeps_the_most_recent_entries(clock, tmp_path):
+    path = str(tmp_path / 'quotes.json')
+    (tmp_path / 'quotes.json').write_text(json.dumps({
+        'NEW': [1.0, clock[0]], 'OLDEST': [2.0, clock[0] - 30], 'MIDDLE': [3.0, clock[0] - 10],
+    }))
+    cache = QuoteCache(ttl=60, stale_ttl=300, max_entries=2, path=path)
+    assert cache.get('OLDEST') == (None, False)
+    assert cache.get('NEW') == (1.0, False) and cache.get('MIDDLE') == (3.0, False)
+
+
+def test_save_only_writes_changes(clock, tmp_path):
+    path = tmp_path / 'quotes.json'
+    cache = QuoteCache(ttl=60, stale_ttl=300, max_entries=10, path=str(path))
+    cache.save()
+    assert not path.exists()
+    cache.set('AAPL', 190.0)
+    cache.save()
+    path.write_text('{}')
+    cache.save()
+    assert path.read_text() == '{}'
+
+
+@pytest.mark.parametrize('content', ['not json', '[1, 2]', '{"AAPL": [1.0]}', '{"AAPL": ["x", 1]}'])
+def test_unreadable_files_are_ignored(clock, tmp_path, content):
+    path = tmp_path / 'quotes.json'
+    path.write_text(content)
+    cache = QuoteCache(ttl=60, stale_ttl=300, max_entries=10, path=str(path))
+    assert cache.get('AAPL') == (None, False)
+
+
+def test_unwritable_path_is_not_fatal(clock, tmp_path):
+    cache = QuoteCache(ttl=60, stale_ttl=300, max_entries=10, path=str(tmp_path / 'missing' / 'quotes.json'))
+    cache.set('AAPL', 190.0)
+    cache.save()
+    assert cache.get('AAPL') == (190.0, False)
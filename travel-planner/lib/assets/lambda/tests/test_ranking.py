@@ -0,0 +1,135 @@
+import pytest
+
+import ranking
+from ranking import MAX_HOTEL_PAGES, MAX_RESULTS, clamp_results, parse_time_window, rank_flights, rank_hotels
+from results import FlightOption
+
+
+def _flight(price, duration=600, stops=0, departs='2025-03-07 09:00'):
+    legs = [{'airline': 'A', 'departure_airport': {'id': 'AUS', 'time': departs}}] * (stops + 1)
+    return FlightOption({'price': price, 'total_duration': duration, 'flights': legs})
+
+
+FLIGHTS = [
+    _flight(500, duration=900, stops=2, departs='2025-03-07 06:30'),
+    _flight(300, duration=1200, stops=1, departs='2025-03-07 13:00'),
+    _flight(None, duration=300),
+    _flight(700, duration=400, departs='2025-03-07 19:45'),
+    _flight(300, duration=500, departs='2025-03-07 08:00'),
+]
+
+
+def _prices(options):
+    return [(option.price, option.total_duration) for option in options]
+
+
+def test_flights_by_price_keep_serpapi_order_on_ties():
+    assert _prices(rank_flights(FLIGHTS, 3)) == [(300, 1200), (300, 500), (500, 900)]
+
+
+def test_flights_by_duration_and_value(monkeypatch):
+    assert _prices(rank_flights(FLIGHTS, 2, 'duration')) == [(700, 400), (300, 500)]
+    monkeypatch.setattr(ranking, 'VALUE_OF_TIME_PER_HOUR', 60)
+    # Price plus a unit of the search currency per minute
+    assert _prices(rank_flights(FLIGHTS, 4, 'value')) == [(300, 500), (700, 400), (500, 900), (300, 1200)]
+
+
+def test_flight_filters():
+    assert _prices(rank_flights(FLIGHTS, 10, max_price=400)) == [(300, 1200), (300, 500)]
+    assert _prices(rank_flights(FLIGHTS, 10, max_stops=0)) == [(300, 500), (700, 400)]
+    assert _prices(rank_flights(FLIGHTS, 10, departure_window=parse_time_window('morning'))) == [(300, 500), (500, 900)]
+    assert _prices(rank_flights(FLIGHTS, 10, departure_window=parse_time_window('18-24'))) == [(700, 400)]
+    assert rank_flights(FLIGHTS, 10, max_price=100) == []
+
+
+def test_unpriced_flights_never_qualify():
+    assert None not in [option.price for option in rank_flights(FLIGHTS, 10, 'duration')]
+
+
+@pytest.mark.parametrize('value', ['noon', '11-06', '06-25'])
+def test_invalid_time_windows(value):
+    with pytest.raises(ValueError, match='Invalid departure time'):
+        parse_time_window(value)
+
+
+def test_unknown_sorts_are_rejected():
+    with pytest.raises(ValueError, match="Unknown sort_by"):
+        rank_flights(FLIGHTS, 3, 'cheapest')
+    with pytest.raises(ValueError, match="Unknown sort_by"):
+        rank_hotels(lambda token: {}, 3, 'cheapest')
+
+
+class Pages:
+    """Stands in for Google Hotels: serves ``pages`` in order and records the tokens asked for."""
+
+    def __init__(self, *pages):
+        self.pages = pages
+        self.tokens = []
+
+    def __call__(self, token):
+        self.tokens.append(token)
+        page = dict(self.pages[len(self.tokens) - 1])
+        if len(self.tokens) < len(self.pages):
+            page['serpapi_pagination'] = {'next_page_token': f"page{len(self.tokens) + 1}"}
+        return page
+
+
+def _hotel(name, rate, rating=None, amenities=()):
+    return {'name': name, 'rate_per_night': {'extracted_lowest': rate}, 'overall_rating': rating, 'amenities': list(amenities)}
+
+
+def _names(options):
+    return [option.name for option in options]
+
+
+def test_hotel_pages_are_only_fetched_while_too_few_qualify():
+    pages = Pages({'properties': [_hotel('a', 100), _hotel('b', 80)]}, {'properties': [_hotel('c', 90)]})
+    ranked, error = rank_hotels(pages, 2)
+    assert (_names(ranked), error) == (['b', 'a'], None)
+    assert pages.tokens == [None]
+
+    pages = Pages({'properties': [_hotel('a', 100), _hotel('b', 80)]}, {'properties': [_hotel('c', 90)]})
+    ranked, _ = rank_hotels(pages, 2, max_price=95)
+    assert _names(ranked) == ['b', 'c']
+    assert pages.tokens == [None, 'page2']
+
+
+def test_hotel_paging_stops_at_max_pages():
+    pages = Pages(*({'properties': [_hotel(str(i), 100 + i)]} for i in range(MAX_HOTEL_PAGES + 2)))
+    ranked, _ = rank_hotels(pages, 10)
+    assert len(pages.tokens) == MAX_HOTEL_PAGES
+    assert _names(ranked) == [str(i) for i in range(MAX_HOTEL_PAGES)]
+
+    pages = Pages(*({'properties': [_hotel(str(i), 100 + i)]} for i in range(4)))
+    rank_hotels(pages, 10, max_pages=2)
+    assert pages.tokens == [None, 'page2']
+
+
+def test_hotel_page_errors():
+    assert rank_hotels(Pages({'error': 'Google Hotels hasn\'t returned any results'}), 3) == ([], "Google Hotels hasn't returned any results")
+    # A later failing page only ends the scan
+    ranked, error = rank_hotels(Pages({'properties': [_hotel('a', 100)]}, {'error': 'boom'}, {'properties': [_hotel('c', 50)]}), 3)
+    assert (_names(ranked), error) == (['a'], None)
+
+
+def test_hotel_filters_and_sorts():
+    page = {'properties': [
+        _hotel('cheap', 60, 3.0, ['Free Wi-Fi']),
+        _hotel('unrated', 50, None, ['Pool']),
+        _hotel('good', 150, 4.8, ['Outdoor pool', 'Free breakfast']),
+        _hotel('fine', 120, 4.0, ['Pool']),
+        {'name': 'unpriced', 'overall_rating': 5.0},
+    ]}
+    assert _names(rank_hotels(Pages(page), 10)[0]) == ['unrated', 'cheap', 'fine', 'good']
+    assert _names(rank_hotels(Pages(page), 10, 'rating')[0]) == ['good', 'fine', 'cheap', 'unrated']
+    assert _names(rank_hotels(Pages(page), 10, 'value')[0]) == ['cheap', 'fine', 'good', 'unrated']
+    assert _names(rank_hotels(Pages(page), 10, min_rating=4)[0]) == ['fine', 'good']
+    assert _names(rank_hotels(Pages(page), 10, max_price=100)[0]) == ['unrated', 'cheap']
+    assert _names(rank_hotels(Pages(page), 10, amenities=[' POOL ', ''])[0]) == ['unrated', 'fine', 'good']
+    assert _names(rank_hotels(Pages(page), 1, amenities=['pool', 'breakfast'])[0]) == ['good']
+
+
+def test_clamp_results():
+    assert clamp_results(0) == 1
+    assert clamp_results(3) == 3
+    assert clamp_results(MAX_RESULTS + 5) == MAX_RESULTS
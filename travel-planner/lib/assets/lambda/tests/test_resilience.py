@@ -0,0 +1,208 @@
+import threading
+import time
+
+import pytest
+
+from shared.resilience import (
+    BREAKER_COOLDOWN_SECONDS,
+    BREAKER_FAILURES,
+    CLOSED,
+    HALF_OPEN,
+    LATENCY_MIN_SAMPLES,
+    OPEN,
+    UNAVAILABLE,
+    EngineHealth,
+    ResilientSearch,
+    is_outage,
+)
+
+
+class SlowClient:
+    """Stands in for SerpApiClient: the first ``slow`` calls take ``delay`` seconds, the rest answer at once.
+
+    With ``retry`` set, each call fails once and asks ``allow_retry`` before retrying.
+    """
+
+    timeout = 30
+
+    def __init__(self, delay: float = 0.2, slow: int = 1, retry: bool = False):
+        self.delay = delay
+        self.slow = slow
+        self.retry = retry
+        self.calls = 0
+        self.retry_answers = []
+        self._lock = threading.Lock()
+
+    def request(self, params, timeout=None, allow_retry=None):
+        with self._lock:
+            self.calls += 1
+            call = self.calls
+        if self.retry and allow_retry is not None:
+            self.retry_answers.append(allow_retry())
+        if call <= self.slow:
+            time.sleep(self.delay)
+        return {'call': call}, None
+
+
+def _warm(search: ResilientSearch, engine: str = 'google_hotels', latency: float = 0.01) -> None:
+    # Enough fast calls that the hedge delay is known
+    for _ in range(LATENCY_MIN_SAMPLES):
+        search.health(engine).record(latency, outage=False)
+
+
+def test_slow_call_is_hedged_and_the_hedge_wins():
+    client = SlowClient()
+    search = ResilientSearch(client, max_workers=4)
+    _warm(search)
+    assert search.search({'engine': 'google_hotels'}) == {'call': 2}
+    assert client.calls == 2
+
+
+def test_no_hedge_without_quota():
+    client = SlowClient()
+    search = ResilientSearch(client, max_workers=4)
+    _warm(search)
+    spent = []
+    search.spend = lambda engine: spent.append(engine) or False
+    assert search.search({'engine': 'google_hotels'}) == {'call': 1}
+    assert client.calls == 1
+    assert spent == ['google_hotels']
+
+
+def test_retries_ask_for_quota():
+    client = SlowClient(slow=0, retry=True)
+    search = ResilientSearch(client, max_workers=4)
+    search.spend = lambda engine: False
+    search.search({'engine': 'google_hotels'})
+    assert client.retry_answers == [False]
+
+
+def test_no_hedge_while_every_worker_is_busy():
+    client = SlowClient(delay=0.3, slow=2)
+    search = ResilientSearch(client, max_workers=1)
+    _warm(search)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(search.search({'engine': 'google_hotels'}))) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+        time.sleep(0.05)
+    for thread in threads:
+        thread.join()
+    # One call ran on the only worker, the other on its caller's thread; neither was duplicated
+    assert client.calls == 2
+    assert sorted(result['call'] for result in results) == [1, 2]
+
+
+class FailingClient:
+    """Stands in for SerpApiClient: every call fails with ``error_class``."""
+
+    timeout = 30
+
+    def __init__(self, error_class: str = 'HTTP503'):
+        self.error_class = error_class
+        self.calls = 0
+
+    def request(self, params, timeout=None, allow_retry=None):
+        self.calls += 1
+        return {'error': self.error_class}, self.error_class
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, 'time', lambda: now[0])
+    return now
+
+
+def _open(health: EngineHealth) -> None:
+    for _ in range(BREAKER_FAILURES):
+        health.record(0.01, outage=True)
+
+
+@pytest.mark.parametrize('error_class, outage', [
+    (None, False), ('SerpApiError', False), ('HTTP400', False), ('HTTP404', False),
+    ('HTTP429', True), ('HTTP500', True), ('HTTP503', True), ('Timeout', True), ('ConnectionError', True),
+])
+def test_is_outage(error_class, outage):
+    assert is_outage(error_class) is outage
+
+
+def test_breaker_opens_after_consecutive_outages(clock):
+    health = EngineHealth()
+    for _ in range(BREAKER_FAILURES - 1):
+        assert not health.record(0.01, outage=True)
+    assert health.state == CLOSED and health.admit() is None
+    assert health.record(0.01, outage=True)
+    assert health.state == OPEN
+    assert health.admit() == pytest.approx(BREAKER_COOLDOWN_SECONDS)
+    assert health.retry_after() == pytest.approx(BREAKER_COOLDOWN_SECONDS)
+
+
+def test_success_resets_the_failure_count(clock):
+    health = EngineHealth()
+    for _ in range(BREAKER_FAILURES - 1):
+        health.record(0.01, outage=True)
+    health.record(0.01, outage=False)
+    for _ in range(BREAKER_FAILURES - 1):
+        assert not health.record(0.01, outage=True)
+    assert health.state == CLOSED
+
+
+def test_breaker_rejects_until_the_cooldown_then_lets_one_probe_through(clock):
+    health = EngineHealth()
+    _open(health)
+    clock[0] += BREAKER_COOLDOWN_SECONDS - 1
+    assert health.admit() == pytest.approx(1)
+
+    clock[0] += 1
+    assert health.admit() is None
+    assert health.state == HALF_OPEN
+    # Others wait for the probe's outcome
+    assert health.admit() == pytest.approx(BREAKER_COOLDOWN_SECONDS)
+
+
+def test_successful_probe_closes_the_breaker(clock):
+    health = EngineHealth()
+    _open(health)
+    clock[0] += BREAKER_COOLDOWN_SECONDS
+    assert health.admit() is None
+    assert not health.record(0.01, outage=False)
+    assert health.state == CLOSED
+    assert health.admit() is None and health.retry_after() is None
+
+
+def test_failed_probe_reopens_the_breaker(clock):
+    health = EngineHealth()
+    _open(health)
+    clock[0] += BREAKER_COOLDOWN_SECONDS
+    assert health.admit() is None
+    # A single outage is enough while half-open
+    assert health.record(0.01, outage=True)
+    assert health.state == OPEN
+    assert health.admit() == pytest.approx(BREAKER_COOLDOWN_SECONDS)
+
+
+def test_open_breaker_fails_searches_fast(clock):
+    client = FailingClient()
+    search = ResilientSearch(client, max_workers=4)
+    for _ in range(BREAKER_FAILURES):
+        assert search.admit('google_flights') is None
+        search.search({'engine': 'google_flights'})
+
+    clock[0] += 2.5
+    rejected = search.admit('google_flights')
+    assert rejected['error_type'] == UNAVAILABLE
+    assert rejected['engine'] == 'google_flights'
+    assert rejected['retry_after_seconds'] == BREAKER_COOLDOWN_SECONDS - 2
+    assert search.retry_after('google_flights') == BREAKER_COOLDOWN_SECONDS - 2
+    # Other engines are unaffected
+    assert search.admit('google_hotels') is None
+    assert client.calls == BREAKER_FAILURES
+
+
+def test_request_errors_do_not_open_the_breaker():
+    search = ResilientSearch(FailingClient('HTTP400'), max_workers=4)
+    for _ in range(BREAKER_FAILURES + 1):
+        search.search({'engine': 'google_flights'})
+    assert search.health('google_flights').state == CLOSED
+    assert search.admit('google_flights') is None
@@ -0,0 +1,76 @@
+import glob
+import json
+import os
+
+import ijson
+import pytest
+
+from shared.response_parser import RESPONSE_FIELDS, SelectiveParser
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks', 'fixtures')
+
+
+def project(value, selection):
+    """Reference projection of a decoded document onto a ``RESPONSE_FIELDS`` selection."""
+    if selection is True:
+        return value
+    if isinstance(value, list):
+        return [project(item, selection) for item in value]
+    if isinstance(value, dict):
+        return {key: project(item, selection[key]) for key, item in value.items() if key in selection}
+    return value
+
+
+def parse(body: bytes, selection, chunk_size: int):
+    parser = SelectiveParser(selection)
+    for start in range(0, len(body), chunk_size):
+        parser.feed(body[start:start + chunk_size])
+    return parser.close()
+
+
+FIXTURES = sorted(glob.glob(os.path.join(FIXTURES_DIR, '*', '*.json')))
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 16384])
+@pytest.mark.parametrize('path', FIXTURES, ids=lambda path: os.path.relpath(path, FIXTURES_DIR))
+def test_matches_json_loads_projection(path, chunk_size):
+    engine = os.path.basename(os.path.dirname(path))
+    with open(path, 'rb') as f:
+        body = json.dumps(json.load(f), separators=(',', ':')).encode()
+    assert parse(body, RESPONSE_FIELDS[engine], chunk_size) == project(json.loads(body), RESPONSE_FIELDS[engine])
+
+
+@pytest.mark.parametrize('chunk_size', [1, 3, 64])
+def test_nested_selections_and_skipped_values(chunk_size):
+    selection = {'keep': True, 'items': {'a': True, 'nested': {'x': True}}, 'empty': {'a': True}}
+    document = {
+        'skip': {'deep': [[1, {'k': [2, 3]}], {}], 'text': 'a"b\\u00e9'},
+        'keep': {'whole': [1, 2.5, None, True, 'é']},
+        'items': [{'a': 1, 'b': [1, 2], 'nested': {'x': [{}], 'y': 2}}, {'b': {}}, 'scalar', [{'a': 3, 'c': 4}]],
+        'empty': [],
+        'tail': 'ignored',
+    }
+    body = json.dumps(document, ensure_ascii=False).encode()
+    assert parse(body, selection, chunk_size) == project(document, selection)
+
+
+def test_scalar_values_are_kept_with_their_types():
+    body = b'{"error": null, "price": 12.5, "summary": {"n": 3, "ok": false}}'
+    result = parse(body, {'error': True, 'price': True, 'summary': True}, 5)
+    assert result == {'error': None, 'price': 12.5, 'summary': {'n': 3, 'ok': False}}
+    assert isinstance(result['price'], float)
+
+
+def test_counts_bytes_fed():
+    body = b'{"error": "x"}'
+    parser = SelectiveParser({'error': True})
+    parser.feed(body[:4])
+    parser.feed(body[4:])
+    parser.close()
+    assert parser.bytes == len(body)
+
+
+@pytest.mark.parametrize('body', [b'{"error": ', b'[1, 2]', b'"text"', b'{"a": 1}}'])
+def test_malformed_or_non_object_bodies_raise(body):
+    with pytest.raises(ijson.JSONError):
+        parse(body, {'a': True}, 4)
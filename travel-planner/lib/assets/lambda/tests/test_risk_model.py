@@ -0,0 +1,146 @@
+import threading
+from collections import OrderedDict
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from shared import risk_model
+from shared.risk_model import MIN_OBSERVATIONS, TRADING_DAYS_PER_YEAR, HistoryCache, RiskModel, parse_history
+
+FIRST_DAY = date(2024, 1, 1).toordinal()
+
+
+def _history(closes, first_day: int = FIRST_DAY):
+    days = np.arange(first_day, first_day + len(closes))
+    return days, np.asarray(closes, dtype=float), 0.0
+
+
+def _graph(closes):
+    return [{'date': (date(2024, 1, 1) + timedelta(days=i)).strftime('%b %d %Y, 04:00 PM UTC-05:00'), 'price': price}
+            for i, price in enumerate(closes)]
+
+
+def test_parse_history_keeps_the_last_close_of_each_day():
+    graph = [
+        {'date': 'Jan 03 2024, 10:00 AM UTC-05:00', 'price': 11.0},
+        {'date': 'Jan 02 2024, 04:00 PM UTC-05:00', 'price': 10.0},
+        {'date': 'Jan 03 2024, 04:00 PM UTC-05:00', 'price': 12.0},
+        {'date': 'not a date', 'price': 13.0},
+        {'date': 'Jan 04 2024, 04:00 PM UTC-05:00', 'price': 0},
+        {'date': 'Jan 05 2024, 04:00 PM UTC-05:00', 'price': '14'},
+    ]
+    days, closes = parse_history(graph)
+    assert days.tolist() == [date(2024, 1, 2).toordinal(), date(2024, 1, 3).toordinal()]
+    assert closes.tolist() == [10.0, 12.0]
+    assert [len(part) for part in parse_history(None)] == [0, 0]
+
+
+def test_fit_recovers_volatility_and_correlation():
+    rng = np.random.default_rng(1)
+    common = rng.standard_normal(500) * 0.01
+    noise = rng.standard_normal((500, 2)) * 0.01
+    # A and B move together, C on its own
+    returns = np.column_stack([common + 0.1 * noise[:, 0], common, noise[:, 1]])
+    closes = 100 * np.exp(np.vstack([np.zeros(3), np.cumsum(returns, axis=0)]))
+    model = RiskModel.fit({symbol: _history(closes[:, i]) for i, symbol in enumerate(['A', 'B', 'C'])})
+
+    assert model.symbols == ['A', 'B', 'C'] and model.observations == 500
+    np.testing.assert_allclose(model.volatility, returns.std(axis=0, ddof=1) * np.sqrt(TRADING_DAYS_PER_YEAR), rtol=1e-6)
+    correlation = model.loadings.astype(float) @ model.loadings.T.astype(float) + np.diag(model.residual.astype(float) ** 2)
+    np.testing.assert_allclose(correlation, np.corrcoef(returns.T), atol=1e-4)
+    assert correlation[0, 1] > 0.99 and abs(correlation[0, 2]) < 0.15
+
+
+def test_fit_aligns_histories_and_tolerates_flat_prices():
+    moving = 100 * np.exp(np.cumsum(np.random.default_rng(2).standard_normal(60) * 0.01))
+    # B starts 10 days later; C never moves
+    model = RiskModel.fit({'A': _history(moving), 'B': _history(moving[10:], FIRST_DAY + 10), 'C': _history(np.full(60, 5.0))})
+    assert model.observations == 49
+    assert model.volatility[2] == 0
+    assert np.isfinite(model.loadings).all() and np.isfinite(model.residual).all()
+    assert model.residual[2] == 1
+
+
+def test_single_symbol_model_has_no_factors():
+    model = RiskModel.fit({'A': _history(np.linspace(100, 120, 30))})
+    assert model.loadings.shape == (1, 1) and model.loadings[0, 0] == 0 and model.residual[0] == 1
+
+
+@pytest.mark.parametrize('paths', [1, 7, 10])
+def test_shocks_come_in_antithetic_pairs(paths):
+    model = RiskModel(['A', 'B'], np.array([0.2, 0.3]), np.array([[0.6], [0.6]], dtype=np.float32), np.array([0.8, 0.8], dtype=np.float32), 100)
+    shocks = model.shocks(np.random.default_rng(3), paths)
+    half = (paths + 1) // 2
+    assert shocks.shape == (paths, 2)
+    np.testing.assert_array_equal(shocks[half:], -shocks[:paths - half])
+
+
+def test_shocks_have_the_model_correlation():
+    model = RiskModel(['A', 'B'], np.array([0.2, 0.3]), np.array([[0.6], [0.6]], dtype=np.float32), np.array([0.8, 0.8], dtype=np.float32), 100)
+    shocks = model.shocks(np.random.default_rng(4), 200000).astype(float)
+    np.testing.assert_allclose(shocks.std(axis=0), 1, atol=0.01)
+    assert np.corrcoef(shocks.T)[0, 1] == pytest.approx(0.36, abs=0.01)
+
+
+class FinanceStub:
+    """Stands in for the scheduler: answers chart searches with ``closes``, holding back the ``slow`` symbols."""
+
+    def __init__(self, closes, slow=(), short=()):
+        self.closes = closes
+        self.slow = set(slow)
+        self.short = set(short)
+        self.release = threading.Event()
+        self.calls = []
+
+    def search(self, params, priority):
+        self.calls.append(params['q'])
+        if params['q'] in self.slow:
+            self.release.wait(5)
+        if params['q'].startswith('BAD'):
+            return {'error': 'No chart'}
+        closes = self.closes[:MIN_OBSERVATIONS] if params['q'] in self.short else self.closes
+        return {'graph': _graph(closes)}
+
+
+@pytest.fixture
+def fresh_caches(monkeypatch):
+    monkeypatch.setattr(risk_model, 'history_cache', HistoryCache(ttl=3600, max_entries=100))
+    monkeypatch.setattr(risk_model, '_models', OrderedDict())
+
+
+def _stub(monkeypatch, **kwargs) -> FinanceStub:
+    closes = 100 * np.exp(np.cumsum(np.random.default_rng(5).standard_normal(40) * 0.01))
+    stub = FinanceStub(closes.tolist(), **kwargs)
+    monkeypatch.setattr(risk_model, 'scheduler', stub)
+    return stub
+
+
+def test_histories_are_fetched_once_and_failures_reported(fresh_caches, monkeypatch):
+    stub = _stub(monkeypatch, short={'NEW'})
+    histories, errors = risk_model.fetch_histories(['AAPL', 'BADX', 'NEW', 'AAPL'])
+    assert list(histories) == ['AAPL'] and len(histories['AAPL'][1]) == 40
+    assert errors['BADX'] == 'No chart'
+    assert errors['NEW'].startswith(f"Only {MIN_OBSERVATIONS - 1} daily returns")
+
+    assert risk_model.fetch_histories(['AAPL']) == (histories, {})
+    assert sorted(stub.calls) == ['AAPL', 'BADX', 'NEW']
+
+
+def test_histories_past_the_deadline_are_left_out(fresh_caches, monkeypatch):
+    stub = _stub(monkeypatch, slow={'SLOW'})
+    try:
+        histories, errors = risk_model.fetch_histories(['AAPL', 'SLOW'], deadline=0.2)
+    finally:
+        stub.release.set()
+    assert list(histories) == ['AAPL']
+    assert errors == {'SLOW': 'Timed out after 0.2s'}
+
+
+def test_model_leaves_out_symbols_without_history_and_is_reused(fresh_caches, monkeypatch):
+    _stub(monkeypatch)
+    model, errors = risk_model.risk_model(['MSFT', 'BADX', 'AAPL'])
+    assert model.symbols == ['MSFT', 'AAPL'] and list(errors) == ['BADX']
+    assert risk_model.risk_model(['MSFT', 'AAPL'])[0] is model
+    assert risk_model.risk_model(['BADX']) == (None, {'BADX': 'No chart'})
+
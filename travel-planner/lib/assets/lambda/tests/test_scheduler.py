@@ -0,0 +1,181 @@
+import threading
+import time
+
+import pytest
+
+from shared.scheduler import BACKGROUND, INTERACTIVE, MAX_WAIT_SECONDS, LocalBucketStore, UpstreamScheduler, request_key
+
+
+class Clock:
+    """Stands in for ``time.time`` so bucket refills can be stepped."""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(time, 'time', clock)
+    return clock
+
+
+def test_bucket_spends_the_burst_then_refills_at_the_rate(clock):
+    store = LocalBucketStore()
+    assert store.try_acquire('google_flights', 2, 3) == 0
+    assert store.try_acquire('google_flights', 2, 3) == 0
+    assert store.try_acquire('google_flights', 2, 3) == 0
+    assert store.try_acquire('google_flights', 2, 3) == pytest.approx(0.5)
+
+    clock.now += 0.25
+    assert store.try_acquire('google_flights', 2, 3) == pytest.approx(0.25)
+    clock.now += 0.25
+    assert store.try_acquire('google_flights', 2, 3) == 0
+
+    # Refills stop at the burst
+    clock.now += 60
+    assert [store.try_acquire('google_flights', 2, 3) for _ in range(4)][-1] > 0
+
+
+def test_bucket_leaves_the_reserve_and_keeps_engines_apart(clock):
+    store = LocalBucketStore()
+    assert store.try_acquire('google_hotels', 1, 2, reserve=1) == 0
+    assert store.try_acquire('google_hotels', 1, 2, reserve=1) == pytest.approx(1)
+    # The reserve is still there for a caller without one
+    assert store.try_acquire('google_hotels', 1, 2) == 0
+    assert store.try_acquire('google_flights', 1, 2, reserve=1) == 0
+
+
+def test_request_key_ignores_api_key_and_order():
+    assert request_key({'q': 'Paris', 'engine': 'google_hotels', 'api_key': 'a'}) == request_key({'engine': 'google_hotels', 'q': 'Paris'})
+    assert request_key({'q': 'Paris'}) != request_key({'q': 'Rome'})
+
+
+class BlockingSearch:
+    """Stands in for the upstream search: holds every call until released."""
+
+    def __init__(self, error: Exception = None):
+        self.calls = []
+        self.error = error
+        self.release = threading.Event()
+        self._lock = threading.Lock()
+
+    def __call__(self, params):
+        with self._lock:
+            self.calls.append(params)
+        self.release.wait(5)
+        if self.error is not None:
+            raise self.error
+        return {'q': params['q']}
+
+
+def _run(scheduler, params, priority=INTERACTIVE):
+    results = []
+
+    def call():
+        try:
+            results.append(scheduler.search(params, priority))
+        except Exception as e:
+            results.append(e)
+
+    thread = threading.Thread(target=call)
+    thread.start()
+    return thread, results
+
+
+def _wait_for(condition, timeout: float = 2) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.005)
+
+
+def test_identical_searches_in_flight_share_one_upstream_call():
+    search = BlockingSearch()
+    scheduler = UpstreamScheduler(search, LocalBucketStore())
+    params = {'engine': 'google_hotels', 'q': 'Paris'}
+
+    first, first_results = _run(scheduler, params)
+    _wait_for(lambda: len(search.calls) == 1)
+    second, second_results = _run(scheduler, dict(params, api_key='other'), BACKGROUND)
+    other, other_results = _run(scheduler, {'engine': 'google_hotels', 'q': 'Rome'})
+    _wait_for(lambda: len(search.calls) == 2)
+    # Give the follower time to find the leader's call before it finishes
+    time.sleep(0.05)
+    search.release.set()
+    for thread in (first, second, other):
+        thread.join(5)
+
+    assert len(search.calls) == 2
+    assert first_results == second_results == [{'q': 'Paris'}]
+    assert other_results == [{'q': 'Rome'}]
+    assert not scheduler._inflight
+
+
+def test_followers_get_the_leaders_error():
+    search = BlockingSearch(error=RuntimeError('boom'))
+    scheduler = UpstreamScheduler(search, LocalBucketStore())
+    params = {'engine': 'google_hotels', 'q': 'Paris'}
+
+    leader, leader_results = _run(scheduler, params)
+    _wait_for(lambda: len(search.calls) == 1)
+    follower, follower_results = _run(scheduler, params)
+    time.sleep(0.05)
+    search.release.set()
+    leader.join(5)
+    follower.join(5)
+
+    assert len(search.calls) == 1
+    assert isinstance(leader_results[0], RuntimeError)
+    assert follower_results[0] is leader_results[0]
+
+
+def test_search_is_throttled_after_the_longest_wait(monkeypatch):
+    monkeypatch.setitem(MAX_WAIT_SECONDS, INTERACTIVE, 0.5)
+    calls = []
+    scheduler = UpstreamScheduler(lambda params: calls.append(params) or {'ok': True}, LocalBucketStore(),
+                                  rates={'google_flights': 0.1}, bursts={'google_flights': 1})
+
+    assert scheduler.search({'engine': 'google_flights', 'q': 'a'}) == {'ok': True}
+    start = time.monotonic()
+    throttled = scheduler.search({'engine': 'google_flights', 'q': 'b'})
+    assert 'quota' in throttled['error']
+    # A token is 10s away, past the 0.5s limit, so the search gives up without sleeping
+    assert time.monotonic() - start < 0.5
+    assert len(calls) == 1
+
+
+def test_search_waits_for_a_token_within_the_limit():
+    calls = []
+    scheduler = UpstreamScheduler(lambda params: calls.append(params) or {'ok': True}, LocalBucketStore(),
+                                  rates={'google_flights': 20}, bursts={'google_flights': 1})
+
+    assert scheduler.search({'engine': 'google_flights', 'q': 'a'}) == {'ok': True}
+    assert scheduler.search({'engine': 'google_flights', 'q': 'b'}) == {'ok': True}
+    assert len(calls) == 2
+
+
+def test_rejected_search_spends_no_quota():
+    calls = []
+    rejection = {'error': 'unavailable'}
+    store = LocalBucketStore()
+    scheduler = UpstreamScheduler(lambda params: calls.append(params) or {'ok': True}, store,
+                                  rates={'google_flights': 0.1}, bursts={'google_flights': 1},
+                                  admit=lambda engine: rejection)
+
+    assert scheduler.search({'engine': 'google_flights', 'q': 'a'}) is rejection
+    assert not calls
+    assert store.try_acquire('google_flights', 0.1, 1) == 0
+
+
+def test_spend_takes_a_token_without_waiting():
+    scheduler = UpstreamScheduler(lambda params: {}, LocalBucketStore(),
+                                  rates={'google_flights': 0.1, 'google_hotels': 0}, bursts={'google_flights': 1})
+
+    assert scheduler.spend('google_flights')
+    assert not scheduler.spend('google_flights')
+    # An engine without a rate is not limited
+    assert all(scheduler.spend('google_hotels') for _ in range(5))
@@ -0,0 +1,24 @@
+from search_cache import canonical_key
+
+
+def _hotels(**params):
+    return {'engine': 'google_hotels', 'q': 'Paris', 'check_in_date': '2025-03-07', 'api_key': 'a', **params}
+
+
+def test_equivalent_searches_share_a_key():
+    assert canonical_key(_hotels(q='  paris ', api_key='b', gl='US')) == canonical_key(_hotels(q='Paris', gl='us'))
+    flights = {'engine': 'google_flights', 'departure_id': 'aus', 'arrival_id': 'CDG,ory', 'currency': 'eur'}
+    assert canonical_key(flights) == canonical_key({**flights, 'departure_id': 'AUS', 'arrival_id': 'CDG,ORY', 'currency': 'EUR'})
+
+
+def test_empty_values_are_dropped():
+    assert canonical_key(_hotels(next_page_token='')) == canonical_key(_hotels())
+
+
+def test_tokens_keep_their_case():
+    assert canonical_key(_hotels(next_page_token='CAEQAg')) != canonical_key(_hotels(next_page_token='caeqag'))
+
+
+def test_kgmids_keep_their_case():
+    flights = {'engine': 'google_flights', 'departure_id': '/m/0vzm'}
+    assert canonical_key(flights) != canonical_key({**flights, 'departure_id': '/M/0VZM'})
@@ -0,0 +1,144 @@
+import random
+
+import numpy as np
+import pytest
+
+from shared.portfolio_model import Portfolio
+from shared.sell_planner import EPSILON, STRATEGIES, SalePlanError, _tax_aware, plan_sale
+
+WHOLE_SHARE_STRATEGIES = {'whole_shares', 'min_positions', 'tax_aware'}
+
+
+def random_portfolio(rng: random.Random):
+    """A portfolio of 1-6 symbols, each with 1-3 lots of which some have no cost basis, and its prices."""
+    data = {}
+    prices = {}
+    for i in range(rng.randint(1, 6)):
+        symbol = f"S{i}"
+        lots = []
+        for _ in range(rng.randint(1, 3)):
+            lot = {'quantity': rng.choice([rng.randint(1, 40), round(rng.uniform(0.5, 40), 3)])}
+            if rng.random() < 0.8:
+                lot['cost_basis'] = round(rng.uniform(1, 400), 2)
+            lots.append(lot)
+        data[symbol] = {'lots': lots}
+        prices[symbol] = round(rng.uniform(0.5, 500), 2)
+    return Portfolio.from_mapping(data), prices
+
+
+def available_shares(portfolio: Portfolio, strategy: str, max_per_position: float) -> np.ndarray:
+    available = np.asarray(portfolio.quantities) * max_per_position
+    if strategy not in ('proportional', 'single_stock'):
+        available = np.floor(available + EPSILON)
+    if strategy == 'tax_aware':
+        whole_lots = np.floor(np.asarray(portfolio.lot_quantities) + EPSILON)
+        available = np.minimum(available, np.bincount(portfolio.lot_positions, weights=whole_lots, minlength=len(portfolio)))
+    return available
+
+
+def sellable(portfolio: Portfolio, prices, strategy: str, max_per_position: float) -> float:
+    return float(available_shares(portfolio, strategy, max_per_position) @ np.asarray(portfolio.price_vector(prices)))
+
+
+@pytest.mark.parametrize('strategy', sorted(STRATEGIES))
+def test_plans_meet_the_target_within_caps(strategy):
+    rng = random.Random(strategy)
+    for _ in range(300):
+        portfolio, prices = random_portfolio(rng)
+        max_per_position = rng.choice([1.0, 0.5, round(rng.uniform(0.1, 1), 2)])
+        limit = sellable(portfolio, prices, strategy, max_per_position)
+        if limit <= 1:
+            continue
+        target = round(rng.uniform(0.5, limit - 0.5), 2)
+
+        plan = plan_sale(portfolio, prices, target, strategy, max_per_position)
+
+        raised = sum(shares['shares'] * prices[symbol] for symbol, shares in plan.items())
+        # Shares are rounded to two decimals in the plan
+        assert raised >= target - 0.01 * sum(prices.values()) - 1e-6
+        for symbol, shares in plan.items():
+            assert shares['shares'] <= portfolio.quantity(symbol) * max_per_position + 0.005
+            if strategy in WHOLE_SHARE_STRATEGIES:
+                assert shares['shares'] == int(shares['shares'])
+
+
+@pytest.mark.parametrize('strategy', sorted(STRATEGIES))
+def test_target_beyond_the_caps_is_rejected(strategy):
+    portfolio = Portfolio.from_mapping({'AAPL': 10, 'MSFT': 4})
+    with pytest.raises(SalePlanError):
+        plan_sale(portfolio, {'AAPL': 100.0, 'MSFT': 200.0}, 1001, strategy, max_per_position=0.5)
+
+
+def test_unknown_strategy_and_invalid_cap_are_rejected():
+    portfolio = Portfolio.from_mapping({'AAPL': 10})
+    with pytest.raises(SalePlanError):
+        plan_sale(portfolio, {'AAPL': 100.0}, 100, 'lifo')
+    with pytest.raises(SalePlanError):
+        plan_sale(portfolio, {'AAPL': 100.0}, 100, max_per_position=0)
+
+
+def test_unpriced_symbols_are_left_out():
+    portfolio = Portfolio.from_mapping({'AAPL': 10, 'MSFT': 4})
+    assert set(plan_sale(portfolio, {'AAPL': 100.0}, 500, 'proportional')) == {'AAPL'}
+
+
+def _gain_ratio(basis: np.ndarray, prices: np.ndarray) -> np.ndarray:
+    # Realized gain per dollar raised; unknown basis counts as no basis
+    return 1 - np.nan_to_num(basis, nan=0.0) / prices
+
+
+def test_tax_aware_never_oversells_a_lot_and_takes_the_lowest_gain_first():
+    rng = random.Random(7)
+    for _ in range(500):
+        portfolio, prices = random_portfolio(rng)
+        max_per_position = rng.choice([1.0, 0.5, round(rng.uniform(0.1, 1), 2)])
+        price_vector = np.asarray(portfolio.price_vector(prices))
+        available = available_shares(portfolio, 'tax_aware', max_per_position)
+        limit = float(available @ price_vector)
+        if limit <= 1:
+            continue
+        target = rng.uniform(0.5, limit - 0.5)
+        positions = np.asarray(portfolio.lot_positions)
+        quantities = np.floor(np.asarray(portfolio.lot_quantities) + EPSILON)
+        basis = np.asarray(portfolio.lot_cost_basis)
+
+        sold = _tax_aware(target, price_vector, available, positions, quantities, basis)
+
+        assert (sold >= 0).all() and (sold <= quantities + EPSILON).all()
+        assert (sold == np.round(sold)).all()
+        per_position = np.bincount(positions, weights=sold, minlength=len(portfolio))
+        assert (per_position <= available + EPSILON).all()
+        assert sold @ price_vector[positions] >= target - EPSILON
+
+        # A lot is only sold once every lot with a smaller gain per dollar is sold out or its position's cap is reached
+        ratio = _gain_ratio(basis, price_vector[positions])
+        capped = per_position[positions] >= available[positions] - EPSILON
+        for j in np.flatnonzero(sold > 0):
+            cheaper = ratio < ratio[j] - 1e-12
+            assert (sold[cheaper] >= quantities[cheaper] - EPSILON)[~capped[cheaper]].all()
+
+
+def test_tax_aware_sells_the_highest_basis_lot_first():
+    portfolio = Portfolio.from_mapping({'AAPL': {'lots': [
+        {'quantity': 5, 'cost_basis': 50},
+        {'quantity': 5, 'cost_basis': 190},
+        {'quantity': 5},
+    ]}})
+    plan = plan_sale(portfolio, {'AAPL': 200.0}, 600, 'tax_aware')
+    # Three shares from the 190 lot: 3 x (200 - 190)
+    assert plan['AAPL'] == {'shares': 3.0, 'estimated_value': 600.0, 'estimated_realized_gain': 30.0}
+
+
+def test_tax_aware_reports_unknown_gain_for_lots_without_basis():
+    portfolio = Portfolio.from_mapping({'AAPL': {'lots': [{'quantity': 2, 'cost_basis': 150}, {'quantity': 5}]}})
+    plan = plan_sale(portfolio, {'AAPL': 100.0}, 500, 'tax_aware')
+    assert plan['AAPL']['shares'] == 5.0
+    assert plan['AAPL']['estimated_realized_gain'] is None
+
+
+def test_tax_aware_sells_whole_shares_of_fractional_lots():
+    portfolio = Portfolio.from_mapping({'AAPL': {'lots': [{'quantity': 14, 'cost_basis': 390}, {'quantity': 33.192, 'cost_basis': 245}]}})
+    plan = plan_sale(portfolio, {'AAPL': 374.0}, 17000, 'tax_aware')
+    assert plan['AAPL']['shares'] == 46.0
+    with pytest.raises(SalePlanError):
+        plan_sale(portfolio, {'AAPL': 374.0}, 47 * 374.0 + 1, 'tax_aware')
@@ -0,0 +1,20 @@
+from shared.serpapi_client import SerpApiClient
+
+
+def _client(stub) -> SerpApiClient:
+    return SerpApiClient(base_url=stub.url, timeout=5, max_retries=3, backoff_base=0)
+
+
+def test_retries_up_to_max_retries(failing_stub):
+    results, error_class = _client(failing_stub).request({'engine': 'google_hotels'})
+    assert error_class == 'HTTP503'
+    assert failing_stub.calls['google_hotels'] == 4
+
+
+def test_retries_stop_when_not_allowed(failing_stub):
+    asked = []
+    results, error_class = _client(failing_stub).request({'engine': 'google_hotels'}, allow_retry=lambda: asked.append(1) or len(asked) < 2)
+    assert error_class == 'HTTP503'
+    # One retry allowed, the second refused
+    assert failing_stub.calls['google_hotels'] == 2
+    assert len(asked) == 2
@@ -0,0 +1,43 @@
+import json
+import os
+
+import pytest
+
+import travel_routes
+from shared.currency import CurrencyError
+from shared.resilience import UNAVAILABLE, upstream
+from trip_cost import ASK_USER
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks', 'fixtures')
+
+
+@pytest.fixture
+def hotels(monkeypatch):
+    with open(os.path.join(FIXTURES_DIR, 'google_hotels', 'default.json')) as f:
+        results = json.load(f)
+    monkeypatch.setattr(travel_routes.search_cache, 'get_or_fetch', lambda params, fetch: results)
+    # As if the google_hotels breaker were open or half-open
+    monkeypatch.setattr(upstream, 'retry_after', lambda engine: 10)
+
+
+def test_currency_failure_is_not_reported_as_an_outage(hotels, monkeypatch):
+    def fail(*args):
+        raise CurrencyError("No exchange rate for XYZ")
+
+    monkeypatch.setattr(travel_routes, 'convert_prices', fail)
+    response = travel_routes.get_hotels(q='Paris', check_in_date='2025-03-07', check_out_date='2025-03-09', currency='XYZ')
+    assert response['error'].startswith("No exchange rate for XYZ")
+    assert response.get('error_type') != UNAVAILABLE
+
+
+def test_invalid_sort_is_not_reported_as_an_outage(hotels):
+    response = travel_routes.get_hotels(q='Paris', check_in_date='2025-03-07', check_out_date='2025-03-09', sort_by='nope')
+    assert response['error'].startswith("Unknown sort_by 'nope'")
+    assert response.get('error_type') != UNAVAILABLE
+
+
+def test_invalid_input_asks_the_user():
+    response = travel_routes.get_flights(departure_id='AUS', arrival_id='CDG', outbound_date='2025-03-07', return_date='2025-03-10', departure_time='noon')
+    assert response['error'].endswith(ASK_USER)
+    response = travel_routes.search_flights_batch(departure_ids=['AUS'], arrival_ids=['CDG'], outbound_date_start='2025-03-07', outbound_date_end='2025-03-01')
+    assert response == {'error': "outbound_date_end must not be before outbound_date_start" + ASK_USER, 'total_cost': 0}
@@ -0,0 +1,134 @@
+import threading
+
+import pytest
+
+import shared.sell_planner
+import trip_cost
+from shared.currency import FxTable, fx_rates
+from shared.portfolio_model import Portfolio
+from shared.resilience import UNAVAILABLE, upstream
+from trip_cost import ASK_USER, plan_trip
+
+FLIGHTS = {'best_flights': [
+    {'price': 500, 'flights': [{'airline': 'A'}], 'total_duration': 600},
+    {'price': 450, 'flights': [{'airline': 'B'}], 'total_duration': 700},
+]}
+HOTELS = {'properties': [
+    {'name': 'Grand', 'total_rate': {'extracted_lowest': 600}},
+    {'name': 'Inn', 'rate_per_night': {'extracted_lowest': 100}},
+]}
+
+
+@pytest.fixture
+def portfolio(monkeypatch):
+    """A 10-share AAPL portfolio priced at 200 in whatever currency is asked for; records the currencies asked for."""
+    asked = []
+
+    def prices_in_currency(symbols, currency):
+        asked.append(currency)
+        return {'AAPL': 200.0}, {'AAPL': 1.0}, {}
+
+    monkeypatch.setattr(trip_cost, 'load_portfolio', lambda: Portfolio.from_mapping({'AAPL': 10}))
+    monkeypatch.setattr(trip_cost, 'prices_in_currency', prices_in_currency)
+    return asked
+
+
+def _plan(flights=lambda: FLIGHTS, hotels=lambda: HOTELS, currency='USD', **kwargs):
+    options = {'nights': 3, 'num_passengers': 2, 'num_rooms': 1, 'strategy': 'whole_shares', 'max_per_position': 1.0}
+    return plan_trip(flights, hotels, currency=currency, **{**options, **kwargs})
+
+
+def test_trip_is_costed_from_the_cheapest_flight_and_stay(portfolio):
+    plan = _plan()
+    assert (plan['per_passenger_cost'], plan['flight_cost']) == (450, 900)
+    # Three nights at 100 beat a total rate of 600
+    assert (plan['hotel']['name'], plan['per_room_cost'], plan['hotel_cost']) == ('Inn', 300, 300)
+    assert plan['total_cost'] == 1200
+    assert (plan['portfolio_value'], plan['can_afford_travel'], plan['remaining_after_travel']) == (2000, True, 800)
+    assert plan['shares_to_sell']['AAPL']['shares'] == 6
+
+
+def test_searches_and_pricing_run_concurrently(portfolio, monkeypatch):
+    # Each task waits for the other two, so the plan only completes when all three run at once
+    barrier = threading.Barrier(3, timeout=2)
+
+    def together(value):
+        def task():
+            barrier.wait()
+            return value
+        return task
+
+    monkeypatch.setattr(trip_cost, 'load_portfolio', together(Portfolio.from_mapping({'AAPL': 10})))
+    plan = _plan(together(FLIGHTS), together(HOTELS))
+    assert plan['total_cost'] == 1200
+    assert 'portfolio_error' not in plan
+
+
+def test_unaffordable_trip_has_no_sell_plan(portfolio):
+    plan = _plan(num_passengers=5)
+    assert plan['can_afford_travel'] is False
+    assert plan['remaining_after_travel'] == -550
+    assert 'shares_to_sell' not in plan
+
+
+def test_amounts_are_converted_before_planning_the_sale(portfolio, monkeypatch):
+    monkeypatch.setattr(fx_rates, 'table', lambda: FxTable({'EUR': 1.0, 'USD': 1.25}))
+    planned = []
+    monkeypatch.setattr(shared.sell_planner, 'plan_sale', lambda *args: planned.append(args) or {})
+
+    plan = _plan(currency='EUR')
+    assert (plan['currency'], plan['per_passenger_cost'], plan['per_room_cost'], plan['total_cost']) == ('EUR', 360, 240, 960)
+    assert portfolio == ['EUR']
+    _, prices, target, _, _, rates, currency = planned[0]
+    assert (prices, target, rates, currency) == ({'AAPL': 200.0}, 960, {'AAPL': 1.0}, 'EUR')
+
+
+def test_unknown_currency_asks_the_user(portfolio, monkeypatch):
+    monkeypatch.setattr(fx_rates, 'table', lambda: FxTable({'EUR': 1.0, 'USD': 1.25}))
+    plan = _plan(currency='XYZ')
+    assert plan == {'error': "No exchange rate for XYZ." + ASK_USER, 'total_cost': 0}
+
+
+def test_search_past_the_deadline_fails_the_plan(portfolio, monkeypatch):
+    monkeypatch.setattr(trip_cost, 'PLAN_DEADLINE_SECONDS', 0.2)
+    release = threading.Event()
+    try:
+        plan = _plan(hotels=lambda: release.wait(5) and HOTELS)
+    finally:
+        release.set()
+    assert plan == {'error': "Could not search hotels: Timed out after 0.2s." + ASK_USER, 'total_cost': 0}
+
+
+def test_portfolio_past_the_deadline_still_costs_the_trip(portfolio, monkeypatch):
+    monkeypatch.setattr(trip_cost, 'PLAN_DEADLINE_SECONDS', 0.2)
+    release = threading.Event()
+    monkeypatch.setattr(trip_cost, 'load_portfolio', lambda: release.wait(5) and Portfolio.from_mapping({'AAPL': 10}))
+    try:
+        plan = _plan()
+    finally:
+        release.set()
+    assert plan['total_cost'] == 1200
+    assert plan['portfolio_error'] == 'Timed out after 0.2s'
+    assert 'can_afford_travel' not in plan
+
+
+def test_missing_portfolio_is_reported_alongside_the_trip(portfolio, monkeypatch):
+    monkeypatch.setattr(trip_cost, 'load_portfolio', lambda: None)
+    plan = _plan()
+    assert (plan['total_cost'], plan['portfolio_error']) == (1200, 'No portfolio configured')
+
+
+def test_failed_search_reports_the_outage(portfolio, monkeypatch):
+    assert _plan(flights=lambda: {'error': 'boom'}) == {'error': 'boom' + ASK_USER, 'total_cost': 0}
+    monkeypatch.setattr(upstream, 'retry_after', lambda engine: 12)
+    plan = _plan(hotels=lambda: {'error': 'boom'})
+    assert (plan['error_type'], plan['engine'], plan['retry_after_seconds']) == (UNAVAILABLE, 'google_hotels', 12)
+
+
+def test_raising_search_and_missing_prices(portfolio):
+    def fail():
+        raise RuntimeError('boom')
+
+    assert _plan(flights=fail)['error'] == "Could not search flights: boom." + ASK_USER
+    assert _plan(flights=lambda: {'best_flights': [{'flights': []}]})['error'] == "No priced flights found." + ASK_USER
+    assert _plan(hotels=lambda: {'properties': [{'name': 'Unpriced'}]})['error'] == "No priced hotels found." + ASK_USER
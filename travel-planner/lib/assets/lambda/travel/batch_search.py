@@ -0,0 +1,144 @@
+import os
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+from aws_lambda_powertools import Logger
+
+from results import FlightOption
+from search_cache import normalize_airport_id
+from shared.observability import record_fanout, submit
+
+logger = Logger(child=True)
+
+# Upper bound on searches per batch call, parallel searches, and the wall-clock budget for the batch
+MAX_BATCH_SEARCHES = int(os.environ.get('MAX_BATCH_SEARCHES', '40'))
+BATCH_CONCURRENCY = int(os.environ.get('BATCH_CONCURRENCY', '6'))
+BATCH_DEADLINE_SECONDS = float(os.environ.get('BATCH_DEADLINE_SECONDS', '25'))
+
+WEEKDAYS = ['mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun']
+
+MATRIX_COLUMNS = ['departure_id', 'arrival_id', 'outbound_date', 'return_date', 'price', 'airline', 'stops', 'total_duration']
+
+Route = Tuple[str, str, str, str]  # departure_id, arrival_id, outbound_date, return_date
+
+
+def split_list(values: List[str]) -> List[str]:
+    """Normalize a list parameter into a deduplicated list of non-empty items.
+
+    Bedrock may deliver arrays as comma-separated text or as a bracketed
+    literal such as ``["AUS", "DFW"]``, so each value is split again and
+    stripped of brackets and quotes.
+    """
+    items = (item.strip(' []"\'') for value in values for item in value.split(','))
+    return list(dict.fromkeys(item for item in items if item))
+
+
+def parse_weekdays(values: List[str]) -> Optional[set]:
+    """Parse ``["fri", "sat"]`` into a set of ``date.weekday()`` numbers; empty means any day."""
+    names = [name[:3].lower() for name in split_list(values)]
+    if not names:
+        return None
+    unknown = [name for name in names if name not in WEEKDAYS]
+    if unknown:
+        raise ValueError(f"Unknown weekday(s): {', '.join(unknown)}. Use mon, tue, wed, thu, fri, sat or sun.")
+    return {WEEKDAYS.index(name) for name in names}
+
+
+def expand_routes(
+    departure_ids: List[str],
+    arrival_ids: List[str],
+    outbound_date_start: str,
+    outbound_date_end: str,
+    trip_length_days: int,
+    weekdays: Optional[set] = None,
+) -> List[Route]:
+    """Expand airports and a date window into the distinct round trips to search."""
+    start = date.fromisoformat(outbound_date_start)
+    end = date.fromisoformat(outbound_date_end)
+    if end < start:
+        raise ValueError("outbound_date_end must not be before outbound_date_start")
+    if trip_length_days < 0:
+        raise ValueError("trip_length_days must not be negative")
+
+    dates = []
+    day = start
+    while day <= end:
+        if weekdays is None or day.weekday() in weekdays:
+            dates.append((day.isoformat(), (day + timedelta(days=trip_length_days)).isoformat()))
+        day += timedelta(days=1)
+
+    routes = []
+    for departure_id in map(normalize_airport_id, departure_ids):
+        for arrival_id in map(normalize_airport_id, arrival_ids):
+            if departure_id == arrival_id:
+                continue
+            for outbound_date, return_date in dates:
+                routes.append((departure_id, arrival_id, outbound_date, return_date))
+    # Airport codes are case-insensitive, so the same trip can come in twice; kgmids are kept as given
+    return list(dict.fromkeys(routes))
+
+
+def cheapest_flight(results: Dict) -> Optional[FlightOption]:
+    """Pick the cheapest priced option across ``best_flights`` and ``other_flights``."""
+    options = [FlightOption(flight) for flight in (results.get('best_flights') or []) + (results.get('other_flights') or [])]
+    priced = [option for option in options if option.price is not None]
+    return min(priced, key=lambda option: option.price) if priced else None
+
+
+def run_batch(
+    routes: List[Route],
+    search: Callable[[Route], Dict],
+    max_workers: int = None,
+    deadline: float = None,
+) -> Tuple[List[list], List[Dict]]:
+    """Search all routes concurrently and return ``(rows, failures)``.
+
+    ``rows`` follow ``MATRIX_COLUMNS`` and are sorted cheapest first. Routes
+    that error, have no priced flights, or miss the deadline are listed in
+    ``failures``.
+    """
+    rows = []
+    failures = []
+    if not routes:
+        return rows, failures
+
+    max_workers = max_workers or BATCH_CONCURRENCY
+    deadline = BATCH_DEADLINE_SECONDS if deadline is None else deadline
+
+    width = min(max_workers, len(routes))
+    record_fanout('batch_search', width)
+    executor = ThreadPoolExecutor(max_workers=width)
+    try:
+        futures = {submit(executor, search, route): route for route in routes}
+        done, not_done = wait(futures, timeout=deadline)
+
+        for future in done:
+            route = futures[future]
+            try:
+                results = future.result()
+            except Exception as e:
+                logger.error(f"Error searching {route}: {str(e)}")
+                failures.append({'route': list(route), 'error': str(e)})
+                continue
+
+            if results.get('error'):
+                failures.append({'route': list(route), 'error': results['error']})
+                continue
+
+            flight = cheapest_flight(results)
+            if flight is None:
+                failures.append({'route': list(route), 'error': 'No priced flights found'})
+                continue
+            rows.append([*route, flight.price, flight.airline, flight.stops, flight.total_duration])
+
+        for future in not_done:
+            route = futures[future]
+            future.cancel()
+            failures.append({'route': list(route), 'error': f"Timed out after {deadline}s"})
+    finally:
+        # Do not block the response on stragglers past the deadline
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    rows.sort(key=lambda row: (row[4], row[:4]))
+    return rows, failures
@@ -0,0 +1,465 @@
+"""Bundled airport and metro data behind the local location index.
+
+Major commercial airports only, roughly busiest first within each region.
+Codes that are not listed here are still passed through to Google Flights
+unchanged, so the list only needs to cover places people name in words.
+"""
+
+# Airports sharing a metro code are searched together when the metro is named
+METROS = {
+    # code: (name, country)
+    'NYC': ('New York', 'US'),
+    'CHI': ('Chicago', 'US'),
+    'WAS': ('Washington', 'US'),
+    'HOU': ('Houston', 'US'),
+    'YTO': ('Toronto', 'CA'),
+    'SAO': ('Sao Paulo', 'BR'),
+    'RIO': ('Rio de Janeiro', 'BR'),
+    'BUE': ('Buenos Aires', 'AR'),
+    'LON': ('London', 'GB'),
+    'PAR': ('Paris', 'FR'),
+    'ROM': ('Rome', 'IT'),
+    'MIL': ('Milan', 'IT'),
+    'STO': ('Stockholm', 'SE'),
+    'MOW': ('Moscow', 'RU'),
+    'IST': ('Istanbul', 'TR'),
+    'TYO': ('Tokyo', 'JP'),
+    'OSA': ('Osaka', 'JP'),
+    'SEL': ('Seoul', 'KR'),
+    'BJS': ('Beijing', 'CN'),
+    'SHA': ('Shanghai', 'CN'),
+}
+
+AIRPORTS = (
+    # IATA code, airport name, city, country, metro code
+    # North America
+    ('ATL', 'Hartsfield-Jackson', 'Atlanta', 'US', ''),
+    ('LAX', 'Los Angeles International', 'Los Angeles', 'US', ''),
+    ('ORD', "O'Hare", 'Chicago', 'US', 'CHI'),
+    ('MDW', 'Midway', 'Chicago', 'US', 'CHI'),
+    ('DFW', 'Dallas/Fort Worth', 'Dallas', 'US', ''),
+    ('DAL', 'Love Field', 'Dallas', 'US', ''),
+    ('DEN', 'Denver International', 'Denver', 'US', ''),
+    ('JFK', 'John F. Kennedy', 'New York', 'US', 'NYC'),
+    ('EWR', 'Newark Liberty', 'Newark', 'US', 'NYC'),
+    ('LGA', 'LaGuardia', 'New York', 'US', 'NYC'),
+    ('LAS', 'Harry Reid', 'Las Vegas', 'US', ''),
+    ('MCO', 'Orlando International', 'Orlando', 'US', ''),
+    ('MIA', 'Miami International', 'Miami', 'US', ''),
+    ('CLT', 'Charlotte Douglas', 'Charlotte', 'US', ''),
+    ('SEA', 'Seattle-Tacoma', 'Seattle', 'US', ''),
+    ('PHX', 'Sky Harbor', 'Phoenix', 'US', ''),
+    ('SFO', 'San Francisco International', 'San Francisco', 'US', ''),
+    ('IAH', 'George Bush Intercontinental', 'Houston', 'US', 'HOU'),
+    ('HOU', 'William P. Hobby', 'Houston', 'US', 'HOU'),
+    ('BOS', 'Logan', 'Boston', 'US', ''),
+    ('FLL', 'Fort Lauderdale-Hollywood', 'Fort Lauderdale', 'US', ''),
+    ('MSP', 'Minneapolis-Saint Paul', 'Minneapolis', 'US', ''),
+    ('DTW', 'Detroit Metropolitan', 'Detroit', 'US', ''),
+    ('PHL', 'Philadelphia International', 'Philadelphia', 'US', ''),
+    ('IAD', 'Dulles', 'Washington', 'US', 'WAS'),
+    ('DCA', 'Ronald Reagan National', 'Washington', 'US', 'WAS'),
+    ('BWI', 'Baltimore/Washington', 'Baltimore', 'US', 'WAS'),
+    ('SLC', 'Salt Lake City International', 'Salt Lake City', 'US', ''),
+    ('SAN', 'San Diego International', 'San Diego', 'US', ''),
+    ('TPA', 'Tampa International', 'Tampa', 'US', ''),
+    ('AUS', 'Austin-Bergstrom', 'Austin', 'US', ''),
+    ('BNA', 'Nashville International', 'Nashville', 'US', ''),
+    ('HNL', 'Daniel K. Inouye', 'Honolulu', 'US', ''),
+    ('PDX', 'Portland International', 'Portland, Oregon', 'US', ''),
+    ('MSY', 'Louis Armstrong', 'New Orleans', 'US', ''),
+    ('STL', 'Lambert', 'St. Louis', 'US', ''),
+    ('RDU', 'Raleigh-Durham', 'Raleigh', 'US', ''),
+    ('SJC', 'Mineta San Jose', 'San Jose', 'US', ''),
+    ('OAK', 'Oakland International', 'Oakland', 'US', ''),
+    ('SMF', 'Sacramento International', 'Sacramento', 'US', ''),
+    ('SNA', 'John Wayne', 'Santa Ana', 'US', ''),
+    ('SAT', 'San Antonio International', 'San Antonio', 'US', ''),
+    ('MCI', 'Kansas City International', 'Kansas City', 'US', ''),
+    ('CLE', 'Cleveland Hopkins', 'Cleveland', 'US', ''),
+    ('IND', 'Indianapolis International', 'Indianapolis', 'US', ''),
+    ('PIT', 'Pittsburgh International', 'Pittsburgh', 'US', ''),
+    ('CMH', 'John Glenn Columbus', 'Columbus', 'US', ''),
+    ('CVG', 'Cincinnati/Northern Kentucky', 'Cincinnati', 'US', ''),
+    ('RSW', 'Southwest Florida', 'Fort Myers', 'US', ''),
+    ('PBI', 'Palm Beach International', 'West Palm Beach', 'US', ''),
+    ('JAX', 'Jacksonville International', 'Jacksonville', 'US', ''),
+    ('MKE', 'Milwaukee Mitchell', 'Milwaukee', 'US', ''),
+    ('BUR', 'Hollywood Burbank', 'Burbank', 'US', ''),
+    ('LGB', 'Long Beach', 'Long Beach', 'US', ''),
+    ('OGG', 'Kahului', 'Kahului', 'US', ''),
+    ('ANC', 'Ted Stevens Anchorage', 'Anchorage', 'US', ''),
+    ('ABQ', 'Albuquerque Sunport', 'Albuquerque', 'US', ''),
+    ('BOI', 'Boise', 'Boise', 'US', ''),
+    ('BDL', 'Bradley', 'Hartford', 'US', ''),
+    ('BUF', 'Buffalo Niagara', 'Buffalo', 'US', ''),
+    ('ELP', 'El Paso International', 'El Paso', 'US', ''),
+    ('OMA', 'Eppley Airfield', 'Omaha', 'US', ''),
+    ('OKC', 'Will Rogers', 'Oklahoma City', 'US', ''),
+    ('TUS', 'Tucson International', 'Tucson', 'US', ''),
+    ('RNO', 'Reno-Tahoe', 'Reno', 'US', ''),
+    ('CHS', 'Charleston International', 'Charleston', 'US', ''),
+    ('SAV', 'Savannah/Hilton Head', 'Savannah', 'US', ''),
+    ('MEM', 'Memphis International', 'Memphis', 'US', ''),
+    ('RIC', 'Richmond International', 'Richmond', 'US', ''),
+    ('PWM', 'Portland International Jetport', 'Portland, Maine', 'US', ''),
+    ('SJU', 'Luis Munoz Marin', 'San Juan', 'PR', ''),
+    ('YYZ', 'Pearson', 'Toronto', 'CA', 'YTO'),
+    ('YTZ', 'Billy Bishop', 'Toronto', 'CA', 'YTO'),
+    ('YVR', 'Vancouver International', 'Vancouver', 'CA', ''),
+    ('YUL', 'Trudeau', 'Montreal', 'CA', ''),
+    ('YYC', 'Calgary International', 'Calgary', 'CA', ''),
+    ('YEG', 'Edmonton International', 'Edmonton', 'CA', ''),
+    ('YOW', 'Macdonald-Cartier', 'Ottawa', 'CA', ''),
+    ('YHZ', 'Stanfield', 'Halifax', 'CA', ''),
+    ('YWG', 'Richardson', 'Winnipeg', 'CA', ''),
+    ('YQB', 'Jean Lesage', 'Quebec City', 'CA', ''),
+    ('MEX', 'Benito Juarez', 'Mexico City', 'MX', ''),
+    ('NLU', 'Felipe Angeles', 'Mexico City', 'MX', ''),
+    ('CUN', 'Cancun International', 'Cancun', 'MX', ''),
+    ('GDL', 'Guadalajara International', 'Guadalajara', 'MX', ''),
+    ('MTY', 'Monterrey International', 'Monterrey', 'MX', ''),
+    ('SJD', 'Los Cabos', 'San Jose del Cabo', 'MX', ''),
+    ('PVR', 'Puerto Vallarta International', 'Puerto Vallarta', 'MX', ''),
+    ('TIJ', 'Tijuana International', 'Tijuana', 'MX', ''),
+    # Caribbean and Central America
+    ('PUJ', 'Punta Cana International', 'Punta Cana', 'DO', ''),
+    ('SDQ', 'Las Americas', 'Santo Domingo', 'DO', ''),
+    ('HAV', 'Jose Marti', 'Havana', 'CU', ''),
+    ('MBJ', 'Sangster', 'Montego Bay', 'JM', ''),
+    ('KIN', 'Norman Manley', 'Kingston', 'JM', ''),
+    ('NAS', 'Lynden Pindling', 'Nassau', 'BS', ''),
+    ('AUA', 'Queen Beatrix', 'Oranjestad', 'AW', ''),
+    ('PTY', 'Tocumen', 'Panama City', 'PA', ''),
+    ('SJO', 'Juan Santamaria', 'San Jose', 'CR', ''),
+    ('LIR', 'Daniel Oduber Quiros', 'Liberia', 'CR', ''),
+    ('GUA', 'La Aurora', 'Guatemala City', 'GT', ''),
+    ('SAL', 'El Salvador International', 'San Salvador', 'SV', ''),
+    # South America
+    ('GRU', 'Guarulhos', 'Sao Paulo', 'BR', 'SAO'),
+    ('CGH', 'Congonhas', 'Sao Paulo', 'BR', 'SAO'),
+    ('VCP', 'Viracopos', 'Campinas', 'BR', 'SAO'),
+    ('GIG', 'Galeao', 'Rio de Janeiro', 'BR', 'RIO'),
+    ('SDU', 'Santos Dumont', 'Rio de Janeiro', 'BR', 'RIO'),
+    ('BSB', 'Brasilia International', 'Brasilia', 'BR', ''),
+    ('BOG', 'El Dorado', 'Bogota', 'CO', ''),
+    ('MDE', 'Jose Maria Cordova', 'Medellin', 'CO', ''),
+    ('CTG', 'Rafael Nunez', 'Cartagena', 'CO', ''),
+    ('SCL', 'Arturo Merino Benitez', 'Santiago', 'CL', ''),
+    ('LIM', 'Jorge Chavez', 'Lima', 'PE', ''),
+    ('CUZ', 'Alejandro Velasco Astete', 'Cusco', 'PE', ''),
+    ('EZE', 'Ezeiza', 'Buenos Aires', 'AR', 'BUE'),
+    ('AEP', 'Aeroparque Jorge Newbery', 'Buenos Aires', 'AR', 'BUE'),
+    ('UIO', 'Mariscal Sucre', 'Quito', 'EC', ''),
+    ('GYE', 'Jose Joaquin de Olmedo', 'Guayaquil', 'EC', ''),
+    ('MVD', 'Carrasco', 'Montevideo', 'UY', ''),
+    ('CCS', 'Simon Bolivar', 'Caracas', 'VE', ''),
+    ('ASU', 'Silvio Pettirossi', 'Asuncion', 'PY', ''),
+    ('VVI', 'Viru Viru', 'Santa Cruz', 'BO', ''),
+    ('LPB', 'El Alto', 'La Paz', 'BO', ''),
+    # Europe
+    ('LHR', 'Heathrow', 'London', 'GB', 'LON'),
+    ('LGW', 'Gatwick', 'London', 'GB', 'LON'),
+    ('STN', 'Stansted', 'London', 'GB', 'LON'),
+    ('LTN', 'Luton', 'London', 'GB', 'LON'),
+    ('LCY', 'London City', 'London', 'GB', 'LON'),
+    ('SEN', 'Southend', 'London', 'GB', 'LON'),
+    ('MAN', 'Manchester', 'Manchester', 'GB', ''),
+    ('EDI', 'Edinburgh', 'Edinburgh', 'GB', ''),
+    ('BHX', 'Birmingham', 'Birmingham', 'GB', ''),
+    ('GLA', 'Glasgow', 'Glasgow', 'GB', ''),
+    ('BRS', 'Bristol', 'Bristol', 'GB', ''),
+    ('DUB', 'Dublin', 'Dublin', 'IE', ''),
+    ('SNN', 'Shannon', 'Shannon', 'IE', ''),
+    ('CDG', 'Charles de Gaulle', 'Paris', 'FR', 'PAR'),
+    ('ORY', 'Orly', 'Paris', 'FR', 'PAR'),
+    ('BVA', 'Beauvais-Tille', 'Beauvais', 'FR', ''),
+    ('NCE', "Cote d'Azur", 'Nice', 'FR', ''),
+    ('LYS', 'Saint-Exupery', 'Lyon', 'FR', ''),
+    ('MRS', 'Marseille Provence', 'Marseille', 'FR', ''),
+    ('TLS', 'Toulouse-Blagnac', 'Toulouse', 'FR', ''),
+    ('BOD', 'Bordeaux-Merignac', 'Bordeaux', 'FR', ''),
+    ('NTE', 'Nantes Atlantique', 'Nantes', 'FR', ''),
+    ('AMS', 'Schiphol', 'Amsterdam', 'NL', ''),
+    ('EIN', 'Eindhoven', 'Eindhoven', 'NL', ''),
+    ('RTM', 'Rotterdam The Hague', 'Rotterdam', 'NL', ''),
+    ('FRA', 'Frankfurt', 'Frankfurt', 'DE', ''),
+    ('MUC', 'Munich', 'Munich', 'DE', ''),
+    ('BER', 'Brandenburg', 'Berlin', 'DE', ''),
+    ('DUS', 'Dusseldorf', 'Dusseldorf', 'DE', ''),
+    ('HAM', 'Hamburg', 'Hamburg', 'DE', ''),
+    ('CGN', 'Cologne Bonn', 'Cologne', 'DE', ''),
+    ('STR', 'Stuttgart', 'Stuttgart', 'DE', ''),
+    ('BRU', 'Brussels', 'Brussels', 'BE', ''),
+    ('CRL', 'Brussels South Charleroi', 'Charleroi', 'BE', ''),
+    ('LUX', 'Luxembourg', 'Luxembourg', 'LU', ''),
+    ('ZRH', 'Zurich', 'Zurich', 'CH', ''),
+    ('GVA', 'Geneva', 'Geneva', 'CH', ''),
+    ('BSL', 'EuroAirport Basel Mulhouse Freiburg', 'Basel', 'CH', ''),
+    ('VIE', 'Vienna', 'Vienna', 'AT', ''),
+    ('SZG', 'Salzburg', 'Salzburg', 'AT', ''),
+    ('MAD', 'Adolfo Suarez Madrid-Barajas', 'Madrid', 'ES', ''),
+    ('BCN', 'El Prat', 'Barcelona', 'ES', ''),
+    ('PMI', 'Palma de Mallorca', 'Palma', 'ES', ''),
+    ('AGP', 'Costa del Sol', 'Malaga', 'ES', ''),
+    ('ALC', 'Alicante-Elche', 'Alicante', 'ES', ''),
+    ('IBZ', 'Ibiza', 'Ibiza', 'ES', ''),
+    ('VLC', 'Valencia', 'Valencia', 'ES', ''),
+    ('SVQ', 'Seville', 'Seville', 'ES', ''),
+    ('BIO', 'Bilbao', 'Bilbao', 'ES', ''),
+    ('LPA', 'Gran Canaria', 'Las Palmas', 'ES', ''),
+    ('TFS', 'Tenerife South', 'Tenerife', 'ES', ''),
+    ('TFN', 'Tenerife North', 'Tenerife', 'ES', ''),
+    ('LIS', 'Humberto Delgado', 'Lisbon', 'PT', ''),
+    ('OPO', 'Francisco Sa Carneiro', 'Porto', 'PT', ''),
+    ('FAO', 'Faro', 'Faro', 'PT', ''),
+    ('FNC', 'Madeira', 'Funchal', 'PT', ''),
+    ('FCO', 'Fiumicino', 'Rome', 'IT', 'ROM'),
+    ('CIA', 'Ciampino', 'Rome', 'IT', 'ROM'),
+    ('MXP', 'Malpensa', 'Milan', 'IT', 'MIL'),
+    ('LIN', 'Linate', 'Milan', 'IT', 'MIL'),
+    ('BGY', 'Orio al Serio', 'Bergamo', 'IT', 'MIL'),
+    ('VCE', 'Marco Polo', 'Venice', 'IT', ''),
+    ('NAP', 'Naples', 'Naples', 'IT', ''),
+    ('BLQ', 'Guglielmo Marconi', 'Bologna', 'IT', ''),
+    ('FLR', 'Peretola', 'Florence', 'IT', ''),
+    ('PSA', 'Galileo Galilei', 'Pisa', 'IT', ''),
+    ('CTA', 'Fontanarossa', 'Catania', 'IT', ''),
+    ('PMO', 'Falcone-Borsellino', 'Palermo', 'IT', ''),
+    ('TRN', 'Turin', 'Turin', 'IT', ''),
+    ('ATH', 'Eleftherios Venizelos', 'Athens', 'GR', ''),
+    ('SKG', 'Makedonia', 'Thessaloniki', 'GR', ''),
+    ('HER', 'Nikos Kazantzakis', 'Heraklion', 'GR', ''),
+    ('JTR', 'Santorini', 'Santorini', 'GR', ''),
+    ('JMK', 'Mykonos', 'Mykonos', 'GR', ''),
+    ('RHO', 'Diagoras', 'Rhodes', 'GR', ''),
+    ('CFU', 'Ioannis Kapodistrias', 'Corfu', 'GR', ''),
+    ('IST', 'Istanbul', 'Istanbul', 'TR', 'IST'),
+    ('SAW', 'Sabiha Gokcen', 'Istanbul', 'TR', 'IST'),
+    ('AYT', 'Antalya', 'Antalya', 'TR', ''),
+    ('ESB', 'Esenboga', 'Ankara', 'TR', ''),
+    ('CPH', 'Kastrup', 'Copenhagen', 'DK', ''),
+    ('ARN', 'Arlanda', 'Stockholm', 'SE', 'STO'),
+    ('BMA', 'Bromma', 'Stockholm', 'SE', 'STO'),
+    ('GOT', 'Landvetter', 'Gothenburg', 'SE', ''),
+    ('OSL', 'Gardermoen', 'Oslo', 'NO', ''),
+    ('BGO', 'Flesland', 'Bergen', 'NO', ''),
+    ('HEL', 'Helsinki-Vantaa', 'Helsinki', 'FI', ''),
+    ('KEF', 'Keflavik', 'Reykjavik', 'IS', ''),
+    ('WAW', 'Chopin', 'Warsaw', 'PL', ''),
+    ('KRK', 'John Paul II', 'Krakow', 'PL', ''),
+    ('GDN', 'Lech Walesa', 'Gdansk', 'PL', ''),
+    ('PRG', 'Vaclav Havel', 'Prague', 'CZ', ''),
+    ('BUD', 'Ferenc Liszt', 'Budapest', 'HU', ''),
+    ('OTP', 'Henri Coanda', 'Bucharest', 'RO', ''),
+    ('SOF', 'Sofia', 'Sofia', 'BG', ''),
+    ('BEG', 'Nikola Tesla', 'Belgrade', 'RS', ''),
+    ('ZAG', 'Franjo Tudman', 'Zagreb', 'HR', ''),
+    ('DBV', 'Dubrovnik', 'Dubrovnik', 'HR', ''),
+    ('SPU', 'Split', 'Split', 'HR', ''),
+    ('LJU', 'Joze Pucnik', 'Ljubljana', 'SI', ''),
+    ('TLL', 'Lennart Meri', 'Tallinn', 'EE', ''),
+    ('RIX', 'Riga International', 'Riga', 'LV', ''),
+    ('VNO', 'Vilnius International', 'Vilnius', 'LT', ''),
+    ('MLA', 'Malta International', 'Valletta', 'MT', ''),
+    ('LCA', 'Larnaca International', 'Larnaca', 'CY', ''),
+    ('PFO', 'Paphos International', 'Paphos', 'CY', ''),
+    ('KBP', 'Boryspil', 'Kyiv', 'UA', ''),
+    ('SVO', 'Sheremetyevo', 'Moscow', 'RU', 'MOW'),
+    ('DME', 'Domodedovo', 'Moscow', 'RU', 'MOW'),
+    ('VKO', 'Vnukovo', 'Moscow', 'RU', 'MOW'),
+    ('LED', 'Pulkovo', 'Saint Petersburg', 'RU', ''),
+    ('TBS', 'Tbilisi International', 'Tbilisi', 'GE', ''),
+    ('EVN', 'Zvartnots', 'Yerevan', 'AM', ''),
+    ('GYD', 'Heydar Aliyev', 'Baku', 'AZ', ''),
+    # Middle East and Africa
+    ('DXB', 'Dubai International', 'Dubai', 'AE', ''),
+    ('AUH', 'Zayed International', 'Abu Dhabi', 'AE', ''),
+    ('DOH', 'Hamad', 'Doha', 'QA', ''),
+    ('RUH', 'King Khalid', 'Riyadh', 'SA', ''),
+    ('JED', 'King Abdulaziz', 'Jeddah', 'SA', ''),
+    ('BAH', 'Bahrain International', 'Manama', 'BH', ''),
+    ('KWI', 'Kuwait International', 'Kuwait City', 'KW', ''),
+    ('MCT', 'Muscat International', 'Muscat', 'OM', ''),
+    ('TLV', 'Ben Gurion', 'Tel Aviv', 'IL', ''),
+    ('AMM', 'Queen Alia', 'Amman', 'JO', ''),
+    ('BEY', 'Rafic Hariri', 'Beirut', 'LB', ''),
+    ('CAI', 'Cairo International', 'Cairo', 'EG', ''),
+    ('HRG', 'Hurghada International', 'Hurghada', 'EG', ''),
+    ('SSH', 'Sharm El Sheikh International', 'Sharm El Sheikh', 'EG', ''),
+    ('CMN', 'Mohammed V', 'Casablanca', 'MA', ''),
+    ('RAK', 'Menara', 'Marrakesh', 'MA', ''),
+    ('TUN', 'Tunis-Carthage', 'Tunis', 'TN', ''),
+    ('ALG', 'Houari Boumediene', 'Algiers', 'DZ', ''),
+    ('JNB', 'O. R. Tambo', 'Johannesburg', 'ZA', ''),
+    ('CPT', 'Cape Town International', 'Cape Town', 'ZA', ''),
+    ('DUR', 'King Shaka', 'Durban', 'ZA', ''),
+    ('NBO', 'Jomo Kenyatta', 'Nairobi', 'KE', ''),
+    ('MBA', 'Moi International', 'Mombasa', 'KE', ''),
+    ('ADD', 'Bole', 'Addis Ababa', 'ET', ''),
+    ('DAR', 'Julius Nyerere', 'Dar es Salaam', 'TZ', ''),
+    ('ZNZ', 'Abeid Amani Karume', 'Zanzibar', 'TZ', ''),
+    ('JRO', 'Kilimanjaro International', 'Kilimanjaro', 'TZ', ''),
+    ('LOS', 'Murtala Muhammed', 'Lagos', 'NG', ''),
+    ('ABV', 'Nnamdi Azikiwe', 'Abuja', 'NG', ''),
+    ('ACC', 'Kotoka', 'Accra', 'GH', ''),
+    ('DSS', 'Blaise Diagne', 'Dakar', 'SN', ''),
+    ('KGL', 'Kigali International', 'Kigali', 'RW', ''),
+    ('EBB', 'Entebbe International', 'Entebbe', 'UG', ''),
+    ('MRU', 'Sir Seewoosagur Ramgoolam', 'Port Louis', 'MU', ''),
+    ('SEZ', 'Seychelles International', 'Mahe', 'SC', ''),
+    ('TNR', 'Ivato', 'Antananarivo', 'MG', ''),
+    ('WDH', 'Hosea Kutako', 'Windhoek', 'NA', ''),
+    ('VFA', 'Victoria Falls', 'Victoria Falls', 'ZW', ''),
+    # Asia
+    ('HND', 'Haneda', 'Tokyo', 'JP', 'TYO'),
+    ('NRT', 'Narita', 'Tokyo', 'JP', 'TYO'),
+    ('KIX', 'Kansai', 'Osaka', 'JP', 'OSA'),
+    ('ITM', 'Itami', 'Osaka', 'JP', 'OSA'),
+    ('NGO', 'Chubu Centrair', 'Nagoya', 'JP', ''),
+    ('CTS', 'New Chitose', 'Sapporo', 'JP', ''),
+    ('FUK', 'Fukuoka', 'Fukuoka', 'JP', ''),
+    ('OKA', 'Naha', 'Naha', 'JP', ''),
+    ('ICN', 'Incheon', 'Seoul', 'KR', 'SEL'),
+    ('GMP', 'Gimpo', 'Seoul', 'KR', 'SEL'),
+    ('PUS', 'Gimhae', 'Busan', 'KR', ''),
+    ('CJU', 'Jeju International', 'Jeju', 'KR', ''),
+    ('PEK', 'Capital', 'Beijing', 'CN', 'BJS'),
+    ('PKX', 'Daxing', 'Beijing', 'CN', 'BJS'),
+    ('PVG', 'Pudong', 'Shanghai', 'CN', 'SHA'),
+    ('SHA', 'Hongqiao', 'Shanghai', 'CN', 'SHA'),
+    ('CAN', 'Baiyun', 'Guangzhou', 'CN', ''),
+    ('SZX', "Bao'an", 'Shenzhen', 'CN', ''),
+    ('CTU', 'Shuangliu', 'Chengdu', 'CN', ''),
+    ('TFU', 'Tianfu', 'Chengdu', 'CN', ''),
+    ('CKG', 'Jiangbei', 'Chongqing', 'CN', ''),
+    ('KMG', 'Changshui', 'Kunming', 'CN', ''),
+    ('XIY', 'Xianyang', "Xi'an", 'CN', ''),
+    ('HGH', 'Xiaoshan', 'Hangzhou', 'CN', ''),
+    ('XMN', 'Gaoqi', 'Xiamen', 'CN', ''),
+    ('HKG', 'Hong Kong International', 'Hong Kong', 'HK', ''),
+    ('MFM', 'Macau International', 'Macau', 'MO', ''),
+    ('TPE', 'Taoyuan', 'Taipei', 'TW', ''),
+    ('TSA', 'Songshan', 'Taipei', 'TW', ''),
+    ('KHH', 'Kaohsiung International', 'Kaohsiung', 'TW', ''),
+    ('MNL', 'Ninoy Aquino', 'Manila', 'PH', ''),
+    ('CEB', 'Mactan-Cebu', 'Cebu', 'PH', ''),
+    ('SIN', 'Changi', 'Singapore', 'SG', ''),
+    ('KUL', 'Kuala Lumpur International', 'Kuala Lumpur', 'MY', ''),
+    ('PEN', 'Penang International', 'Penang', 'MY', ''),
+    ('BKI', 'Kota Kinabalu International', 'Kota Kinabalu', 'MY', ''),
+    ('BKK', 'Suvarnabhumi', 'Bangkok', 'TH', ''),
+    ('DMK', 'Don Mueang', 'Bangkok', 'TH', ''),
+    ('HKT', 'Phuket International', 'Phuket', 'TH', ''),
+    ('CNX', 'Chiang Mai International', 'Chiang Mai', 'TH', ''),
+    ('USM', 'Samui', 'Koh Samui', 'TH', ''),
+    ('SGN', 'Tan Son Nhat', 'Ho Chi Minh City', 'VN', ''),
+    ('HAN', 'Noi Bai', 'Hanoi', 'VN', ''),
+    ('DAD', 'Da Nang International', 'Da Nang', 'VN', ''),
+    ('KTI', 'Techo International', 'Phnom Penh', 'KH', ''),
+    ('SAI', 'Siem Reap-Angkor', 'Siem Reap', 'KH', ''),
+    ('RGN', 'Yangon International', 'Yangon', 'MM', ''),
+    ('VTE', 'Wattay', 'Vientiane', 'LA', ''),
+    ('CGK', 'Soekarno-Hatta', 'Jakarta', 'ID', ''),
+    ('DPS', 'Ngurah Rai', 'Denpasar', 'ID', ''),
+    ('SUB', 'Juanda', 'Surabaya', 'ID', ''),
+    ('DEL', 'Indira Gandhi', 'Delhi', 'IN', ''),
+    ('BOM', 'Chhatrapati Shivaji Maharaj', 'Mumbai', 'IN', ''),
+    ('BLR', 'Kempegowda', 'Bengaluru', 'IN', ''),
+    ('MAA', 'Chennai International', 'Chennai', 'IN', ''),
+    ('HYD', 'Rajiv Gandhi', 'Hyderabad', 'IN', ''),
+    ('CCU', 'Netaji Subhas Chandra Bose', 'Kolkata', 'IN', ''),
+    ('GOI', 'Dabolim', 'Goa', 'IN', ''),
+    ('GOX', 'Manohar', 'Goa', 'IN', ''),
+    ('COK', 'Cochin International', 'Kochi', 'IN', ''),
+    ('AMD', 'Sardar Vallabhbhai Patel', 'Ahmedabad', 'IN', ''),
+    ('JAI', 'Jaipur International', 'Jaipur', 'IN', ''),
+    ('CMB', 'Bandaranaike', 'Colombo', 'LK', ''),
+    ('MLE', 'Velana', 'Male', 'MV', ''),
+    ('KTM', 'Tribhuvan', 'Kathmandu', 'NP', ''),
+    ('DAC', 'Hazrat Shahjalal', 'Dhaka', 'BD', ''),
+    ('KHI', 'Jinnah', 'Karachi', 'PK', ''),
+    ('LHE', 'Allama Iqbal', 'Lahore', 'PK', ''),
+    ('ISB', 'Islamabad International', 'Islamabad', 'PK', ''),
+    ('ALA', 'Almaty International', 'Almaty', 'KZ', ''),
+    ('TAS', 'Islam Karimov', 'Tashkent', 'UZ', ''),
+    ('ULN', 'Chinggis Khaan', 'Ulaanbaatar', 'MN', ''),
+    # Oceania
+    ('SYD', 'Kingsford Smith', 'Sydney', 'AU', ''),
+    ('MEL', 'Tullamarine', 'Melbourne', 'AU', ''),
+    ('BNE', 'Brisbane', 'Brisbane', 'AU', ''),
+    ('PER', 'Perth', 'Perth', 'AU', ''),
+    ('ADL', 'Adelaide', 'Adelaide', 'AU', ''),
+    ('OOL', 'Gold Coast', 'Gold Coast', 'AU', ''),
+    ('CNS', 'Cairns', 'Cairns', 'AU', ''),
+    ('CBR', 'Canberra', 'Canberra', 'AU', ''),
+    ('HBA', 'Hobart', 'Hobart', 'AU', ''),
+    ('DRW', 'Darwin International', 'Darwin', 'AU', ''),
+    ('AKL', 'Auckland', 'Auckland', 'NZ', ''),
+    ('WLG', 'Wellington', 'Wellington', 'NZ', ''),
+    ('CHC', 'Christchurch', 'Christchurch', 'NZ', ''),
+    ('ZQN', 'Queenstown', 'Queenstown', 'NZ', ''),
+    ('NAN', 'Nadi International', 'Nadi', 'FJ', ''),
+    ('PPT', "Faa'a", 'Papeete', 'PF', ''),
+)
+
+# Other names people use for a listed airport or metro code
+ALIASES = {
+    'New York City': 'NYC',
+    'LA': 'LAX',
+    'SF': 'SFO',
+    'DC': 'WAS',
+    'Washington DC': 'WAS',
+    'Vegas': 'LAS',
+    'Fort Worth': 'DFW',
+    'Maui': 'OGG',
+    'Puerto Rico': 'SJU',
+    'Aruba': 'AUA',
+    'Iceland': 'KEF',
+    'Kiev': 'KBP',
+    'Malta': 'MLA',
+    'Mallorca': 'PMI',
+    'Majorca': 'PMI',
+    'Crete': 'HER',
+    'Kampala': 'EBB',
+    'Mauritius': 'MRU',
+    'Seychelles': 'SEZ',
+    'Okinawa': 'OKA',
+    'Saigon': 'SGN',
+    'Bali': 'DPS',
+    'New Delhi': 'DEL',
+    'Bombay': 'BOM',
+    'Bangalore': 'BLR',
+    'Madras': 'MAA',
+    'Calcutta': 'CCU',
+    'Cochin': 'COK',
+    'Maldives': 'MLE',
+    'Fiji': 'NAN',
+    'Tahiti': 'PPT',
+}
+
+COUNTRIES = {
+    'US': 'United States', 'CA': 'Canada', 'MX': 'Mexico', 'PR': 'Puerto Rico',
+    'DO': 'Dominican Republic', 'CU': 'Cuba', 'JM': 'Jamaica', 'BS': 'Bahamas', 'AW': 'Aruba',
+    'PA': 'Panama', 'CR': 'Costa Rica', 'GT': 'Guatemala', 'SV': 'El Salvador',
+    'BR': 'Brazil', 'CO': 'Colombia', 'CL': 'Chile', 'PE': 'Peru', 'AR': 'Argentina', 'EC': 'Ecuador',
+    'UY': 'Uruguay', 'VE': 'Venezuela', 'PY': 'Paraguay', 'BO': 'Bolivia',
+    'GB': 'United Kingdom', 'IE': 'Ireland', 'FR': 'France', 'NL': 'Netherlands', 'DE': 'Germany',
+    'BE': 'Belgium', 'LU': 'Luxembourg', 'CH': 'Switzerland', 'AT': 'Austria', 'ES': 'Spain',
+    'PT': 'Portugal', 'IT': 'Italy', 'GR': 'Greece', 'TR': 'Turkey', 'DK': 'Denmark', 'SE': 'Sweden',
+    'NO': 'Norway', 'FI': 'Finland', 'IS': 'Iceland', 'PL': 'Poland', 'CZ': 'Czech Republic',
+    'HU': 'Hungary', 'RO': 'Romania', 'BG': 'Bulgaria', 'RS': 'Serbia', 'HR': 'Croatia', 'SI': 'Slovenia',
+    'EE': 'Estonia', 'LV': 'Latvia', 'LT': 'Lithuania', 'MT': 'Malta', 'CY': 'Cyprus', 'UA': 'Ukraine',
+    'RU': 'Russia', 'GE': 'Georgia', 'AM': 'Armenia', 'AZ': 'Azerbaijan',
+    'AE': 'United Arab Emirates', 'QA': 'Qatar', 'SA': 'Saudi Arabia', 'BH': 'Bahrain', 'KW': 'Kuwait',
+    'OM': 'Oman', 'IL': 'Israel', 'JO': 'Jordan', 'LB': 'Lebanon', 'EG': 'Egypt', 'MA': 'Morocco',
+    'TN': 'Tunisia', 'DZ': 'Algeria', 'ZA': 'South Africa', 'KE': 'Kenya', 'ET': 'Ethiopia',
+    'TZ': 'Tanzania', 'NG': 'Nigeria', 'GH': 'Ghana', 'SN': 'Senegal', 'RW': 'Rwanda', 'UG': 'Uganda',
+    'MU': 'Mauritius', 'SC': 'Seychelles', 'MG': 'Madagascar', 'NA': 'Namibia', 'ZW': 'Zimbabwe',
+    'JP': 'Japan', 'KR': 'South Korea', 'CN': 'China', 'HK': 'Hong Kong', 'MO': 'Macau', 'TW': 'Taiwan',
+    'PH': 'Philippines', 'SG': 'Singapore', 'MY': 'Malaysia', 'TH': 'Thailand', 'VN': 'Vietnam',
+    'KH': 'Cambodia', 'MM': 'Myanmar', 'LA': 'Laos', 'ID': 'Indonesia', 'IN': 'India', 'LK': 'Sri Lanka',
+    'MV': 'Maldives', 'NP': 'Nepal', 'BD': 'Bangladesh', 'PK': 'Pakistan', 'KZ': 'Kazakhstan',
+    'UZ': 'Uzbekistan', 'MN': 'Mongolia',
+    'AU': 'Australia', 'NZ': 'New Zealand', 'FJ': 'Fiji', 'PF': 'French Polynesia',
+}
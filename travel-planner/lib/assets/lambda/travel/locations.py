@@ -0,0 +1,288 @@
+import re
+import unicodedata
+from array import array
+from bisect import bisect_left
+from collections import defaultdict
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from aws_lambda_powertools import Logger
+
+logger = Logger(child=True)
+
+# Words that add nothing to an airport's name
+STOPWORDS = frozenset(('airport', 'international', 'intl', 'aeropuerto', 'aeroporto', 'aeroport', 'flughafen'))
+
+# Match quality, best first
+EXACT, PREFIX, FUZZY = 'exact', 'prefix', 'fuzzy'
+_TIERS = (EXACT, PREFIX, FUZZY)
+
+# Shortest query matched by prefix, and most index entries scanned for one prefix
+MIN_PREFIX_LENGTH = 2
+MAX_PREFIX_ENTRIES = 64
+
+_CODE = re.compile(r'^[A-Za-z]{3}$')
+_KGMID = re.compile(r'^/[mg]/\w+$')
+
+
+class LocationError(ValueError):
+    """Raised when a location cannot be resolved to a single airport or city."""
+
+
+def normalize(text: str) -> str:
+    """Lowercase, strip accents and punctuation, and drop filler words such as 'airport'."""
+    text = unicodedata.normalize('NFKD', text)
+    text = ''.join(c for c in text if not unicodedata.combining(c)).lower()
+    words = re.findall(r'[a-z0-9]+', text.replace("'", '').replace('’', ''))
+    return ' '.join('st' if word == 'saint' else word for word in words if word not in STOPWORDS)
+
+
+class Location:
+    """An airport, or a metro or city searched as all of its airports."""
+
+    __slots__ = ('code', 'name', 'city', 'country', 'kind', 'airports')
+
+    def __init__(self, code: Optional[str], name: str, city: str, country: str, kind: str, airports: Tuple[str, ...]):
+        self.code = code
+        self.name = name
+        self.city = city
+        self.country = country
+        self.kind = kind
+        self.airports = airports
+
+    @property
+    def ids(self) -> str:
+        """The departure_id/arrival_id Google Flights accepts for this location."""
+        return ','.join(self.airports)
+
+    def describe(self, countries: Dict[str, str]) -> str:
+        country = countries.get(self.country, self.country)
+        if self.kind == 'airport':
+            return f"{self.name} ({self.code}), {self.city}, {country}"
+        return f"{self.name}, {country} ({', '.join(self.airports)})"
+
+    def to_dict(self, countries: Dict[str, str]) -> Dict:
+        return {
+            'id': self.ids,
+            'kind': self.kind,
+            'name': self.name,
+            'city': self.city,
+            'country': countries.get(self.country, self.country),
+            'airports': list(self.airports),
+        }
+
+
+def _letter_set(key: str) -> int:
+    """Bitmask of the characters in a normalized key."""
+    mask = 0
+    for char in key:
+        mask |= 1 << (ord(char) % 64)
+    return mask
+
+
+def _edit_distance(a: str, b: str, limit: int) -> Optional[int]:
+    """Optimal string alignment distance between ``a`` and ``b``, or None once it must exceed ``limit``.
+
+    Like Levenshtein, but swapping two adjacent letters ("Parsi" for
+    "Paris"), the most common typo, counts as one edit instead of two.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return None
+    before = None
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            distance = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b))
+            if i > 1 and j > 1 and char_a == b[j - 2] and a[i - 2] == char_b:
+                distance = min(distance, before[j - 2] + 1)
+            current.append(distance)
+        # A transposition only reaches back to a row no better than this one, so stopping here is safe
+        if min(current) > limit:
+            return None
+        before, previous = previous, current
+    return previous[-1] if previous[-1] <= limit else None
+
+
+class LocationIndex:
+    """Airports, metros and cities searchable by code, name, prefix or near-miss spelling.
+
+    Every name is normalized into a key and the keys are kept in one sorted
+    list, with the matching location in a parallel array. Exact and prefix
+    lookups are binary searches; the fuzzy fallback only compares keys of
+    similar length. A metro such as NYC, or a city with several airports,
+    resolves to all of its airports at once.
+    """
+
+    def __init__(self, airports: Sequence[tuple], metros: Dict[str, tuple], aliases: Dict[str, str], countries: Dict[str, str]):
+        self.countries = countries
+        self.locations: List[Location] = []
+        self._codes: Dict[str, int] = {}
+        entries = set()  # (key, location, primary); non-primary keys are word suffixes, matched by prefix only
+
+        def add(location: Location) -> int:
+            self.locations.append(location)
+            return len(self.locations) - 1
+
+        def add_key(text: str, location: int) -> None:
+            key = normalize(text)
+            if not key:
+                return
+            entries.add((key, location, True))
+            words = key.split(' ')
+            for i in range(1, len(words)):
+                entries.add((' '.join(words[i:]), location, False))
+
+        metro_airports = defaultdict(list)
+        city_airports = defaultdict(list)
+        for code, name, city, country, metro in airports:
+            if metro:
+                metro_airports[metro].append(code)
+            else:
+                city_airports[(normalize(city), country)].append(code)
+
+        # Metros first so an airport sharing a metro's code (e.g. SHA) takes the code
+        groups = {}
+        for metro, (name, country) in metros.items():
+            location = add(Location(metro, name, name, country, 'metro', tuple(metro_airports[metro])))
+            self._codes[metro] = location
+            groups[(normalize(name), country)] = location
+            add_key(name, location)
+        for (city, country), codes in city_airports.items():
+            if len(codes) > 1:
+                name = next(row[2] for row in airports if row[0] == codes[0])
+                groups[(city, country)] = location = add(Location(None, name, name, country, 'city', tuple(codes)))
+                add_key(name, location)
+
+        for code, name, city, country, metro in airports:
+            location = add(Location(code, name, city, country, 'airport', (code,)))
+            self._codes[code] = location
+            add_key(name, location)
+            if not normalize(name).startswith(normalize(city)):
+                add_key(f"{city} {name}", location)
+            if (normalize(city), country) not in groups:
+                add_key(city, location)
+
+        for alias, code in aliases.items():
+            add_key(alias, self._codes[code])
+
+        ordered = sorted(entries)
+        self._keys = [key for key, _, _ in ordered]
+        self._targets = array('H', (location for _, location, _ in ordered))
+        self._primary = bytes(primary for _, _, primary in ordered)
+        self._letters = array('Q', (_letter_set(key) for key in self._keys))
+
+    def code(self, code: str) -> Optional[Location]:
+        location = self._codes.get(code.upper())
+        return None if location is None else self.locations[location]
+
+    def _exact_and_prefix(self, key: str) -> Tuple[List[int], List[int]]:
+        exact, prefix = [], []
+        start = bisect_left(self._keys, key)
+        end = min(start + MAX_PREFIX_ENTRIES, len(self._keys))
+        for i in range(start, end):
+            if not self._keys[i].startswith(key):
+                break
+            if self._keys[i] == key and self._primary[i]:
+                exact.append(self._targets[i])
+            elif len(key) >= MIN_PREFIX_LENGTH:
+                prefix.append(self._targets[i])
+        return exact, prefix
+
+    def _fuzzy(self, key: str) -> List[int]:
+        limit = 1 if len(key) <= 6 else 2
+        letters = _letter_set(key)
+        scored = []
+        for i, candidate in enumerate(self._keys):
+            # Each edit adds or removes at most two letters from the set; skip keys too different to be close
+            if bin(letters ^ self._letters[i]).count('1') > 2 * limit or abs(len(key) - len(candidate)) > limit:
+                continue
+            distance = _edit_distance(key, candidate, limit)
+            if distance is not None:
+                scored.append((distance, self._targets[i]))
+        return [location for _, location in sorted(scored)]
+
+    def _country(self, hint: str) -> Optional[str]:
+        hint = hint.strip()
+        if hint.upper() in self.countries:
+            return hint.upper()
+        key = normalize(hint)
+        return next((code for code, name in self.countries.items() if normalize(name) == key), None)
+
+    def search(self, query: str, limit: int = 5) -> List[Tuple[Location, str]]:
+        """Return up to ``limit`` ``(location, match)`` pairs, best matches first.
+
+        ``match`` is ``exact``, ``prefix`` or ``fuzzy``. A trailing country,
+        as in ``"San Jose, US"`` or ``"San Jose, Costa Rica"``, narrows the
+        results when it names a known country and is ignored otherwise.
+        """
+        text, _, hint = query.rpartition(',')
+        country = self._country(hint) if text.strip() else None
+        if country is None:
+            text = query
+
+        key = normalize(text)
+        if not key:
+            return []
+        code = self._codes.get(text.strip().upper()) if _CODE.match(text.strip()) else None
+        exact, prefix = self._exact_and_prefix(key)
+        tiers = [([] if code is None else [code]) + exact, prefix]
+        if not tiers[0] and not prefix:
+            tiers.append(self._fuzzy(key))
+
+        results = []
+        seen = set()
+        for match, locations in zip(_TIERS, tiers):
+            for i in locations:
+                location = self.locations[i]
+                if i in seen or (country and location.country != country):
+                    continue
+                seen.add(i)
+                results.append((location, match))
+        return results[:limit]
+
+    def resolve(self, value: str) -> str:
+        """Turn a user-supplied location into a Google Flights ``departure_id``/``arrival_id``.
+
+        Airport codes and kgmids pass through, including codes this index does
+        not list, so valid input is never rejected. Metro codes (e.g. NYC)
+        expand to their airports. Anything else is searched by name; the best
+        matches must name a single place, or a metro or city together with
+        its own airports, otherwise the candidates are reported.
+        """
+        value = value.strip()
+        parts = [part.strip() for part in value.split(',')]
+        if all(_KGMID.match(part) or (_CODE.match(part) and (part.isupper() or self.code(part))) for part in parts):
+            resolved = []
+            for part in parts:
+                location = None if _KGMID.match(part) else self.code(part)
+                resolved.extend(location.airports if location else [part])
+            return ','.join(dict.fromkeys(resolved))
+
+        matches = self.search(value, limit=MAX_PREFIX_ENTRIES)
+        if not matches:
+            raise LocationError(f"No airport or city matches '{value}'.")
+        best = [location for location, match in matches if match == matches[0][1]]
+        groups = [location for location in best if location.kind != 'airport']
+        if len(best) == 1:
+            location = best[0]
+        elif len(groups) == 1 and all(set(location.airports) <= set(groups[0].airports) for location in best):
+            location = groups[0]
+        else:
+            candidates = '; '.join(location.describe(self.countries) for location in best[:5])
+            raise LocationError(f"'{value}' could be any of: {candidates}.")
+        logger.debug(f"Resolved '{value}' to {location.ids}")
+        return location.ids
+
+
+@lru_cache(maxsize=None)
+def location_index() -> LocationIndex:
+    """Build the index from the bundled data once per container."""
+    from location_data import AIRPORTS, ALIASES, COUNTRIES, METROS
+
+    return LocationIndex(AIRPORTS, METROS, ALIASES, COUNTRIES)
+
+
+def resolve_airports(value: str) -> str:
+    """Resolve a city, airport name or code to the airport codes Google Flights accepts."""
+    return location_index().resolve(value)
@@ -0,0 +1,196 @@
+import heapq
+import math
+import os
+from array import array
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from aws_lambda_powertools import Logger
+
+from results import FlightOption, HotelOption
+
+logger = Logger(child=True)
+
+# What an hour of travel time is worth when flights are ranked by 'value', per hour in the search
+# currency (DEFAULT_CURRENCY): flights are ranked before prices are converted to the requested currency
+VALUE_OF_TIME_PER_HOUR = float(os.environ.get('RANKING_VALUE_OF_TIME_PER_HOUR', '30'))
+# Most Google Hotels pages fetched while looking for enough matching properties
+MAX_HOTEL_PAGES = int(os.environ.get('MAX_HOTEL_PAGES', '3'))
+# Upper bound on max_results, whatever the agent asks for
+MAX_RESULTS = int(os.environ.get('RANKING_MAX_RESULTS', '10'))
+
+# Named departure windows, as [start hour, end hour)
+TIME_OF_DAY = {
+    'night': (0, 5),
+    'morning': (5, 12),
+    'afternoon': (12, 18),
+    'evening': (18, 24),
+}
+
+FLIGHT_SORTS = ('price', 'duration', 'value')
+HOTEL_SORTS = ('price', 'rating', 'value')
+
+NAN = math.nan
+
+
+def _number(value) -> float:
+    return NAN if value is None or isinstance(value, bool) else float(value)
+
+
+def parse_time_window(value: Optional[str]) -> Optional[Tuple[float, float]]:
+    """Parse ``morning``/``afternoon``/``evening``/``night`` or ``HH-HH`` into an hour range."""
+    if not value:
+        return None
+    value = value.strip().lower()
+    if value in TIME_OF_DAY:
+        return TIME_OF_DAY[value]
+    start, _, end = value.partition('-')
+    try:
+        window = (float(start), float(end))
+    except ValueError:
+        raise ValueError(f"Invalid departure time '{value}'. Use {', '.join(TIME_OF_DAY)} or an hour range such as 06-11.")
+    if not (0 <= window[0] < window[1] <= 24):
+        raise ValueError(f"Invalid departure time '{value}'. Hours must be between 0 and 24, start before end.")
+    return window
+
+
+def _departure_hour(option: FlightOption) -> float:
+    # Leg times look like "2025-03-07 17:05"
+    time_of_day = option.legs[0].departure_time.rpartition(' ')[2] if option.legs and option.legs[0].departure_time else ''
+    hours, _, minutes = time_of_day.partition(':')
+    try:
+        return int(hours) + int(minutes) / 60
+    except ValueError:
+        return NAN
+
+
+def _top_k(candidates: Sequence[int], k: int, score: Callable[[int], float]) -> List[int]:
+    # Ties keep SerpAPI's order
+    return heapq.nsmallest(k, candidates, key=lambda i: (score(i), i))
+
+
+def rank_flights(
+    options: List[FlightOption],
+    k: int,
+    sort_by: str = 'price',
+    max_price: float = None,
+    max_stops: int = None,
+    departure_window: Tuple[float, float] = None,
+) -> List[FlightOption]:
+    """Return the ``k`` best priced options that pass every filter.
+
+    Prices, stops, durations and departure hours are read once into arrays;
+    the filters then only compare numbers and ``heapq`` selects the top ``k``
+    without sorting every candidate. Options with no price never qualify.
+    """
+    if sort_by not in FLIGHT_SORTS:
+        raise ValueError(f"Unknown sort_by '{sort_by}'. Use one of: {', '.join(FLIGHT_SORTS)}")
+
+    prices = array('d', (_number(option.price) for option in options))
+    stops = array('d', (option.stops for option in options))
+    durations = array('d', (_number(option.total_duration) for option in options))
+    hours = array('d', (_departure_hour(option) for option in options)) if departure_window else None
+
+    candidates = [
+        i for i in range(len(options))
+        if not math.isnan(prices[i])
+        and (max_price is None or prices[i] <= max_price)
+        and (max_stops is None or stops[i] <= max_stops)
+        and (hours is None or departure_window[0] <= hours[i] < departure_window[1])
+    ]
+
+    if sort_by == 'price':
+        score = prices.__getitem__
+    elif sort_by == 'duration':
+        # Unknown durations rank last
+        score = lambda i: math.inf if math.isnan(durations[i]) else durations[i]
+    else:
+        hourly = VALUE_OF_TIME_PER_HOUR / 60
+        score = lambda i: prices[i] + (0 if math.isnan(durations[i]) else durations[i] * hourly)
+    return [options[i] for i in _top_k(candidates, k, score)]
+
+
+def stay_cost(option: HotelOption, nights: int) -> Optional[float]:
+    """Cost of one room for the whole stay: ``total_rate`` when known, otherwise every night at ``rate_per_night``."""
+    if option.total_rate is not None:
+        return option.total_rate
+    if option.rate_per_night is not None:
+        return option.rate_per_night * nights
+    return None
+
+
+def _matches_amenities(option: HotelOption, amenities: Sequence[str]) -> bool:
+    offered = [amenity.lower() for amenity in option.amenities]
+    return all(any(wanted in amenity for amenity in offered) for wanted in amenities)
+
+
+def _hotel_pages(fetch_page: Callable[[Optional[str]], Dict], max_pages: int) -> Iterator[Dict]:
+    """Yield result pages, only requesting the next one when the caller asks for it."""
+    token = None
+    for _ in range(max_pages):
+        results = fetch_page(token)
+        yield results
+        token = (results.get('serpapi_pagination') or {}).get('next_page_token')
+        if not token or results.get('error'):
+            return
+
+
+def rank_hotels(
+    fetch_page: Callable[[Optional[str]], Dict],
+    k: int,
+    sort_by: str = 'price',
+    max_price: float = None,
+    min_rating: float = None,
+    amenities: Sequence[str] = (),
+    max_pages: int = None,
+) -> Tuple[List[HotelOption], Optional[str]]:
+    """Return ``(options, error)``: the ``k`` best properties that pass every filter.
+
+    ``fetch_page(next_page_token)`` returns one page of Google Hotels results.
+    Further pages are only fetched while fewer than ``k`` properties qualify,
+    up to ``max_pages``. ``max_price`` applies to the nightly rate. ``error``
+    is set when the first page fails; a later failing page only ends the scan.
+    """
+    if sort_by not in HOTEL_SORTS:
+        raise ValueError(f"Unknown sort_by '{sort_by}'. Use one of: {', '.join(HOTEL_SORTS)}")
+    wanted = [amenity.strip().lower() for amenity in amenities if amenity.strip()]
+
+    options = []
+    rates = array('d')
+    ratings = array('d')
+    candidates = []
+    for page, results in enumerate(_hotel_pages(fetch_page, max_pages or MAX_HOTEL_PAGES)):
+        if results.get('error'):
+            if page == 0:
+                return [], results['error']
+            logger.warning(f"Stopped paging hotels after page {page}: {results['error']}")
+            break
+
+        for prop in results.get('properties') or []:
+            option = HotelOption(prop)
+            i = len(options)
+            options.append(option)
+            rates.append(_number(option.rate_per_night))
+            ratings.append(_number(option.overall_rating))
+            if (
+                not math.isnan(rates[i])
+                and (max_price is None or rates[i] <= max_price)
+                and (min_rating is None or ratings[i] >= min_rating)
+                and (not wanted or _matches_amenities(option, wanted))
+            ):
+                candidates.append(i)
+        if len(candidates) >= k:
+            break
+
+    if sort_by == 'price':
+        score = rates.__getitem__
+    elif sort_by == 'rating':
+        # Best rated first, cheaper first among equals; unrated last
+        score = lambda i: (math.inf if math.isnan(ratings[i]) else -ratings[i], rates[i])
+    else:
+        # Nightly price per rating point; unrated last
+        score = lambda i: rates[i] / ratings[i] if ratings[i] > 0 else math.inf
+    return [options[i] for i in _top_k(candidates, k, score)], None
+
+
+def clamp_results(max_results: int) -> int:
+    return min(max(max_results, 1), MAX_RESULTS)
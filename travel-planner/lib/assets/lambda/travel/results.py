@@ -0,0 +1,108 @@
+import os
+from typing import Dict, List, Optional, Sequence
+
+from shared.currency import convert, parse_amount
+
+
+def parse_price(value) -> Optional[float]:
+    """Parse a SerpAPI price (number, ``"$1,234"``, ``"1.234,50 €"`` or ``{"extracted_lowest": ...}``) into a float."""
+    if isinstance(value, dict):
+        value = value.get('extracted_lowest', value.get('lowest'))
+    return parse_amount(value)[0]
+
+
+def _fields_from_env(name: str, default: str) -> List[str]:
+    return [field.strip() for field in os.environ.get(name, default).split(',') if field.strip()]
+
+
+class FlightLeg:
+    __slots__ = ('departure_airport', 'departure_time', 'arrival_airport', 'arrival_time', 'airline', 'flight_number', 'duration')
+
+    def __init__(self, leg: Dict):
+        departure = leg.get('departure_airport') or {}
+        arrival = leg.get('arrival_airport') or {}
+        self.departure_airport = departure.get('id')
+        self.departure_time = departure.get('time')
+        self.arrival_airport = arrival.get('id')
+        self.arrival_time = arrival.get('time')
+        self.airline = leg.get('airline')
+        self.flight_number = leg.get('flight_number')
+        self.duration = leg.get('duration')
+
+    def to_dict(self) -> Dict:
+        return {field: getattr(self, field) for field in self.__slots__}
+
+
+class FlightOption:
+    """The parts of a Google Flights result the agent reasons over."""
+
+    # Fields holding an amount in the search currency
+    PRICE_FIELDS = ('price',)
+
+    __slots__ = ('price', 'airline', 'stops', 'total_duration', 'legs', 'layovers', 'type', 'carbon_emissions', 'booking_token')
+
+    # Returned when the caller does not ask for detail
+    DEFAULT_FIELDS = _fields_from_env('FLIGHT_FIELDS', 'price,airline,stops,total_duration,legs')
+
+    def __init__(self, flight: Dict):
+        legs = flight.get('flights') or []
+        self.price = parse_price(flight.get('price'))
+        self.legs = [FlightLeg(leg) for leg in legs]
+        self.airline = legs[0].get('airline') if legs else None
+        self.stops = max(len(legs) - 1, 0)
+        self.total_duration = flight.get('total_duration')
+        self.layovers = [layover.get('id') for layover in flight.get('layovers') or []]
+        self.type = flight.get('type')
+        self.carbon_emissions = (flight.get('carbon_emissions') or {}).get('this_flight')
+        self.booking_token = flight.get('booking_token')
+
+    def to_dict(self, fields: Sequence[str] = None) -> Dict:
+        output = {}
+        for field in fields or self.__slots__:
+            value = getattr(self, field)
+            output[field] = [leg.to_dict() for leg in value] if field == 'legs' else value
+        return output
+
+
+class HotelOption:
+    """The parts of a Google Hotels property the agent reasons over."""
+
+    # Fields holding an amount in the search currency
+    PRICE_FIELDS = ('rate_per_night', 'total_rate')
+
+    __slots__ = ('name', 'rate_per_night', 'total_rate', 'overall_rating', 'reviews', 'hotel_class', 'amenities', 'check_in_time', 'check_out_time', 'link')
+
+    # Returned when the caller does not ask for detail
+    DEFAULT_FIELDS = _fields_from_env('HOTEL_FIELDS', 'name,rate_per_night,total_rate,overall_rating,reviews,hotel_class')
+
+    def __init__(self, prop: Dict):
+        self.name = prop.get('name')
+        self.rate_per_night = parse_price(prop.get('rate_per_night', prop.get('price')))
+        self.total_rate = parse_price(prop.get('total_rate'))
+        self.overall_rating = prop.get('overall_rating')
+        self.reviews = prop.get('reviews')
+        self.hotel_class = prop.get('extracted_hotel_class', prop.get('hotel_class'))
+        self.amenities = prop.get('amenities') or []
+        self.check_in_time = prop.get('check_in_time')
+        self.check_out_time = prop.get('check_out_time')
+        self.link = prop.get('link')
+
+    def to_dict(self, fields: Sequence[str] = None) -> Dict:
+        return {field: getattr(self, field) for field in fields or self.__slots__}
+
+
+def select_fields(option_type, detail: bool) -> Sequence[str]:
+    """Fields to serialize: everything in detail mode, otherwise the configured defaults."""
+    if detail:
+        return option_type.__slots__
+    return [field for field in option_type.DEFAULT_FIELDS if field in option_type.__slots__]
+
+
+def convert_prices(options: Sequence, source: str, target: str) -> None:
+    """Convert every price field of ``options`` from ``source`` into ``target`` in place, in one batch."""
+    if source == target:
+        return
+    slots = [(option, field) for option in options for field in option.PRICE_FIELDS if getattr(option, field) is not None]
+    converted = convert([getattr(option, field) for option, field in slots], source, target)
+    for (option, field), amount in zip(slots, converted.tolist()):
+        setattr(option, field, round(amount, 2))
@@ -0,0 +1,221 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+from aws_lambda_powertools import Logger
+
+from shared.observability import record_cache
+
+logger = Logger(child=True)
+
+# Seconds a cached response stays valid, per SerpAPI engine. Fares move faster than room rates.
+DEFAULT_TTLS = {
+    'google_flights': 900,
+    'google_hotels': 3600,
+}
+DEFAULT_TTL = 600
+
+
+# Free text SerpAPI matches regardless of case and spacing
+_FREE_TEXT_PARAMS = {'q'}
+# Codes SerpAPI reads in either case, by the case they are normalized to
+_UPPERCASE_PARAMS = {'currency'}
+_LOWERCASE_PARAMS = {'hl', 'gl'}
+# Airport codes, alone or comma-separated; other ids (kgmids such as /m/05qtj) are case-sensitive
+_AIRPORT_PARAMS = {'departure_id', 'arrival_id'}
+_AIRPORT_CODES = re.compile(r'[A-Za-z]{3}(,[A-Za-z]{3})*')
+
+
+def normalize_airport_id(value: str) -> str:
+    """Uppercase IATA airport codes (alone or comma-separated); return kgmids and other ids unchanged."""
+    if _AIRPORT_CODES.fullmatch(value.strip()):
+        return value.strip().upper()
+    return value
+
+
+def _normalize(key: str, value) -> str:
+    if not isinstance(value, str):
+        return json.dumps(value, sort_keys=True)
+    if key in _FREE_TEXT_PARAMS:
+        return ' '.join(value.split()).lower()
+    if key in _AIRPORT_PARAMS:
+        return normalize_airport_id(value)
+    if key in _UPPERCASE_PARAMS:
+        return value.strip().upper()
+    if key in _LOWERCASE_PARAMS:
+        return value.strip().lower()
+    # Anything else, such as next_page_token, may be an opaque case-sensitive token
+    return value
+
+
+def canonical_key(params: Dict) -> str:
+    """Build a cache key from search params.
+
+    ``api_key`` and empty values are dropped. Free-text queries are case- and
+    whitespace-normalized and airport, currency and locale codes case-
+    normalized, so rephrased but equivalent searches share an entry; other
+    values, such as page tokens, are kept verbatim.
+    """
+    canonical = sorted(
+        (key.strip().lower(), _normalize(key.strip().lower(), value))
+        for key, value in params.items()
+        if key != 'api_key' and value not in (None, '')
+    )
+    return hashlib.sha256(json.dumps(canonical, separators=(',', ':')).encode()).hexdigest()
+
+
+class MemoryBackend:
+    """Process-local LRU store; survives warm invocations of the same container."""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, value: Dict, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.time() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class FileBackend:
+    """One JSON file per entry under ``directory``, typically in Lambda's ``/tmp``."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str) -> Optional[Dict]:
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        if entry['expires_at'] <= time.time():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        return entry['value']
+
+    def set(self, key: str, value: Dict, ttl: float) -> None:
+        path = self._path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({'expires_at': time.time() + ttl, 'value': value}, f)
+        os.replace(tmp_path, path)
+
+
+class DynamoDBBackend:
+    """Shared store in a DynamoDB table keyed on ``cache_key``.
+
+    ``endpoint_url`` points the client at a DynamoDB-compatible stand-in such as
+    DynamoDB Local. ``expires_at`` can be enabled as the table's TTL attribute
+    so DynamoDB also purges expired items on its own. ``boto3`` comes with the
+    Lambda runtime and is only imported when this backend is selected.
+    """
+
+    def __init__(self, table_name: str, endpoint_url: Optional[str] = None):
+        import boto3
+
+        self.table = boto3.resource('dynamodb', endpoint_url=endpoint_url).Table(table_name)
+
+    def get(self, key: str) -> Optional[Dict]:
+        item = self.table.get_item(Key={'cache_key': key}).get('Item')
+        if item is None or int(item['expires_at']) <= time.time():
+            return None
+        return json.loads(item['value'])
+
+    def set(self, key: str, value: Dict, ttl: float) -> None:
+        self.table.put_item(Item={
+            'cache_key': key,
+            'expires_at': int(time.time() + ttl),
+            'value': json.dumps(value, separators=(',', ':')),
+        })
+
+
+class SearchCache:
+    """Caches SerpAPI responses keyed on normalized search params."""
+
+    def __init__(self, backend, ttls: Dict[str, float] = None, default_ttl: float = DEFAULT_TTL):
+        self.backend = backend
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.default_ttl = default_ttl
+
+    def ttl_for(self, engine: str) -> float:
+        return self.ttls.get(engine, self.default_ttl)
+
+    def get_or_fetch(self, params: Dict, fetch: Callable[[Dict], Dict]) -> Dict:
+        """Return the cached response for ``params``, calling ``fetch`` on a miss.
+
+        Error responses are not cached, and a failing backend only costs a
+        cache miss rather than failing the search.
+        """
+        key = canonical_key(params)
+        try:
+            cached = self.backend.get(key)
+        except Exception as e:
+            logger.warning(f"Search cache read failed: {str(e)}")
+            cached = None
+        if cached is not None:
+            logger.debug(f"Search cache hit for {params.get('engine')}")
+            record_cache('search_cache', 'hit')
+            return cached
+        record_cache('search_cache', 'miss')
+
+        results = fetch(params)
+        ttl = self.ttl_for(params.get('engine'))
+        if ttl > 0 and not results.get('error'):
+            try:
+                self.backend.set(key, results, ttl)
+            except Exception as e:
+                logger.warning(f"Search cache write failed: {str(e)}")
+        return results
+
+
+def build_search_cache() -> SearchCache:
+    """Build the cache configured by the ``SEARCH_CACHE_*`` environment variables."""
+    backend_name = os.environ.get('SEARCH_CACHE_BACKEND', 'memory').lower()
+    if backend_name == 'file':
+        backend = FileBackend(os.environ.get('SEARCH_CACHE_DIR', '/tmp/search-cache'))
+    elif backend_name == 'dynamodb':
+        backend = DynamoDBBackend(
+            os.environ['SEARCH_CACHE_TABLE'],
+            endpoint_url=os.environ.get('DYNAMODB_ENDPOINT_URL') or None,
+        )
+    elif backend_name == 'memory':
+        backend = MemoryBackend(int(os.environ.get('SEARCH_CACHE_MAX_ENTRIES', '256')))
+    else:
+        raise ValueError(f"Unknown SEARCH_CACHE_BACKEND: {backend_name}")
+
+    ttls = {
+        engine: float(os.environ.get(f"SEARCH_CACHE_TTL_{engine.upper()}", ttl))
+        for engine, ttl in DEFAULT_TTLS.items()
+    }
+    return SearchCache(backend, ttls)
+
+
+search_cache = build_search_cache()
@@ -0,0 +1,354 @@
+import os
+
+from datetime import date
+from typing import List, Dict, Optional
+from typing_extensions import Annotated
+
+from aws_lambda_powertools import Logger, Tracer
+from aws_lambda_powertools.event_handler.api_gateway import Router
+from aws_lambda_powertools.event_handler.openapi.params import Query
+
+from batch_search import MATRIX_COLUMNS, MAX_BATCH_SEARCHES, expand_routes, parse_weekdays, run_batch, split_list
+from locations import location_index, resolve_airports
+from ranking import clamp_results, parse_time_window, rank_flights, rank_hotels, stay_cost
+from results import FlightOption, HotelOption, convert_prices, select_fields
+from search_cache import search_cache
+from shared.currency import DEFAULT_CURRENCY, CurrencyError, convert, normalize_currency
+from shared.observability import log_payload
+from shared.scheduler import scheduler
+from trip_cost import ASK_USER, plan_trip, search_error
+
+API_KEY = os.environ.get('API_KEY')
+
+tracer = Tracer()
+logger = Logger(child=True)
+# Routes of the travel action group, served by agent.py or together with the portfolio routes by unified_agent.py
+router = Router()
+
+# Info of the action group's OpenAPI schema
+OPENAPI_INFO = {
+    'title': "Travel Planner Bot API",
+    'version': "1.0.0",
+    'description': "Travel Planner API for searching the best flight and hotel deals",
+    'tags': ["travel", "flights", "hotels"],
+}
+
+
+def _flight_params(departure_id: str, arrival_id: str, outbound_date: str, return_date: str) -> Dict:
+    return {
+        "engine": "google_flights",
+        "departure_id": departure_id,
+        "arrival_id": arrival_id,
+        "outbound_date": outbound_date,
+        "return_date": return_date,
+        "currency": DEFAULT_CURRENCY,
+        "hl": "en",
+        "api_key": API_KEY
+    }
+
+
+def _hotel_params(q: str, check_in_date: str, check_out_date: str, adults: int, country_search: str) -> Dict:
+    return {
+        "engine": "google_hotels",
+        "q": q,
+        "check_in_date": check_in_date,
+        "check_out_date": check_out_date,
+        "adults": str(adults),
+        "currency": DEFAULT_CURRENCY,
+        "gl": country_search.lower(),
+        "hl": "en",
+        "api_key": API_KEY
+    }
+
+
+def _to_search_currency(amount: float, currency: str) -> float:
+    """Convert a user-supplied limit into the currency searches are priced in."""
+    if amount is None or currency == DEFAULT_CURRENCY:
+        return amount
+    return float(convert([amount], currency, DEFAULT_CURRENCY)[0])
+
+
+def _loggable(params: Dict) -> Dict:
+    return {key: value for key, value in params.items() if key != 'api_key'}
+
+
+@router.get("/get_flights", description="Gets the best flight options from Google Flights, filtered and ranked")
+@tracer.capture_method
+def get_flights(
+    departure_id: Annotated[str, Query(description="Parameter defines the departure airport code, location kgmid, or city or airport name. An airport code is an uppercase 3-letter code. For example, CDG is Paris Charles de Gaulle Airport and AUS is Austin-Bergstrom International Airport. City and airport names such as Paris or Heathrow are resolved locally.")], 
+    arrival_id: Annotated[str, Query(description="Parameter defines the arrival airport code, location kgmid, or city or airport name. An airport code is an uppercase 3-letter code. For example, CDG is Paris Charles de Gaulle Airport and AUS is Austin-Bergstrom International Airport. City and airport names such as Paris or Heathrow are resolved locally.")], 
+    outbound_date: Annotated[str, Query(description="Parameter defines the outbound date. The format is YYYY-MM-DD. e.g. 2024-02-08")], 
+    return_date: Annotated[str, Query(description="Parameter defines the return date. The format is YYYY-MM-DD. e.g. 2024-02-08")],
+    num_passengers: Annotated[int, Query(description="Number of passengers traveling")] = 1,
+    detail: Annotated[bool, Query(description="Return every available field for each flight, including layovers and booking token. Only set when the user asks for details.")] = False,
+    max_price: Annotated[float, Query(description="Only return flights whose price per passenger is at most this, in the requested currency")] = None,
+    max_stops: Annotated[int, Query(description="Only return flights with at most this many stops. 0 for nonstop")] = None,
+    departure_time: Annotated[str, Query(description="Only return flights leaving in this window: morning, afternoon, evening, night, or an hour range such as 06-11")] = None,
+    sort_by: Annotated[str, Query(description="How to rank flights: 'price' (cheapest first), 'duration' (shortest first) or 'value' (price plus travel time)")] = "price",
+    max_results: Annotated[int, Query(description="Maximum number of flights to return")] = 3,
+    currency: Annotated[str, Query(description="Three-letter code of the currency to quote prices in, and of max_price. e.g. USD, EUR or JPY")] = DEFAULT_CURRENCY,
+) -> Dict:
+    try:
+        departure_window = parse_time_window(departure_time)
+        departure_id = resolve_airports(departure_id)
+        arrival_id = resolve_airports(arrival_id)
+        currency = normalize_currency(currency)
+        max_price = _to_search_currency(max_price, currency)
+    except ValueError as e:
+        return {
+            'error': str(e) + ASK_USER,
+            'total_cost': 0
+        }
+
+    params = _flight_params(departure_id, arrival_id, outbound_date, return_date)
+
+    logger.info(f"params: {_loggable(params)}")
+
+    results = search_cache.get_or_fetch(params, scheduler.search)
+
+    log_payload(logger, "response", results)
+
+    if results.get('error'):
+        return search_error(results['error'], 'google_flights')
+
+    options = [FlightOption(flight) for flight in (results.get("best_flights") or []) + (results.get("other_flights") or [])]
+    if not options:
+        return {
+            'error': "Unknown Error.",
+            'total_cost': 0
+        }
+
+    try:
+        ranked = rank_flights(options, clamp_results(max_results), sort_by, max_price, max_stops, departure_window)
+        convert_prices(ranked, DEFAULT_CURRENCY, currency)
+    except ValueError as e:
+        return {
+            'error': str(e) + ASK_USER,
+            'total_cost': 0
+        }
+    if not ranked:
+        return {
+            'error': f"None of the {len(options)} flights found match the filters. Ask the user whether to relax the price, stops or departure time.",
+            'total_cost': 0
+        }
+
+    fields = select_fields(FlightOption, detail)
+    # The cheapest returned flight for every passenger
+    per_passenger_cost = min(option.price for option in ranked)
+    return {
+        'flights': [option.to_dict(fields) for option in ranked],
+        'num_passengers': num_passengers,
+        'total_cost': round(per_passenger_cost * num_passengers, 2),
+        'per_passenger_cost': round(per_passenger_cost, 2),
+        'currency': currency
+    }
+
+
+@router.get("/resolve_location", description="Looks up the airport codes for a city, airport name or code without searching flights")
+@tracer.capture_method
+def resolve_location(
+    query: Annotated[str, Query(description="City, airport name or code to look up. e.g. Paris, Heathrow or NYC. Add a country to narrow it down, e.g. San Jose, Costa Rica")],
+    max_results: Annotated[int, Query(description="Maximum number of matches to return")] = 5,
+) -> Dict:
+    index = location_index()
+    matches = index.search(query, clamp_results(max_results))
+    if not matches:
+        return {
+            'error': f"No airport or city matches '{query}'." + ASK_USER,
+            'matches': []
+        }
+    return {
+        'query': query,
+        # 'id' is what get_flights accepts as departure_id or arrival_id
+        'matches': [dict(location.to_dict(index.countries), match=match) for location, match in matches]
+    }
+
+
+@router.get("/search_flights_batch", description="Searches many routes and dates at once and returns the cheapest round trips, cheapest first")
+@tracer.capture_method
+def search_flights_batch(
+    departure_ids: Annotated[List[str], Query(description="Comma-separated departure airport codes, location kgmids or city names. e.g. AUS,DFW")],
+    arrival_ids: Annotated[List[str], Query(description="Comma-separated arrival airport codes, location kgmids or city names. e.g. CDG,ORY")],
+    outbound_date_start: Annotated[str, Query(description="First outbound date to consider. The format is YYYY-MM-DD. e.g. 2024-03-01")],
+    outbound_date_end: Annotated[str, Query(description="Last outbound date to consider. The format is YYYY-MM-DD. e.g. 2024-03-31")],
+    trip_length_days: Annotated[int, Query(description="Number of days between outbound and return flights. e.g. 2 for a Friday to Sunday weekend")] = 7,
+    outbound_weekdays: Annotated[Optional[List[str]], Query(description="Optional comma-separated weekdays the outbound flight may leave on. e.g. fri,sat for weekend trips")] = None,
+    num_passengers: Annotated[int, Query(description="Number of passengers traveling")] = 1,
+    top_n: Annotated[int, Query(description="Maximum number of cheapest options to return")] = 10,
+    currency: Annotated[str, Query(description="Three-letter code of the currency to quote prices in. e.g. USD, EUR or JPY")] = DEFAULT_CURRENCY,
+) -> Dict:
+    try:
+        currency = normalize_currency(currency)
+        routes = expand_routes(
+            [resolve_airports(departure_id) for departure_id in split_list(departure_ids)],
+            [resolve_airports(arrival_id) for arrival_id in split_list(arrival_ids)],
+            outbound_date_start,
+            outbound_date_end,
+            trip_length_days,
+            parse_weekdays(outbound_weekdays or []),
+        )
+    except ValueError as e:
+        return {
+            'error': str(e) + ASK_USER,
+            'total_cost': 0
+        }
+
+    if not routes:
+        return {
+            'error': "No dates in the window match the requested weekdays. Ask the user for a wider date window.",
+            'total_cost': 0
+        }
+    if len(routes) > MAX_BATCH_SEARCHES:
+        return {
+            'error': f"{len(routes)} searches requested but at most {MAX_BATCH_SEARCHES} are allowed. Ask the user to narrow the airports, dates or weekdays.",
+            'total_cost': 0
+        }
+
+    logger.info(f"batch searching {len(routes)} routes")
+
+    rows, failures = run_batch(routes, lambda route: search_cache.get_or_fetch(_flight_params(*route), scheduler.search))
+    rows = rows[:max(top_n, 1)]
+    if rows and currency != DEFAULT_CURRENCY:
+        try:
+            prices = convert([row[4] for row in rows], DEFAULT_CURRENCY, currency)
+        except ValueError as e:
+            return {
+                'error': str(e) + ASK_USER,
+                'total_cost': 0
+            }
+        for row, price in zip(rows, prices.tolist()):
+            row[4] = round(price, 2)
+
+    output = {
+        'columns': MATRIX_COLUMNS,
+        'rows': rows,
+        'num_searches': len(routes),
+        'num_passengers': num_passengers,
+        'currency': currency,
+    }
+    if rows:
+        per_passenger_cost = rows[0][4]
+        output.update({
+            'per_passenger_cost': per_passenger_cost,
+            'total_cost': round(per_passenger_cost * num_passengers, 2)
+        })
+    else:
+        output['total_cost'] = 0
+    if failures:
+        output['failures'] = failures
+    return output
+
+
+@router.get("/get_hotels", description="Gets the best hotel properties from Google Hotels, filtered and ranked")
+@tracer.capture_method
+def get_hotels(
+    q: Annotated[str, Query(description="Parameter defines the location. e.g. Bali Resorts")], 
+    check_in_date: Annotated[str, Query(description="Parameter defines the check-in date. The format is YYYY-MM-DD. e.g. 2024-02-10")], 
+    check_out_date: Annotated[str, Query(description="Parameter defines the check-out date. The format is YYYY-MM-DD. e.g. 2024-02-10")], 
+    num_rooms: Annotated[int, Query(description="Number of rooms needed")] = 1,
+    adults: Annotated[int, Query(description="Number of adults per room")] = 2,
+    country_search: Annotated[str, Query(description="Parameter defines the country to use for the Google Hotels search. It's a two-letter country code.")] = "us",
+    detail: Annotated[bool, Query(description="Return every available field for each property, including amenities and link. Only set when the user asks for details.")] = False,
+    max_price: Annotated[float, Query(description="Only return properties whose nightly rate is at most this, in the requested currency")] = None,
+    min_rating: Annotated[float, Query(description="Only return properties rated at least this, out of 5")] = None,
+    amenities: Annotated[Optional[List[str]], Query(description="Comma-separated amenities every property must offer. e.g. pool,free breakfast")] = None,
+    sort_by: Annotated[str, Query(description="How to rank properties: 'price' (cheapest first), 'rating' (best rated first) or 'value' (price per rating point)")] = "price",
+    max_results: Annotated[int, Query(description="Maximum number of properties to return")] = 3,
+    currency: Annotated[str, Query(description="Three-letter code of the currency to quote prices in, and of max_price. e.g. USD, EUR or JPY")] = DEFAULT_CURRENCY,
+) -> Dict:
+    try:
+        nights = (date.fromisoformat(check_out_date) - date.fromisoformat(check_in_date)).days
+        if nights <= 0:
+            raise ValueError("The check-out date must be after the check-in date.")
+        currency = normalize_currency(currency)
+        max_price = _to_search_currency(max_price, currency)
+    except ValueError as e:
+        return {
+            'error': str(e) + ASK_USER,
+            'total_cost': 0
+        }
+
+    params = _hotel_params(q, check_in_date, check_out_date, adults, country_search)
+
+    logger.info(f"params: {_loggable(params)}")
+
+    def fetch_page(next_page_token):
+        page_params = {**params, "next_page_token": next_page_token} if next_page_token else params
+        results = search_cache.get_or_fetch(page_params, scheduler.search)
+        log_payload(logger, "response", results)
+        return results
+
+    try:
+        ranked, error = rank_hotels(fetch_page, clamp_results(max_results), sort_by, max_price, min_rating, split_list(amenities or []))
+    except ValueError as e:
+        return {'error': str(e) + ASK_USER, 'total_cost': 0}
+    if error:
+        return search_error(error, 'google_hotels')
+    try:
+        convert_prices(ranked, DEFAULT_CURRENCY, currency)
+    except CurrencyError as e:
+        # Not a search failure: never reported as the engine being unavailable
+        return {'error': str(e) + ASK_USER, 'total_cost': 0}
+    if not ranked:
+        return {
+            'error': "No properties match the filters. Ask the user whether to relax the price, rating or amenities.",
+            'total_cost': 0
+        }
+
+    fields = select_fields(HotelOption, detail)
+    # The cheapest returned stay for every room
+    per_room_cost = min(stay_cost(option, nights) for option in ranked)
+    return {
+        'properties': [option.to_dict(fields) for option in ranked],
+        'num_rooms': num_rooms,
+        'adults_per_room': adults,
+        'nights': nights,
+        'total_cost': round(per_room_cost * num_rooms, 2),
+        'per_room_cost': round(per_room_cost, 2),
+        'currency': currency
+    }
+
+
+@router.get("/plan_trip_cost", description="Finds the cheapest flight and hotel for a trip, checks whether the stock portfolio covers the total and plans which shares to sell, all in one call")
+@tracer.capture_method
+def plan_trip_cost(
+    departure_id: Annotated[str, Query(description="Departure airport code, location kgmid, or city or airport name. e.g. AUS or Austin")],
+    arrival_id: Annotated[str, Query(description="Arrival airport code, location kgmid, or city or airport name. e.g. CDG or Paris")],
+    outbound_date: Annotated[str, Query(description="Outbound date, also used as the hotel check-in date. The format is YYYY-MM-DD. e.g. 2024-02-08")],
+    return_date: Annotated[str, Query(description="Return date, also used as the hotel check-out date. The format is YYYY-MM-DD. e.g. 2024-02-15")],
+    hotel_location: Annotated[str, Query(description="Where to search for hotels. e.g. Paris or Bali Resorts")],
+    num_passengers: Annotated[int, Query(description="Number of passengers traveling")] = 1,
+    num_rooms: Annotated[int, Query(description="Number of hotel rooms needed")] = 1,
+    adults: Annotated[int, Query(description="Number of adults per room")] = 2,
+    country_search: Annotated[str, Query(description="Two-letter country code used for the Google Hotels search")] = "us",
+    strategy: Annotated[str, Query(description="Strategy for selling shares to pay for the trip: 'proportional', 'single_stock', 'whole_shares', 'min_positions' or 'tax_aware'")] = "proportional",
+    max_per_position: Annotated[float, Query(description="Maximum fraction of each position that may be sold, between 0 and 1")] = 1.0,
+    currency: Annotated[str, Query(description="Three-letter code of the currency to quote the trip cost and portfolio value in. e.g. USD, EUR or JPY")] = DEFAULT_CURRENCY,
+) -> Dict:
+    try:
+        nights = (date.fromisoformat(return_date) - date.fromisoformat(outbound_date)).days
+        if nights <= 0:
+            raise ValueError("The return date must be after the outbound date.")
+        currency = normalize_currency(currency)
+        departure_id = resolve_airports(departure_id)
+        arrival_id = resolve_airports(arrival_id)
+    except ValueError as e:
+        return {
+            'error': str(e) + ASK_USER,
+            'total_cost': 0
+        }
+
+    flight_params = _flight_params(departure_id, arrival_id, outbound_date, return_date)
+    hotel_params = _hotel_params(hotel_location, outbound_date, return_date, adults, country_search)
+    logger.info(f"planning trip: {_loggable(flight_params)} {_loggable(hotel_params)}")
+
+    return plan_trip(
+        lambda: search_cache.get_or_fetch(flight_params, scheduler.search),
+        lambda: search_cache.get_or_fetch(hotel_params, scheduler.search),
+        nights,
+        num_passengers,
+        num_rooms,
+        strategy,
+        max_per_position,
+        currency,
+    )
@@ -0,0 +1,168 @@
+import os
+from concurrent.futures import ThreadPoolExecutor, wait
+from functools import partial
+from typing import Callable, Dict, Optional, Tuple
+
+from aws_lambda_powertools import Logger
+
+from batch_search import cheapest_flight
+from ranking import stay_cost
+from results import FlightOption, HotelOption, convert_prices, select_fields
+from shared.currency import DEFAULT_CURRENCY, CurrencyError
+from shared.observability import record_fanout, submit
+from shared.portfolio_model import PortfolioError, load_portfolio
+from shared.pricing import prices_in_currency
+from shared.resilience import UNAVAILABLE, upstream
+
+logger = Logger(child=True)
+
+# Time budget for the flight search, hotel search and portfolio pricing running side by side
+PLAN_DEADLINE_SECONDS = float(os.environ.get('PLAN_DEADLINE_SECONDS', '25'))
+
+ASK_USER = " Ask the user for more information related to the context received about the function."
+
+
+def search_error(error: str, engine: str) -> Dict:
+    """Response for a failed search; while the engine's breaker is open, say when to retry instead of asking the user."""
+    retry_after = upstream.retry_after(engine)
+    if retry_after is None:
+        return {'error': error + ASK_USER, 'total_cost': 0}
+    return {
+        'error': error,
+        'error_type': UNAVAILABLE,
+        'engine': engine,
+        'retry_after_seconds': retry_after,
+        'total_cost': 0,
+    }
+
+
+def cheapest_hotel(results: Dict, nights: int) -> Optional[Tuple[HotelOption, float]]:
+    """Pick the property with the cheapest stay, as ``(option, cost_per_room)``."""
+    best = None
+    for prop in results.get('properties') or []:
+        option = HotelOption(prop)
+        cost = stay_cost(option, nights)
+        if cost is not None and (best is None or cost < best[1]):
+            best = (option, cost)
+    return best
+
+
+def _price_portfolio(currency: str) -> Dict:
+    portfolio = load_portfolio()
+    if not portfolio:
+        raise PortfolioError('No portfolio configured')
+    prices, rates, failed_symbols = prices_in_currency(portfolio.symbols, currency)
+    value = sum(prices[symbol] * quantity for symbol, quantity in portfolio.items() if symbol in prices)
+    return {'portfolio': portfolio, 'prices': prices, 'rates': rates, 'failed_symbols': failed_symbols, 'value': value}
+
+
+def _run_concurrently(tasks: Dict[str, Callable[[], Dict]], deadline: float) -> Tuple[Dict[str, Dict], Dict[str, Exception]]:
+    results = {}
+    errors = {}
+    record_fanout('plan_trip_cost', len(tasks))
+    executor = ThreadPoolExecutor(max_workers=len(tasks))
+    try:
+        futures = {submit(executor, task): name for name, task in tasks.items()}
+        done, not_done = wait(futures, timeout=deadline)
+        for future in done:
+            try:
+                results[futures[future]] = future.result()
+            except Exception as e:
+                errors[futures[future]] = e
+        for future in not_done:
+            future.cancel()
+            errors[futures[future]] = TimeoutError(f"Timed out after {deadline}s")
+    finally:
+        # Do not block the response on stragglers past the deadline
+        executor.shutdown(wait=False, cancel_futures=True)
+    return results, errors
+
+
+def plan_trip(
+    search_flights: Callable[[], Dict],
+    search_hotels: Callable[[], Dict],
+    nights: int,
+    num_passengers: int,
+    num_rooms: int,
+    strategy: str,
+    max_per_position: float,
+    currency: str = DEFAULT_CURRENCY,
+) -> Dict:
+    """Search flights and hotels and price the portfolio concurrently, then check affordability.
+
+    The trip costs the cheapest flight for every passenger plus the cheapest
+    stay for every room. When the portfolio covers it, a sell plan for the
+    full amount is included. Portfolio problems are reported alongside the
+    trip cost rather than failing the whole plan. Every amount is converted
+    into ``currency``, sharing one exchange rate table across the request.
+    """
+    results, errors = _run_concurrently({
+        'flights': search_flights,
+        'hotels': search_hotels,
+        'portfolio': partial(_price_portfolio, currency),
+    }, PLAN_DEADLINE_SECONDS)
+
+    for name, engine in (('flights', 'google_flights'), ('hotels', 'google_hotels')):
+        if name in errors:
+            logger.error(f"Error searching {name}: {str(errors[name])}")
+            return {'error': f"Could not search {name}: {str(errors[name])}.{ASK_USER}", 'total_cost': 0}
+        if results[name].get('error'):
+            return search_error(results[name]['error'], engine)
+
+    flight = cheapest_flight(results['flights'])
+    if flight is None:
+        return {'error': "No priced flights found." + ASK_USER, 'total_cost': 0}
+    hotel = cheapest_hotel(results['hotels'], nights)
+    if hotel is None:
+        return {'error': "No priced hotels found." + ASK_USER, 'total_cost': 0}
+    hotel_option, per_room_cost = hotel
+    try:
+        convert_prices([flight, hotel_option], DEFAULT_CURRENCY, currency)
+    except CurrencyError as e:
+        return {'error': str(e) + ASK_USER, 'total_cost': 0}
+    per_room_cost = stay_cost(hotel_option, nights)
+
+    flight_cost = flight.price * num_passengers
+    hotel_cost = per_room_cost * num_rooms
+    total_cost = flight_cost + hotel_cost
+    output = {
+        'flight': flight.to_dict(select_fields(FlightOption, False)),
+        'hotel': hotel_option.to_dict(select_fields(HotelOption, False)),
+        'num_passengers': num_passengers,
+        'num_rooms': num_rooms,
+        'per_passenger_cost': round(flight.price, 2),
+        'per_room_cost': round(per_room_cost, 2),
+        'flight_cost': round(flight_cost, 2),
+        'hotel_cost': round(hotel_cost, 2),
+        'total_cost': round(total_cost, 2),
+        'currency': currency,
+    }
+
+    if 'portfolio' in errors:
+        logger.error(f"Error pricing portfolio: {str(errors['portfolio'])}")
+        output['portfolio_error'] = str(errors['portfolio'])
+        return output
+
+    priced = results['portfolio']
+    portfolio_value = priced['value']
+    output.update({
+        'portfolio_value': round(portfolio_value, 2),
+        'can_afford_travel': portfolio_value >= total_cost,
+        'remaining_after_travel': round(portfolio_value - total_cost, 2),
+    })
+    if priced['failed_symbols']:
+        # Partial result: the listed symbols are excluded from portfolio_value
+        output['failed_symbols'] = priced['failed_symbols']
+
+    if output['can_afford_travel']:
+        # Imported here so NumPy only loads for the route that needs it
+        from shared.sell_planner import SalePlanError, plan_sale
+
+        try:
+            output['strategy'] = strategy
+            output['shares_to_sell'] = plan_sale(
+                priced['portfolio'], priced['prices'], total_cost, strategy, max_per_position, priced['rates'], currency,
+            )
+        except SalePlanError as e:
+            output['sell_plan_error'] = str(e)
+    return output
@@ -0,0 +1,22 @@
+from aws_lambda_powertools import Logger, Tracer
+from aws_lambda_powertools.event_handler import BedrockAgentResolver
+from aws_lambda_powertools.utilities.typing import LambdaContext
+
+import portfolio_routes
+import travel_routes
+from shared.observability import log_metrics, metrics
+
+tracer = Tracer()
+logger = Logger()
+# Serves the travel and portfolio action groups from one function, so a trip question pays a single cold start
+app = BedrockAgentResolver()
+app.include_router(travel_routes.router)
+app.include_router(portfolio_routes.router)
+
+
+@logger.inject_lambda_context
+@tracer.capture_lambda_handler
+@log_metrics
+def lambda_handler(event: dict, context: LambdaContext):
+    metrics.add_dimension(name="route", value=event.get("apiPath", "unknown"))
+    return app.resolve(event, context)
@@ -9,10 +9,9 @@ import { BedrockAgentConstruct } from './constructs/bedrock-agent-construct';
 import { AGENT_NAME, API_KEY, AGENT_INSTRUCTION, AGENT_MODEL, AGENT_DESCRIPTION } from './constants';
 
 export interface BedrockAgentCdkProps extends cdk.StackProps {
-  readonly travelSpecFile: string;
-  readonly portfolioSpecFile: string;
   readonly travelLambdaFile: string;
   readonly portfolioLambdaFile: string;
+  readonly unifiedLambdaFile: string;
 }
 
 export class BedrockAgentCdkStack extends cdk.Stack {
@@ -26,6 +25,13 @@ export class BedrockAgentCdkStack extends cdk.Stack {
     const agentName = this.node.tryGetContext("agentName") || AGENT_NAME;
     const agentModel = this.node.tryGetContext("agentModel") || AGENT_MODEL;
     const agentDescription = this.node.tryGetContext("apiKey") || AGENT_DESCRIPTION;
+    // Optional s3://bucket/key holding the portfolio JSON, for portfolios too large for an environment variable
+    const portfolioS3Uri: string | undefined = this.node.tryGetContext("portfolioS3Uri");
+    // Both functions read the portfolio: the travel one prices it for /plan_trip_cost
+    const portfolioEnvironment: { [key: string]: string } = {
+      STOCK_PORTFOLIO: process.env.STOCK_PORTFOLIO || '{}',
+      ...(portfolioS3Uri ? { STOCK_PORTFOLIO_S3_URI: portfolioS3Uri } : {})
+    };
     
     // Travel Lambda configuration
     const travelLambdaName = `travel-agent-lambda-${randomPrefix}`;
@@ -34,54 +40,149 @@ export class BedrockAgentCdkStack extends cdk.Stack {
     // Portfolio Lambda configuration
     const portfolioLambdaName = `portfolio-agent-lambda-${randomPrefix}`;
     const portfolioLambdaRoleName = `portfolio-agent-lambda-role-${randomPrefix}`;
+
+    // Price snapshot refresher configuration
+    const snapshotRefresherName = `price-snapshot-refresher-${randomPrefix}`;
+    const snapshotRefresherRoleName = `price-snapshot-refresher-role-${randomPrefix}`;
+    // Minutes between snapshot refreshes; each refresh makes one Google Finance call per holding
+    const snapshotIntervalMinutes = Number(this.node.tryGetContext("snapshotIntervalMinutes") || 5);
+
+    // Serve both action groups from one function, so a trip question pays at most one cold start
+    const unifiedLambda = String(this.node.tryGetContext("unifiedLambda")) === 'true';
+    const unifiedLambdaName = `travel-planner-agent-lambda-${randomPrefix}`;
+    const unifiedLambdaRoleName = `travel-planner-agent-lambda-role-${randomPrefix}`;
+    // Environments kept initialized for the agent function(s); 0 (default) leaves every cold start on demand
+    const provisionedConcurrency = Number(this.node.tryGetContext("provisionedConcurrency") || 0);
+    // Memory of each agent function in MB; Lambda allocates CPU in proportion to it
+    const lambdaMemorySize = Number(this.node.tryGetContext("lambdaMemorySize") || 1024);
     
     const agentResourceRoleName = `AmazonBedrockExecutionRoleForAgents_${randomPrefix}`; 
 
-    // Create IAM roles for both Lambdas
-    const travelLambdaRole = new LambdaIamConstruct(this, `TravelLambdaIamConstruct-${randomPrefix}`, { 
-      roleName: travelLambdaRoleName 
-    });
-    const portfolioLambdaRole = new LambdaIamConstruct(this, `PortfolioLambdaIamConstruct-${randomPrefix}`, { 
-      roleName: portfolioLambdaRoleName 
+    // Create IAM roles for the agent Lambdas: one shared function, or one per action group
+    const agentLambdaRoles = unifiedLambda
+      ? [
+          new LambdaIamConstruct(this, `UnifiedLambdaIamConstruct-${randomPrefix}`, {
+            roleName: unifiedLambdaRoleName
+          }),
+        ]
+      : [
+          new LambdaIamConstruct(this, `TravelLambdaIamConstruct-${randomPrefix}`, { 
+            roleName: travelLambdaRoleName 
+          }),
+          new LambdaIamConstruct(this, `PortfolioLambdaIamConstruct-${randomPrefix}`, { 
+            roleName: portfolioLambdaRoleName 
+          }),
+        ];
+    const snapshotRefresherRole = new LambdaIamConstruct(this, `SnapshotRefresherIamConstruct-${randomPrefix}`, {
+      roleName: snapshotRefresherRoleName
     });
 
     // Create S3 bucket for schemas
     const s3Construct = new S3Construct(this, `agent-assets-${randomPrefix}`, {});
 
+    // The refresher publishes the price snapshot to the assets bucket; both agent functions read it
+    const snapshotKey = 'price-snapshot/prices.bin';
+    const snapshotEnvironment: { [key: string]: string } = {
+      PRICE_SNAPSHOT_S3_URI: `s3://${s3Construct.bucketName}/${snapshotKey}`,
+      // Tolerate one missed refresh before falling back to live quotes
+      PRICE_SNAPSHOT_MAX_AGE_SECONDS: String(snapshotIntervalMinutes * 60 * 2),
+    };
+    s3Construct.bucket.grantPut(snapshotRefresherRole.lambdaRole, snapshotKey);
+    for (const role of agentLambdaRoles) {
+      s3Construct.bucket.grantRead(role.lambdaRole, snapshotKey);
+    }
+
     // Create Bedrock agent role
     const bedrockAgentRole = new BedrockIamConstruct(this, `BedrockIamConstruct-${randomPrefix}`, { 
       roleName: agentResourceRoleName,
-      lambdaRoleArn: `${travelLambdaRole.lambdaRole.roleArn},${portfolioLambdaRole.lambdaRole.roleArn}`,
+      lambdaRoleArn: agentLambdaRoles.map((role) => role.lambdaRole.roleArn).join(','),
       s3BucketArn: s3Construct.bucket.bucketArn,
     });
-    bedrockAgentRole.node.addDependency(travelLambdaRole);
-    bedrockAgentRole.node.addDependency(portfolioLambdaRole);
+    for (const role of agentLambdaRoles) {
+      bedrockAgentRole.node.addDependency(role);
+    }
     bedrockAgentRole.node.addDependency(s3Construct);
 
-    // Create Travel Lambda
-    const travelLambdaConstruct = new LambdaConstruct(this, `TravelLambdaConstruct-${randomPrefix}`, {
-      apiKey: apiKey,
-      lambdaName: travelLambdaName,
-      lambdaFile: props.travelLambdaFile,
-      lambdaRoleName: travelLambdaRoleName,
-      iamRole: travelLambdaRole.lambdaRole,
-      dockerDirectory: 'lib/assets/lambda/travel'
-    });
-    travelLambdaConstruct.node.addDependency(travelLambdaRole);
+    let travelLambdaConstruct: LambdaConstruct;
+    let portfolioLambdaConstruct: LambdaConstruct;
+    if (unifiedLambda) {
+      // Create one Lambda hosting the travel and portfolio routes
+      travelLambdaConstruct = portfolioLambdaConstruct = new LambdaConstruct(this, `UnifiedLambdaConstruct-${randomPrefix}`, {
+        apiKey: apiKey,
+        lambdaName: unifiedLambdaName,
+        lambdaFile: props.unifiedLambdaFile,
+        lambdaRoleName: unifiedLambdaRoleName,
+        iamRole: agentLambdaRoles[0].lambdaRole,
+        environment: { ...portfolioEnvironment, ...snapshotEnvironment },
+        dockerDirectory: 'lib/assets/lambda',
+        dockerFile: 'unified/Dockerfile',
+        memorySize: lambdaMemorySize,
+        provisionedConcurrency: provisionedConcurrency
+      });
+      travelLambdaConstruct.node.addDependency(agentLambdaRoles[0]);
+    } else {
+      // Create Travel Lambda
+      travelLambdaConstruct = new LambdaConstruct(this, `TravelLambdaConstruct-${randomPrefix}`, {
+        apiKey: apiKey,
+        lambdaName: travelLambdaName,
+        lambdaFile: props.travelLambdaFile,
+        lambdaRoleName: travelLambdaRoleName,
+        iamRole: agentLambdaRoles[0].lambdaRole,
+        environment: { ...portfolioEnvironment, ...snapshotEnvironment },
+        // Build from the lambda root so the image can include the shared modules
+        dockerDirectory: 'lib/assets/lambda',
+        dockerFile: 'travel/Dockerfile',
+        memorySize: lambdaMemorySize,
+        provisionedConcurrency: provisionedConcurrency
+      });
+      travelLambdaConstruct.node.addDependency(agentLambdaRoles[0]);
+
+      // Create Portfolio Lambda
+      portfolioLambdaConstruct = new LambdaConstruct(this, `PortfolioLambdaConstruct-${randomPrefix}`, {
+        apiKey: apiKey,
+        lambdaName: portfolioLambdaName,
+        lambdaFile: props.portfolioLambdaFile,
+        lambdaRoleName: portfolioLambdaRoleName,
+        iamRole: agentLambdaRoles[1].lambdaRole,
+        environment: { ...portfolioEnvironment, ...snapshotEnvironment },
+        dockerDirectory: 'lib/assets/lambda',
+        dockerFile: 'portfolio/Dockerfile',
+        memorySize: lambdaMemorySize,
+        provisionedConcurrency: provisionedConcurrency
+      });
+      portfolioLambdaConstruct.node.addDependency(agentLambdaRoles[1]);
+    }
 
-    // Create Portfolio Lambda
-    const portfolioLambdaConstruct = new LambdaConstruct(this, `PortfolioLambdaConstruct-${randomPrefix}`, {
+    // Create the price snapshot refresher from an agent image that includes it, run on a schedule
+    const snapshotRefresherConstruct = new LambdaConstruct(this, `SnapshotRefresherConstruct-${randomPrefix}`, {
       apiKey: apiKey,
-      lambdaName: portfolioLambdaName,
+      lambdaName: snapshotRefresherName,
       lambdaFile: props.portfolioLambdaFile,
-      lambdaRoleName: portfolioLambdaRoleName,
-      iamRole: portfolioLambdaRole.lambdaRole,
-      environment: {
-        STOCK_PORTFOLIO: process.env.STOCK_PORTFOLIO || '{}'
-      },
-      dockerDirectory: 'lib/assets/lambda/portfolio'
+      lambdaRoleName: snapshotRefresherRoleName,
+      iamRole: snapshotRefresherRole.lambdaRole,
+      environment: { ...portfolioEnvironment, ...snapshotEnvironment },
+      dockerDirectory: 'lib/assets/lambda',
+      dockerFile: unifiedLambda ? 'unified/Dockerfile' : 'portfolio/Dockerfile',
+      cmd: ['snapshot_refresher.lambda_handler']
     });
-    portfolioLambdaConstruct.node.addDependency(portfolioLambdaRole);
+    snapshotRefresherConstruct.node.addDependency(snapshotRefresherRole);
+
+    new cdk.aws_events.Rule(this, `PriceSnapshotSchedule-${randomPrefix}`, {
+      schedule: cdk.aws_events.Schedule.rate(cdk.Duration.minutes(snapshotIntervalMinutes)),
+      targets: [new cdk.aws_events_targets.LambdaFunction(snapshotRefresherConstruct.lambdaFunction)],
+    });
+
+    if (portfolioS3Uri) {
+      for (const role of [...agentLambdaRoles, snapshotRefresherRole]) {
+        role.lambdaRole.addToPolicy(
+          new cdk.aws_iam.PolicyStatement({
+            effect: cdk.aws_iam.Effect.ALLOW,
+            actions: ["s3:GetObject"],
+            resources: [`arn:aws:s3:::${portfolioS3Uri.replace(/^s3:\/\//, '')}`],
+          })
+        );
+      }
+    }
 
     // Create Bedrock agent with both action groups
     const bedrockAgentConstruct = new BedrockAgentConstruct(this, `BedrockConstruct-${randomPrefix}`, {
@@ -10,16 +10,21 @@ export interface LambdaProps extends cdk.StackProps {
   readonly iamRole: cdk.aws_iam.Role;
   readonly environment?: { [key: string]: string };
   readonly dockerDirectory: string;  // Path to the Docker context directory
+  readonly dockerFile?: string;  // Dockerfile path relative to the Docker context directory
+  readonly cmd?: string[];  // Overrides the image CMD, to run another handler from the same image
   readonly memorySize?: number;  // Memory size in MB
   readonly cpu?: number;  // CPU units (1024 units = 1 vCPU)
+  readonly provisionedConcurrency?: number;  // Pre-initialized environments kept warm behind a 'live' alias; 0 disables
 }
 
 const defaultProps: Partial<LambdaProps> = {
   memorySize: 1024,  // Default to 1GB memory
   cpu: 512,  // Default to 0.5 vCPU
+  provisionedConcurrency: 0,
 };
 
 export class LambdaConstruct extends Construct {
+  public lambdaFunction: cdk.aws_lambda.IFunction;
   public lambdaArn: string;
   public logGroupName: string;
 
@@ -37,7 +42,10 @@ export class LambdaConstruct extends Construct {
 
     // Create Lambda function
     const lambda = new cdk.aws_lambda.DockerImageFunction(this, props.lambdaName, {
-      code: cdk.aws_lambda.DockerImageCode.fromImageAsset(props.dockerDirectory),
+      code: cdk.aws_lambda.DockerImageCode.fromImageAsset(props.dockerDirectory, {
+        file: props.dockerFile,
+        cmd: props.cmd,
+      }),
       timeout: cdk.Duration.seconds(300),
       role: props.iamRole,
       functionName: props.lambdaName,
@@ -45,21 +53,34 @@ export class LambdaConstruct extends Construct {
       ephemeralStorageSize: cdk.Size.mebibytes(512),  // Add ephemeral storage for container
       environment: {
         API_KEY: props.apiKey,
+        // Dimensions and namespace of the per-route metrics emitted as CloudWatch EMF
+        POWERTOOLS_SERVICE_NAME: props.lambdaName,
+        POWERTOOLS_METRICS_NAMESPACE: 'TravelPlanner',
         ...props.environment,
       },
       logGroup,
     });
 
+    // Provisioned concurrency applies to a version, so callers invoke it through an alias
+    const target: cdk.aws_lambda.IFunction = props.provisionedConcurrency
+      ? new cdk.aws_lambda.Alias(this, `${props.lambdaName}-live`, {
+          aliasName: 'live',
+          version: lambda.currentVersion,
+          provisionedConcurrentExecutions: props.provisionedConcurrency,
+        })
+      : lambda;
+
     // Grant Bedrock invoke permissions
-    lambda.grantInvoke(new cdk.aws_iam.ServicePrincipal("bedrock.amazonaws.com"));
+    target.grantInvoke(new cdk.aws_iam.ServicePrincipal("bedrock.amazonaws.com"));
 
     // Store outputs
-    this.lambdaArn = lambda.functionArn;
+    this.lambdaFunction = target;
+    this.lambdaArn = target.functionArn;
     this.logGroupName = logGroup.logGroupName;
 
     // Create CloudFormation outputs
     new cdk.CfnOutput(this, `${props.lambdaName}Arn`, {
-      value: lambda.functionArn,
+      value: target.functionArn,
       description: `ARN for ${props.lambdaName}`
     });
 
@@ -25,9 +25,20 @@ export class S3Construct extends Construct {
 
     new cdk.aws_s3_deployment.BucketDeployment(this, "ApiSchemaBucket", {
       sources: [
-        cdk.aws_s3_deployment.Source.asset(
-            "lib/assets/api-schema"
-        ),
+        // Generated from the agent routes at synth time rather than maintained by hand
+        cdk.aws_s3_deployment.Source.asset("lib/assets", {
+          exclude: ["**/__pycache__"],
+          bundling: {
+            image: cdk.aws_lambda.Runtime.PYTHON_3_9.bundlingImage,
+            environment: { POWERTOOLS_TRACE_DISABLED: "1" },
+            command: [
+              "bash", "-c", [
+                "pip install --no-cache-dir --quiet --target /tmp/deps -r lambda/travel/requirements.txt -r lambda/portfolio/requirements.txt",
+                "PYTHONPATH=/tmp/deps python api-schema/generate_openapi_schemas.py --output /asset-output",
+              ].join(" && "),
+            ],
+          },
+        }),
       ],
       destinationBucket: s3Bucket,
       destinationKeyPrefix: "api-schema",